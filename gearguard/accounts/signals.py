@@ -0,0 +1,20 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from gearguard.fragments import FragmentCache
+from .models import UserProfile
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_fragments(sender, instance, **kwargs):
+    """Re-render the cached member rows of the saved or deleted profile."""
+    FragmentCache.invalidate(sender, [instance.pk])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_fragments(sender, instance, update_fields=None, **kwargs):
+    """Member rows show the username; logins only touch ``last_login`` and are skipped."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    FragmentCache.invalidate(UserProfile, UserProfile.objects.filter(user=instance).values_list('pk', flat=True))
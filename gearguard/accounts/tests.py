@@ -1,3 +1,22 @@
-from django.test import TestCase
+import hashlib
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from gearguard.utils.password_utils import PasswordValidationCache
+
+
+class PasswordValidationCacheTests(SimpleTestCase):
+
+    def test_key_does_not_expose_a_plain_hash(self):
+        password = 'Correct-Horse-7'
+        key = PasswordValidationCache.get_validation_cache_key(password, 42)
+        self.assertTrue(key.startswith('password_validation:'))
+        self.assertTrue(key.endswith(':42'))
+        self.assertNotIn(hashlib.sha256(password.encode()).hexdigest()[:16], key)
+
+    def test_key_depends_on_the_secret_key(self):
+        with override_settings(SECRET_KEY='a' * 50):
+            first = PasswordValidationCache.get_validation_cache_key('Correct-Horse-7')
+        with override_settings(SECRET_KEY='b' * 50):
+            second = PasswordValidationCache.get_validation_cache_key('Correct-Horse-7')
+        self.assertNotEqual(first, second)
@@ -0,0 +1,101 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from dashboard.metrics import DashboardMetrics
+from gearguard.lookups import CachedChoices
+from maintenance.assignment import AssignmentTables
+from maintenance.calendar import default_window
+from maintenance.models import MaintenanceRequest
+from maintenance.workload import Workload
+
+# List pages rendered so their row fragments are cached
+LIST_PAGES = ('home', 'equipment:equipment_list', 'teams:team_list', 'teams:workcenter_list')
+# Detail page -> request field naming its object; the objects of the most
+# recent requests are the ones most likely to be opened next
+DETAIL_PAGES = {
+    'equipment:equipment_detail': 'equipment',
+    'teams:team_detail': 'team',
+    'teams:workcenter_detail': 'work_center',
+}
+DEFAULT_DETAILS = 50
+
+
+def recent_ids(field: str, limit: int):
+    """Distinct ``field`` ids of the latest requests, most recent first."""
+    ids = []
+    rows = MaintenanceRequest.objects.filter(**{f'{field}__isnull': False}).order_by('-request_date', '-id')
+    # Scanning a bounded window keeps this an index range read
+    for pk in rows.values_list(f'{field}_id', flat=True)[:limit * 20]:
+        if pk not in ids:
+            ids.append(pk)
+            if len(ids) == limit:
+                break
+    return ids
+
+
+class Command(BaseCommand):
+    help = 'Fill the cache after a deploy: dashboard metrics, choice lists, workload and the busiest pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--details', type=int, default=DEFAULT_DETAILS,
+                            help=f'Detail pages rendered per kind (equipment, team, work center), '
+                                 f'picked from the latest requests (default: {DEFAULT_DETAILS})')
+        parser.add_argument('--user', help='Username the pages are rendered as (default: the first superuser)')
+        parser.add_argument('--skip-pages', action='store_true', help='Only warm the data caches')
+
+    def handle(self, *args, **options):
+        if options['details'] < 0:
+            raise CommandError('--details must not be negative')
+
+        # Creates the table of a database cache; does nothing for other backends
+        call_command('createcachetable', verbosity=0)
+
+        self._step('dashboard metrics', DashboardMetrics.get)
+        self._step('choice lists', lambda: [CachedChoices.get(name) for name in CachedChoices.SOURCES])
+        self._step('assignment tables', AssignmentTables.get)
+        self._step('workload report', lambda: Workload.get(*default_window()))
+        if options['skip_pages']:
+            return
+
+        user = self._user(options['user'])
+        if user is None:
+            self.stdout.write(self.style.WARNING('  [SKIP] pages: no active user to render them as'))
+            return
+        paths = [reverse(name) for name in LIST_PAGES]
+        for name, field in DETAIL_PAGES.items():
+            paths.extend(reverse(name, args=[pk]) for pk in recent_ids(field, options['details']))
+
+        factory = RequestFactory()
+        started = time.perf_counter()
+        failed = []
+        for path in paths:
+            request = factory.get(path)
+            request.user = user
+            match = resolve(path)
+            response = match.func(request, *match.args, **match.kwargs)
+            if response.status_code != 200:
+                failed.append(f'{path} ({response.status_code})')
+        for failure in failed:
+            self.stdout.write(self.style.ERROR(f'  [ERR] {failure}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'  [OK] {len(paths) - len(failed)} pages rendered in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def _step(self, label, warm):
+        started = time.perf_counter()
+        warm()
+        self.stdout.write(self.style.SUCCESS(f'  [OK] {label} in {time.perf_counter() - started:.2f}s'))
+
+    @staticmethod
+    def _user(username):
+        if username:
+            try:
+                return User.objects.get(username=username, is_active=True)
+            except User.DoesNotExist:
+                raise CommandError(f'No active user "{username}"')
+        return User.objects.filter(is_active=True).order_by('-is_superuser', 'pk').first()
@@ -0,0 +1,105 @@
+"""
+Dashboard metrics service.
+
+Every figure shown on the dashboard is computed with one conditional
+aggregate query per table and kept as a cached snapshot, so page loads are
+served from the cache until a save or delete invalidates it.
+"""
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from equipment.models import Equipment
+from maintenance.calendar import default_window
+from maintenance.models import MaintenanceRequest
+from maintenance.workload import Workload
+from teams.models import Team
+
+
+class DashboardMetrics:
+    """
+    Compute and cache the dashboard metrics snapshot.
+    """
+
+    CACHE_KEY = 'dashboard:metrics'
+    CACHE_TIMEOUT = settings.CACHE_TTLS['dashboard']  # signals invalidate earlier on writes
+
+    @classmethod
+    def get(cls) -> Dict[str, Any]:
+        """
+        Return the cached snapshot, computing it on a miss.
+
+        Returns:
+            Dict of dashboard figures (see :meth:`compute`)
+        """
+        snapshot = cache.get(cls.CACHE_KEY)
+        if snapshot is None:
+            snapshot = cls.compute()
+            cache.set(cls.CACHE_KEY, snapshot, cls.CACHE_TIMEOUT)
+        return snapshot
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached snapshot so the next read recomputes it."""
+        cache.delete(cls.CACHE_KEY)
+
+    @staticmethod
+    def compute() -> Dict[str, Any]:
+        """
+        Compute all dashboard figures with one aggregate query per table.
+
+        Returns:
+            Dict containing equipment, request, technician and team figures
+        """
+        now = timezone.now()
+
+        equipment = Equipment.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active')),
+            critical=Count('id', filter=Q(health_score__lt=Equipment.CRITICAL_HEALTH) & ~Q(status='scrapped')),
+            scrapped=Count('id', filter=Q(status='scrapped')),
+        )
+
+        # Restricting to open stages lets this run off the stage index
+        # instead of scanning the full request history.
+        requests = MaintenanceRequest.objects.filter(
+            stage__in=MaintenanceRequest.OPEN_STAGES
+        ).aggregate(
+            open=Count('id'),
+            new=Count('id', filter=Q(stage='new')),
+            in_progress=Count('id', filter=Q(stage='in_progress')),
+            overdue=Count('id', filter=Q(scheduled_date__lt=now)),
+            high_priority=Count('id', filter=Q(priority=3)),
+            busy_technicians=Count('technician', distinct=True),
+        )
+
+        technicians = UserProfile.objects.aggregate(
+            total=Count('id', filter=Q(role='technician')),
+        )['total']
+
+        teams = Team.objects.aggregate(total=Count('id'))['total']
+
+        busy = requests['busy_technicians']
+        # Booked hours against working hours this week (cached per window)
+        technician_load = round(Workload.get(*default_window()).utilisation)
+
+        return {
+            'equipment_count': equipment['total'],
+            'active_equipment': equipment['active'],
+            'critical_equipment': equipment['critical'],
+            'scrapped_equipment': equipment['scrapped'],
+            'open_requests': requests['open'],
+            'new_requests': requests['new'],
+            'in_progress_requests': requests['in_progress'],
+            'overdue_requests': requests['overdue'],
+            'high_priority_requests': requests['high_priority'],
+            'technician_count': technicians,
+            'busy_technicians': busy,
+            'technician_load': min(technician_load, 100),
+            'teams_count': teams,
+            'computed_at': now,
+        }
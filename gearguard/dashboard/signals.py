@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+from equipment.models import Equipment
+from maintenance.models import MaintenanceRequest
+from maintenance.signals import requests_changed
+from teams.models import Team
+from .metrics import DashboardMetrics
+
+
+@receiver([post_save, post_delete], sender=Equipment)
+@receiver([post_save, post_delete, requests_changed], sender=MaintenanceRequest)
+@receiver([post_save, post_delete], sender=Team)
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_dashboard_metrics(sender, **kwargs):
+    """Drop the cached dashboard snapshot whenever a counted row changes."""
+    DashboardMetrics.invalidate()
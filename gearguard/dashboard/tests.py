@@ -1,3 +1,33 @@
-from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from gearguard.utils.cache_versions import CacheVersion
+
+
+class CacheVersionTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_suite_runs_on_locmem(self):
+        # settings.TESTING keeps every test module off the deployment's cache
+        self.assertEqual(settings.CACHES['default']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+
+    def test_get_is_stable_until_bumped(self):
+        version = CacheVersion.get('reports')
+        self.assertEqual(CacheVersion.get('reports'), version)
+        self.assertEqual(CacheVersion.get_many(['reports']), {'reports': version})
+
+    def test_every_bump_yields_a_new_version(self):
+        seen = {CacheVersion.get('reports')}
+        for _ in range(200):
+            version = CacheVersion.bump('reports')
+            self.assertNotIn(version, seen)
+            self.assertEqual(CacheVersion.get('reports'), version)
+            seen.add(version)
+
+    def test_recreated_counter_does_not_reuse_versions(self):
+        old = CacheVersion.bump('reports')
+        cache.clear()
+        self.assertGreater(CacheVersion.get('reports'), old)
@@ -1,20 +1,19 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from equipment.models import Equipment
-from maintenance.models import MaintenanceRequest
-from teams.models import Team
+from gearguard.routers import use_replica
+from .metrics import DashboardMetrics
 
 
 @login_required
+@use_replica
 def home(request):
-    """Render the dashboard home page with metrics."""
-    equipment_count = Equipment.objects.count()
-    open_requests = MaintenanceRequest.objects.exclude(stage__in=['repaired', 'scrapped']).count()
-    teams_count = Team.objects.count()
-    
+    """Render the dashboard home page from the cached metrics snapshot."""
+    metrics = DashboardMetrics.get()
+
     context = {
-        'equipment_count': equipment_count,
-        'open_requests': open_requests,
-        'teams_count': teams_count,
+        'equipment_count': metrics['equipment_count'],
+        'open_requests': metrics['open_requests'],
+        'teams_count': metrics['teams_count'],
+        'metrics': metrics,
     }
     return render(request, 'dashboard/home.html', context)
@@ -1,5 +1,8 @@
 from django import forms
-from .models import Equipment
+from gearguard.widgets import AutocompleteSelect, CachedSelect
+from search.index import SearchQuery
+from teams.models import Team, WorkCenter
+from .models import Equipment, EquipmentCategory
 
 class EquipmentForm(forms.ModelForm):
     class Meta:
@@ -18,7 +21,7 @@ class EquipmentForm(forms.ModelForm):
                 'class': 'w-full bg-slate-900 border border-slate-700 text-white rounded-md p-3 focus:outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-colors',
                 'placeholder': 'Company Name'
             }),
-            'category': forms.Select(attrs={
+            'category': CachedSelect('categories', attrs={
                 'class': 'w-full bg-slate-900 border border-slate-700 text-white rounded-md p-3 focus:outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-colors'
             }),
             'serial_number': forms.TextInput(attrs={
@@ -30,13 +33,13 @@ class EquipmentForm(forms.ModelForm):
                 'rows': 4,
                 'placeholder': 'Equipment Description'
             }),
-            'employee': forms.Select(attrs={
+            'employee': AutocompleteSelect('users', attrs={
                 'class': 'w-full bg-slate-900 border border-slate-700 text-white rounded-md p-3 focus:outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-colors'
             }),
-            'maintenance_team': forms.Select(attrs={
+            'maintenance_team': CachedSelect('teams', attrs={
                 'class': 'w-full bg-slate-900 border border-slate-700 text-white rounded-md p-3 focus:outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-colors'
             }),
-            'work_center': forms.Select(attrs={
+            'work_center': CachedSelect('work_centers', attrs={
                 'class': 'w-full bg-slate-900 border border-slate-700 text-white rounded-md p-3 focus:outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-colors'
             }),
             'assigned_date': forms.DateInput(attrs={
@@ -53,3 +56,135 @@ class EquipmentForm(forms.ModelForm):
         if not name or len(name.strip()) == 0:
             raise forms.ValidationError('Equipment name cannot be empty.')
         return name
+
+
+class EquipmentFilterForm(forms.Form):
+    """Search, filters and sort order for the equipment list."""
+    SORT_CHOICES = [
+        ('name', 'Name (A-Z)'),
+        ('-name', 'Name (Z-A)'),
+        ('-created_at', 'Newest first'),
+        ('created_at', 'Oldest first'),
+        ('serial_number', 'Serial number'),
+        ('status', 'Status'),
+        ('health', 'Health (worst first)'),
+    ]
+    DEFAULT_SORT = 'name'
+    # Unique keyset orderings, each served by an index on Equipment
+    SORT_ORDERINGS = {
+        'name': ('name', 'id'),
+        '-name': ('-name', '-id'),
+        '-created_at': ('-created_at', '-id'),
+        'created_at': ('created_at', 'id'),
+        'serial_number': ('serial_number', 'id'),
+        'status': ('status', 'name', 'id'),
+        'health': ('health_score', 'id'),
+    }
+    HEALTH_CHOICES = [
+        ('', 'Any health'),
+        ('critical', 'Critical'),
+    ]
+
+    q = forms.CharField(
+        required=False,
+        max_length=100,
+        widget=forms.TextInput(attrs={
+            'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm',
+            'placeholder': 'Search name or serial'
+        })
+    )
+    status = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All statuses')] + Equipment.STATUS_CHOICES,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    company = forms.ChoiceField(
+        required=False,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    category = forms.ModelChoiceField(
+        required=False,
+        queryset=EquipmentCategory.objects.only('id', 'name').order_by('name'),
+        empty_label='All categories',
+        widget=CachedSelect('categories', attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    maintenance_team = forms.ModelChoiceField(
+        required=False,
+        queryset=Team.objects.only('id', 'name').order_by('name'),
+        empty_label='All teams',
+        widget=CachedSelect('teams', attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    work_center = forms.ModelChoiceField(
+        required=False,
+        queryset=WorkCenter.objects.only('id', 'name', 'code').order_by('name'),
+        empty_label='All work centers',
+        widget=CachedSelect('work_centers', attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    health = forms.ChoiceField(
+        required=False,
+        choices=HEALTH_CHOICES,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    sort = forms.ChoiceField(
+        required=False,
+        choices=SORT_CHOICES,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Distinct company names, read from the company index
+        companies = (
+            Equipment.objects.exclude(company__isnull=True).exclude(company='')
+            .order_by('company').values_list('company', flat=True).distinct()
+        )
+        self.fields['company'].choices = [('', 'All companies')] + [(name, name) for name in companies]
+
+    def filter(self, queryset):
+        """Apply every valid filter to ``queryset``; invalid ones are ignored."""
+        self.is_valid()
+        cleaned_data = getattr(self, 'cleaned_data', {})
+        for name in ('status', 'company', 'category', 'maintenance_team', 'work_center'):
+            value = cleaned_data.get(name)
+            if value not in (None, ''):
+                queryset = queryset.filter(**{name: value})
+        if cleaned_data.get('health') == 'critical':
+            queryset = queryset.filter(health_score__lt=Equipment.CRITICAL_HEALTH).exclude(status='scrapped')
+        query = (cleaned_data.get('q') or '').strip()
+        if query:
+            # Matches come from the full-text index, so a rare term never
+            # walks the sort index of the whole table looking for rows
+            queryset = queryset.filter(pk__in=SearchQuery(query, 'equipment').object_ids())
+        return queryset
+
+    def ordering(self):
+        """Keyset ordering of the chosen sort (call after :meth:`filter`)."""
+        sort = getattr(self, 'cleaned_data', {}).get('sort') or self.DEFAULT_SORT
+        return self.SORT_ORDERINGS[sort]
+
+
+class EquipmentImportForm(forms.Form):
+    """Upload of a CSV or XLSX equipment file (see equipment.importer)."""
+    EXTENSIONS = ('.csv', '.xlsx')
+
+    file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'w-full bg-slate-900 border border-slate-700 text-white rounded-md p-3',
+            'accept': '.csv,.xlsx',
+        })
+    )
+    update_existing = forms.BooleanField(
+        required=False,
+        initial=True,
+        label='Update equipment whose serial number already exists',
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        label='Validate only (write nothing)',
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(self.EXTENSIONS):
+            raise forms.ValidationError(f'Upload a {" or ".join(self.EXTENSIONS)} file.')
+        return upload
@@ -0,0 +1,153 @@
+"""
+Equipment health scoring.
+
+Every piece of equipment gets a 0-100 health score from three signals:
+how often it breaks down (corrective requests over the last year), how long
+it has been in service, and how many urgent requests are still open. The
+score is computed for the whole fleet at once: one grouped query collects
+the request counts, NumPy does the arithmetic on whole columns, and only
+the scores that changed are written back, grouped by value.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from dashboard.metrics import DashboardMetrics
+from gearguard.fragments import FragmentCache
+from maintenance.models import MaintenanceRequest
+from .models import Equipment
+
+
+class HealthScorer:
+    """
+    Compute and store :attr:`Equipment.health_score` for every asset.
+    """
+
+    # Penalty weights; a perfectly healthy asset scores 100
+    FAILURE_WEIGHT = 50.0
+    AGE_WEIGHT = 20.0
+    URGENT_WEIGHT = 30.0
+
+    # Breakdowns per year at which the failure penalty reaches ~63%
+    FAILURE_SCALE = 4.0
+    # Service life after which the age penalty is maxed out
+    EXPECTED_LIFE_YEARS = 10.0
+    # Open high-priority requests at which the urgent penalty reaches ~63%
+    URGENT_SCALE = 2.0
+    # Failure rates of assets younger than this are annualised from this age,
+    # so a single breakdown in week one does not read as 50 a year
+    MIN_RATE_YEARS = 0.25
+
+    URGENT_PRIORITY = 3
+    BATCH_SIZE = 2000
+
+    def __init__(self, now=None):
+        self.now = now or timezone.now()
+
+    def run(self) -> dict:
+        """
+        Score every piece of equipment and persist the changed scores.
+
+        Returns:
+            Dict with the number of ``scored``, ``updated`` and ``critical`` assets
+        """
+        columns = self.load()
+        scores = self.score(
+            columns['status'], columns['age_years'], columns['recent_failures'], columns['urgent_open']
+        )
+        changed = scores != columns['current']
+        self.save(columns['ids'][changed], scores[changed])
+        active = columns['status'] != 'scrapped'
+        return {
+            'scored': int(scores.size),
+            'updated': int(changed.sum()),
+            'critical': int(((scores < Equipment.CRITICAL_HEALTH) & active).sum()),
+        }
+
+    def load(self) -> dict:
+        """
+        Read the inputs as NumPy columns aligned on equipment id.
+
+        Returns:
+            Dict of arrays: ``ids``, ``status``, ``age_years``,
+            ``recent_failures``, ``urgent_open`` and the ``current`` scores
+        """
+        rows = Equipment.objects.order_by('pk').values_list(
+            'pk', 'status', 'assigned_date', 'created_at', 'health_score'
+        )
+        ids, status, age_days, current = [], [], [], []
+        today = timezone.localdate(self.now)
+        for pk, state, assigned, created, score in rows.iterator(chunk_size=self.BATCH_SIZE):
+            in_service = assigned or timezone.localdate(created)
+            ids.append(pk)
+            status.append(state)
+            age_days.append((today - in_service).days)
+            current.append(score)
+
+        ids = np.array(ids, dtype=np.int64)
+        recent_failures = np.zeros(ids.size)
+        urgent_open = np.zeros(ids.size)
+
+        # One grouped pass over the requests that matter: last year's
+        # breakdowns and urgent requests still open.
+        recent = Q(maintenance_type='corrective', request_date__gte=(self.now - timedelta(days=365)).date())
+        urgent = Q(priority=self.URGENT_PRIORITY, stage__in=MaintenanceRequest.OPEN_STAGES)
+        counts = MaintenanceRequest.objects.filter(
+            Q(equipment__isnull=False) & (recent | urgent)
+        ).order_by().values('equipment_id').annotate(
+            failures=Count('id', filter=recent),
+            urgent=Count('id', filter=urgent),
+        ).values_list('equipment_id', 'failures', 'urgent')
+        counts = np.array(list(counts), dtype=np.int64).reshape(-1, 3)
+        if counts.size and ids.size:
+            positions = np.searchsorted(ids, counts[:, 0])
+            found = (positions < ids.size) & (ids[np.minimum(positions, ids.size - 1)] == counts[:, 0])
+            recent_failures[positions[found]] = counts[found, 1]
+            urgent_open[positions[found]] = counts[found, 2]
+
+        return {
+            'ids': ids,
+            'status': np.array(status, dtype=object),
+            'age_years': np.maximum(np.array(age_days, dtype=float), 0) / 365.25,
+            'recent_failures': recent_failures,
+            'urgent_open': urgent_open,
+            'current': np.array(current, dtype=np.int64),
+        }
+
+    def score(self, status, age_years, recent_failures, urgent_open) -> np.ndarray:
+        """
+        Vectorised health score of every asset (scrapped equipment scores 0).
+
+        Returns:
+            Integer scores in ``0..100``, aligned with the inputs
+        """
+        failure_rate = recent_failures / np.clip(age_years, self.MIN_RATE_YEARS, 1.0)
+        penalty = (
+            self.FAILURE_WEIGHT * (1 - np.exp(-failure_rate / self.FAILURE_SCALE))
+            + self.AGE_WEIGHT * np.clip(age_years / self.EXPECTED_LIFE_YEARS, 0.0, 1.0)
+            + self.URGENT_WEIGHT * (1 - np.exp(-urgent_open / self.URGENT_SCALE))
+        )
+        scores = np.clip(np.rint(100 - penalty), 0, 100).astype(np.int64)
+        scores[status == 'scrapped'] = 0
+        return scores
+
+    def save(self, ids: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Write changed scores with one UPDATE per distinct score (at most 101)
+        and id chunk, instead of one per row. ``update()`` bypasses
+        ``post_save``, so the dashboard snapshot and the cached equipment
+        fragments are invalidated explicitly.
+        """
+        with transaction.atomic():
+            for value in np.unique(scores):
+                matching = ids[scores == value].tolist()
+                for start in range(0, len(matching), self.BATCH_SIZE):
+                    Equipment.objects.filter(
+                        pk__in=matching[start:start + self.BATCH_SIZE]
+                    ).update(health_score=int(value))
+        if ids.size:
+            DashboardMetrics.invalidate()
+            FragmentCache.invalidate(Equipment, ids.tolist())
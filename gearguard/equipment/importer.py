@@ -0,0 +1,336 @@
+"""
+Bulk equipment import from CSV and XLSX files.
+
+Files are streamed: CSV rows are decoded line by line from the upload, XLSX
+rows come from openpyxl's read-only reader (imported only when an ``.xlsx``
+file arrives). Rows are validated with the field rules of
+:class:`~equipment.forms.EquipmentForm` and written in batches of
+``batch_size``. Each batch resolves its category, team, work center and
+employee names with one query per table, upserts on ``serial_number`` and
+commits in its own transaction, so memory does not grow with the file.
+
+Rejected rows are streamed to a CSV error report (line number, reason and
+the original values) that can be fixed and imported again.
+"""
+import codecs
+import csv
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+from dashboard.metrics import DashboardMetrics
+from gearguard.fragments import FragmentCache
+from search.index import SearchIndex, build_entry
+from teams.models import Team, WorkCenter
+from .forms import EquipmentForm, EquipmentImportForm
+from .models import Equipment, EquipmentCategory
+
+# Columns an import file may have, in report order
+COLUMNS = (
+    'name', 'company', 'category', 'serial_number', 'description',
+    'employee', 'maintenance_team', 'work_center', 'assigned_date', 'status',
+)
+REQUIRED_COLUMNS = {'name'}
+# Header spellings accepted besides the column names
+HEADER_ALIASES = {
+    'serial': 'serial_number',
+    'serial_no': 'serial_number',
+    'team': 'maintenance_team',
+    'username': 'employee',
+}
+# Columns holding a name that is resolved to a foreign key
+RELATED_COLUMNS = ('category', 'maintenance_team', 'work_center', 'employee')
+
+FILE_EXTENSIONS = EquipmentImportForm.EXTENSIONS
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (format, encoding or header)."""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of one import."""
+
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    errors: int = 0
+    # Id of the error report, when rows were rejected
+    report: Optional[str] = None
+    dry_run: bool = False
+
+
+def report_path(report: str) -> Path:
+    """Location of the error report with id ``report``."""
+    return Path(settings.EQUIPMENT_IMPORT_REPORT_DIR) / f'{report}.csv'
+
+
+def _column(header) -> str:
+    name = str(header or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return HEADER_ALIASES.get(name, name)
+
+
+def _text(value) -> str:
+    # XLSX cells arrive typed; everything is validated from its text form
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _csv_rows(file) -> Iterator[Sequence]:
+    # Iterating the file yields one line at a time; the incremental decoder
+    # strips a leading BOM and handles characters split across reads
+    return csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+
+
+def _xlsx_rows(file) -> Iterator[Sequence]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('XLSX import requires openpyxl; upload a CSV file instead.')
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as exc:  # zipfile/XML errors of a damaged workbook
+        raise ImportFileError(f'Unreadable XLSX file: {exc}')
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(file, filename: str) -> Tuple[List[str], Iterator[Tuple[int, Dict[str, str]]]]:
+    """
+    Open an import file.
+
+    Args:
+        file: Binary file object (an upload or a file opened with ``'rb'``)
+        filename: Original file name; its extension selects the format
+
+    Returns:
+        ``(columns, rows)``: the recognised columns of the header and a
+        lazy iterator of ``(line number, {column: text})``; blank rows are
+        skipped
+
+    Raises:
+        ImportFileError: On an unsupported format, an empty file or a
+            header without the required columns
+    """
+    extension = Path(filename).suffix.lower()
+    if extension == '.csv':
+        rows = _csv_rows(file)
+    elif extension == '.xlsx':
+        rows = _xlsx_rows(file)
+    else:
+        raise ImportFileError(f'Unsupported file type "{extension}"; use one of {", ".join(FILE_EXTENSIONS)}.')
+
+    try:
+        header = next(rows, None)
+    except UnicodeDecodeError:
+        raise ImportFileError('CSV files must be UTF-8 encoded.')
+    if header is None:
+        raise ImportFileError('The file is empty.')
+    positions = [(index, _column(name)) for index, name in enumerate(header)]
+    positions = [(index, name) for index, name in positions if name in COLUMNS]
+    columns = [name for _, name in positions]
+    missing = REQUIRED_COLUMNS - set(columns)
+    if missing:
+        raise ImportFileError(f'Missing required column(s): {", ".join(sorted(missing))}.')
+
+    def records():
+        try:
+            for line, values in enumerate(rows, start=2):
+                values = list(values)
+                record = {
+                    name: _text(values[index]) if index < len(values) else ''
+                    for index, name in positions
+                }
+                if any(record.values()):
+                    yield line, record
+        except UnicodeDecodeError:
+            raise ImportFileError('CSV files must be UTF-8 encoded.')
+
+    return columns, records()
+
+
+class EquipmentImporter:
+    """
+    Validate and write equipment rows in batches.
+
+    With ``update_existing`` a row whose serial number matches existing
+    equipment updates it (the oldest one, should serials repeat); otherwise
+    such rows are rejected. Rows without a serial number are always
+    inserted. Only the columns present in the file are written on update.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, update_existing: bool = True, dry_run: bool = False, batch_size: Optional[int] = None):
+        self.update_existing = update_existing
+        self.dry_run = dry_run
+        self.batch_size = batch_size or self.BATCH_SIZE
+        # Scalar form fields, reused for every row
+        form_fields = EquipmentForm.base_fields
+        self.fields = {name: form_fields[name] for name in COLUMNS if name not in RELATED_COLUMNS}
+        self.status_labels = {label.lower(): value for value, label in Equipment.STATUS_CHOICES}
+
+    def run(self, file, filename: str) -> ImportResult:
+        """
+        Import every row of ``file``.
+
+        Raises:
+            ImportFileError: If the file cannot be read at all; batches
+                committed before a decoding error in the middle of a CSV file
+                are kept
+        """
+        columns, rows = read_rows(file, filename)
+        self.columns = columns
+        self.result = ImportResult(dry_run=self.dry_run)
+        self._report_file = self._report_writer = None
+        try:
+            batch = []
+            for line, record in rows:
+                batch.append((line, record))
+                if len(batch) >= self.batch_size:
+                    self._import_batch(batch)
+                    batch = []
+            if batch:
+                self._import_batch(batch)
+        finally:
+            if self._report_file is not None:
+                self._report_file.close()
+        if (self.result.created or self.result.updated) and not self.dry_run:
+            DashboardMetrics.invalidate()
+            FragmentCache.invalidate(Equipment)
+        return self.result
+
+    def _import_batch(self, batch: List[Tuple[int, Dict[str, str]]]) -> None:
+        self.result.rows += len(batch)
+        related = self._resolve(batch)
+        serials = {record.get('serial_number') for _, record in batch} - {'', None}
+        existing = {}
+        for serial, pk in Equipment.objects.filter(serial_number__in=serials).order_by('pk').values_list(
+            'serial_number', 'pk'
+        ):
+            existing.setdefault(serial, pk)
+
+        # serial number (or line, when blank) -> equipment; a later row of
+        # the same batch overrides an earlier one
+        to_create: Dict[object, Equipment] = {}
+        to_update: Dict[str, Equipment] = {}
+        for line, record in batch:
+            values, errors = self._clean(record, related)
+            serial = values.get('serial_number', '')
+            if serial in existing:
+                if not self.update_existing:
+                    errors.append(f'serial_number: equipment "{serial}" already exists.')
+            if errors:
+                self._reject(line, record, errors)
+                continue
+            if serial in existing:
+                to_update[serial] = Equipment(pk=existing[serial], **values)
+            else:
+                to_create[serial or ('line', line)] = Equipment(**values)
+
+        self.result.created += len(to_create)
+        self.result.updated += len(to_update)
+        if self.dry_run or not (to_create or to_update):
+            return
+        with transaction.atomic():
+            created = Equipment.objects.bulk_create(list(to_create.values()))
+            updated = list(to_update.values())
+            if updated:
+                # An upsert on the primary key writes the batch in one
+                # statement; bulk_update() would build a CASE per column
+                Equipment.objects.bulk_create(
+                    updated,
+                    update_conflicts=True,
+                    unique_fields=['id'],
+                    update_fields=self.columns,
+                )
+            # Bulk writes skip post_save, so the search entries are written
+            # here. Upserted instances only carry the imported columns, so
+            # updated rows are re-read to keep the fields the file lacks.
+            SearchIndex.save_entries([build_entry('equipment', obj) for obj in created if obj.pk])
+            SearchIndex.index_pks('equipment', [obj.pk for obj in updated])
+
+    def _resolve(self, batch) -> Dict[str, Dict[str, int]]:
+        """Map the names used in the batch to primary keys, one query per table."""
+        names = {column: set() for column in RELATED_COLUMNS}
+        for _, record in batch:
+            for column in RELATED_COLUMNS:
+                if record.get(column):
+                    names[column].add(record[column])
+
+        lookups = {
+            'category': lambda wanted: EquipmentCategory.objects.filter(name__in=wanted).values_list('name', 'pk'),
+            'maintenance_team': lambda wanted: Team.objects.filter(name__in=wanted).values_list('name', 'pk'),
+            'employee': lambda wanted: User.objects.filter(username__in=wanted).values_list('username', 'pk'),
+        }
+        related = {}
+        for column, lookup in lookups.items():
+            related[column] = {}
+            if names[column]:
+                # Lowest primary key wins on duplicate names
+                for name, pk in lookup(names[column]).order_by('-pk'):
+                    related[column][name] = pk
+
+        # Work centers are matched on their code as well as their name
+        related['work_center'] = {}
+        wanted = names['work_center']
+        if wanted:
+            centers = WorkCenter.objects.filter(Q(name__in=wanted) | Q(code__in=wanted)).order_by('-pk')
+            by_code = {}
+            for name, code, pk in centers.values_list('name', 'code', 'pk'):
+                related['work_center'][name] = pk
+                if code:
+                    by_code[code] = pk
+            # A code match is unambiguous, so it beats a name match
+            related['work_center'].update(by_code)
+        return related
+
+    def _clean(self, record: Dict[str, str], related) -> Tuple[Dict[str, object], List[str]]:
+        """Validate one row; returns model field values and error messages."""
+        values, errors = {}, []
+        for column in self.columns:
+            raw = record.get(column, '')
+            if column in RELATED_COLUMNS:
+                if not raw:
+                    values[f'{column}_id'] = None
+                elif raw in related[column]:
+                    values[f'{column}_id'] = related[column][raw]
+                else:
+                    errors.append(f'{column}: unknown {column.replace("_", " ")} "{raw}".')
+                continue
+            if column == 'status':
+                raw = self.status_labels.get(raw.lower(), raw) or Equipment._meta.get_field('status').default
+            try:
+                values[column] = self.fields[column].clean(raw)
+            except ValidationError as exc:
+                errors.extend(f'{column}: {message}' for message in exc.messages)
+        return values, errors
+
+    def _reject(self, line: int, record: Dict[str, str], errors: List[str]) -> None:
+        self.result.errors += 1
+        if self._report_writer is None:
+            self.result.report = str(uuid.uuid4())
+            path = report_path(self.result.report)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._report_file = open(path, 'w', newline='', encoding='utf-8')
+            self._report_writer = csv.writer(self._report_file)
+            self._report_writer.writerow(['line', 'errors', *self.columns])
+        self._report_writer.writerow([line, ' '.join(errors), *(record.get(column, '') for column in self.columns)])
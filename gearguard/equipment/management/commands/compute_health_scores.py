@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from equipment.health import HealthScorer
+
+
+class Command(BaseCommand):
+    help = 'Recompute the health score of every piece of equipment in one vectorised batch'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = HealthScorer().run()
+        self.stdout.write(self.style.SUCCESS(
+            f"  [OK] {result['scored']} scored, {result['updated']} updated, "
+            f"{result['critical']} critical in {time.perf_counter() - started:.2f}s"
+        ))
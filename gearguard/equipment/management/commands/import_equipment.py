@@ -0,0 +1,47 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from equipment.importer import EquipmentImporter, ImportFileError, report_path
+
+
+class Command(BaseCommand):
+    help = 'Import equipment from a CSV or XLSX file, upserting on serial number'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (UTF-8) or XLSX file with a header row')
+        parser.add_argument('--create-only', action='store_true',
+                            help='Reject rows whose serial number already exists instead of updating them')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without writing')
+        parser.add_argument('--batch-size', type=int, default=EquipmentImporter.BATCH_SIZE,
+                            help=f'Rows per batch and transaction (default: {EquipmentImporter.BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'{path} does not exist')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        importer = EquipmentImporter(
+            update_existing=not options['create_only'],
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+        )
+        started = time.perf_counter()
+        try:
+            with path.open('rb') as file:
+                result = importer.run(file, path.name)
+        except ImportFileError as exc:
+            raise CommandError(str(exc))
+
+        suffix = ' (dry run, nothing written)' if result.dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'  [OK] {result.rows} rows read in {time.perf_counter() - started:.2f}s: '
+            f'{result.created} created, {result.updated} updated{suffix}'
+        ))
+        if result.errors:
+            self.stdout.write(self.style.ERROR(
+                f'  [ERR] {result.errors} rows rejected; see {report_path(result.report)}'
+            ))
@@ -0,0 +1,129 @@
+"""
+Per-equipment maintenance metrics.
+
+MTBF, MTTR, downtime and request counts are computed from the request
+history with one grouped aggregate query per batch of equipment and stored
+in :class:`EquipmentStats`. Signals refresh the rows of the equipment whose
+requests changed, so reading them costs a single primary-key lookup.
+"""
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+
+from gearguard.fragments import FragmentCache
+from maintenance.models import MaintenanceRequest
+from .models import Equipment, EquipmentStats
+
+STATS_FIELDS = [
+    'request_count', 'open_requests', 'failure_count', 'repair_count',
+    'total_downtime', 'mttr', 'mtbf', 'last_repair', 'updated_at',
+]
+
+
+def _whole_seconds(value: Optional[timedelta]) -> Optional[timedelta]:
+    return timedelta(seconds=round(value.total_seconds())) if value is not None else None
+
+
+class EquipmentMetrics:
+    """
+    Compute and store the :class:`EquipmentStats` rows.
+    """
+
+    BATCH_SIZE = 2000
+
+    @classmethod
+    def for_equipment(cls, equipment: Equipment) -> EquipmentStats:
+        """
+        Return the stats of ``equipment``, computing them once if the row
+        does not exist yet (equipment created before the stats table).
+        """
+        try:
+            return equipment.stats
+        except EquipmentStats.DoesNotExist:
+            return cls.refresh([equipment.pk])[0]
+
+    @classmethod
+    def refresh(cls, equipment_ids: Iterable[int]) -> List[EquipmentStats]:
+        """
+        Recompute and upsert the stats of the given equipment.
+
+        Equipment without any request gets a row of zeros; ids of deleted
+        equipment are ignored.
+
+        Returns:
+            The saved rows
+        """
+        ids = sorted(set(equipment_ids))
+        saved = []
+        for start in range(0, len(ids), cls.BATCH_SIZE):
+            chunk = ids[start:start + cls.BATCH_SIZE]
+            existing = Equipment.objects.filter(pk__in=chunk).values_list('pk', flat=True)
+            figures = cls.compute(chunk)
+            rows = [figures.get(pk) or EquipmentStats(equipment_id=pk) for pk in existing]
+            EquipmentStats.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['equipment'],
+                update_fields=STATS_FIELDS,
+            )
+            saved.extend(rows)
+        # The detail panel shows the stats
+        FragmentCache.invalidate(Equipment, ids)
+        return saved
+
+    @classmethod
+    def refresh_all(cls) -> int:
+        """Recompute the stats of every piece of equipment; returns the row count."""
+        ids = Equipment.objects.order_by('pk').values_list('pk', flat=True)
+        return len(cls.refresh(ids.iterator(chunk_size=cls.BATCH_SIZE)))
+
+    @staticmethod
+    def compute(equipment_ids: List[int]) -> dict:
+        """
+        Aggregate the request history of the given equipment in one query.
+
+        MTTR is the mean duration of repaired breakdowns. MTBF is the time
+        between the first and the last scheduled breakdown divided by the
+        number of intervals, so it needs at least two breakdowns.
+
+        Returns:
+            Unsaved :class:`EquipmentStats` keyed by equipment id, for the
+            equipment that has at least one request
+        """
+        corrective = Q(maintenance_type='corrective')
+        repaired = Q(stage='repaired')
+        dated_failure = corrective & Q(scheduled_date__isnull=False)
+
+        rows = MaintenanceRequest.objects.filter(
+            equipment_id__in=equipment_ids
+        ).order_by().values('equipment_id').annotate(
+            request_count=Count('id'),
+            open_requests=Count('id', filter=Q(stage__in=MaintenanceRequest.OPEN_STAGES)),
+            failure_count=Count('id', filter=corrective),
+            repair_count=Count('id', filter=repaired),
+            total_downtime=Sum('duration', filter=repaired),
+            mttr=Avg('duration', filter=repaired & corrective),
+            last_repair=Max('scheduled_date', filter=repaired),
+            dated_failures=Count('id', filter=dated_failure),
+            first_failure=Min('scheduled_date', filter=dated_failure),
+            last_failure=Max('scheduled_date', filter=dated_failure),
+        )
+
+        stats = {}
+        for row in rows:
+            mtbf = None
+            if row['dated_failures'] > 1:
+                mtbf = (row['last_failure'] - row['first_failure']) / (row['dated_failures'] - 1)
+            stats[row['equipment_id']] = EquipmentStats(
+                equipment_id=row['equipment_id'],
+                request_count=row['request_count'],
+                open_requests=row['open_requests'],
+                failure_count=row['failure_count'],
+                repair_count=row['repair_count'],
+                total_downtime=row['total_downtime'] or timedelta(),
+                mttr=_whole_seconds(row['mttr']),
+                mtbf=_whole_seconds(mtbf),
+                last_repair=row['last_repair'],
+            )
+        return stats
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_equipment_company'),
+        ('teams', '0002_team_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['name', 'id'], name='eq_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['created_at', 'id'], name='eq_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['serial_number', 'id'], name='eq_serial_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['status', 'name', 'id'], name='eq_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['company', 'name', 'id'], name='eq_company_name_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:14
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0003_equipment_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentStats',
+            fields=[
+                ('equipment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='equipment.equipment')),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('open_requests', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('repair_count', models.PositiveIntegerField(default=0)),
+                ('total_downtime', models.DurationField(default=datetime.timedelta)),
+                ('mttr', models.DurationField(blank=True, null=True)),
+                ('mtbf', models.DurationField(blank=True, null=True)),
+                ('last_repair', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Equipment Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0004_equipment_stats'),
+        ('teams', '0002_team_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='health_score',
+            field=models.PositiveSmallIntegerField(default=100),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['health_score', 'id'], name='eq_health_id_idx'),
+        ),
+    ]
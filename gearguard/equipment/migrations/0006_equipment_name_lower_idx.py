@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:27
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0005_equipment_health_score'),
+        ('teams', '0003_workcenterrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('id'), name='eq_name_lower_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 
 class EquipmentCategory(models.Model):
@@ -35,5 +38,59 @@ class Equipment(models.Model):
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
 
+    # Below this health score, equipment that is not scrapped is critical
+    CRITICAL_HEALTH = 30
+    # Below this one its health badge shows a warning
+    WARNING_HEALTH = 60
+
+    # 0-100, recomputed for the whole fleet by equipment.health.HealthScorer
+    health_score = models.PositiveSmallIntegerField(default=100)
+
+    class Meta:
+        indexes = [
+            # Keyset orderings offered by the equipment list
+            models.Index(fields=['name', 'id'], name='eq_name_id_idx'),
+            # Case-insensitive name prefix searches (lookups, list filter)
+            models.Index(Lower('name'), models.F('id'), name='eq_name_lower_idx'),
+            models.Index(fields=['created_at', 'id'], name='eq_created_id_idx'),
+            models.Index(fields=['serial_number', 'id'], name='eq_serial_id_idx'),
+            # Status filter (and status sort) combined with the default name order
+            models.Index(fields=['status', 'name', 'id'], name='eq_status_name_idx'),
+            # Company filter and the distinct company list of the filter form
+            models.Index(fields=['company', 'name', 'id'], name='eq_company_name_idx'),
+            # Critical-equipment counts and the worst-health-first sort
+            models.Index(fields=['health_score', 'id'], name='eq_health_id_idx'),
+        ]
+
     def __str__(self):
         return self.name
+
+
+
+class EquipmentStats(models.Model):
+    """
+    Denormalised maintenance figures of one piece of equipment.
+
+    Rows are recomputed from the request history with aggregate queries by
+    :class:`equipment.metrics.EquipmentMetrics` whenever a linked request
+    changes, so the detail page reads them instead of aggregating.
+    """
+    equipment = models.OneToOneField(Equipment, primary_key=True, related_name='stats', on_delete=models.CASCADE)
+    request_count = models.PositiveIntegerField(default=0)
+    open_requests = models.PositiveIntegerField(default=0)
+    # Corrective requests, i.e. breakdowns
+    failure_count = models.PositiveIntegerField(default=0)
+    repair_count = models.PositiveIntegerField(default=0)
+    # Sum of the durations of repaired requests
+    total_downtime = models.DurationField(default=timedelta)
+    # Mean time to repair / between failures; null until there is enough history
+    mttr = models.DurationField(null=True, blank=True)
+    mtbf = models.DurationField(null=True, blank=True)
+    last_repair = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Equipment Stats"
+
+    def __str__(self):
+        return f'Stats for equipment #{self.equipment_id}'
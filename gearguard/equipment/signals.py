@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from gearguard.fragments import FragmentCache
+from gearguard.lookups import CachedChoices
+from maintenance.models import MaintenanceRequest
+from maintenance.signals import requests_changed
+from .metrics import EquipmentMetrics
+from .models import Equipment, EquipmentCategory
+
+# Request fields the stats are computed from; saves touching none are skipped
+STATS_SOURCE_FIELDS = {'equipment', 'stage', 'maintenance_type', 'duration', 'scheduled_date'}
+
+
+@receiver([post_save, post_delete], sender=MaintenanceRequest)
+def refresh_request_equipment_stats(sender, instance, update_fields=None, **kwargs):
+    """Recompute the stats of the equipment a saved or deleted request belongs to."""
+    if update_fields is not None and not STATS_SOURCE_FIELDS & set(update_fields):
+        return
+    equipment_ids = {instance.equipment_id, getattr(instance, '_loaded_equipment_id', None)} - {None}
+    if equipment_ids:
+        EquipmentMetrics.refresh(equipment_ids)
+    instance._loaded_equipment_id = instance.equipment_id
+
+
+@receiver(requests_changed, sender=MaintenanceRequest)
+def refresh_changed_equipment_stats(sender, pks=None, equipment_ids=None, **kwargs):
+    """Recompute the stats of the equipment whose requests were changed in bulk."""
+    ids = set(equipment_ids or ())
+    if pks is not None:
+        ids.update(MaintenanceRequest.objects.filter(
+            pk__in=pks, equipment__isnull=False
+        ).values_list('equipment_id', flat=True).distinct())
+    if ids:
+        EquipmentMetrics.refresh(ids)
+
+
+@receiver([post_save, post_delete], sender=Equipment)
+def invalidate_equipment_fragments(sender, instance, **kwargs):
+    """Re-render the cached rows and panels of the saved or deleted equipment only."""
+    FragmentCache.invalidate(sender, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=EquipmentCategory)
+def invalidate_category_choices(sender, **kwargs):
+    """Drop the cached category options and every fragment showing a category."""
+    CachedChoices.invalidate(sender)
+    FragmentCache.invalidate(sender)
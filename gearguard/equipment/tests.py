@@ -1,3 +1,121 @@
-from django.test import TestCase
+import io
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from gearguard.lookups import lookup
+from search.models import SearchEntry
+from .forms import EquipmentFilterForm
+from .health import HealthScorer
+from .importer import EquipmentImporter
+from .models import Equipment
+
+
+class EquipmentLookupTests(TestCase):
+
+    def test_finds_indexed_equipment_by_word(self):
+        pump = Equipment.objects.create(name='Coolant Pump 7', serial_number='CP-0007')
+        self.assertEqual([item['id'] for item in lookup('equipment', 'pump')], [pump.pk])
+        self.assertEqual([item['id'] for item in lookup('equipment', 'CP-00')], [pump.pk])
+
+    def test_falls_back_to_name_prefix_for_unindexed_equipment(self):
+        # bulk_create skips the post_save indexer
+        Equipment.objects.bulk_create([
+            Equipment(name='Conveyors 003000', serial_number='SYN-00003000'),
+            Equipment(name='Conveyors 003001', serial_number='SYN-00003001'),
+        ])
+        items = lookup('equipment', 'Conveyors 003000')
+        self.assertEqual([item['text'] for item in items], ['Conveyors 003000 (SYN-00003000)'])
+        items = lookup('equipment', 'conveyors 00300')
+        self.assertEqual(len(items), 2)
+
+    def test_user_prefix_ignores_case(self):
+        john = User.objects.create_user('John')
+        User.objects.create_user('joanna')
+        self.assertEqual([item['id'] for item in lookup('users', 'john')], [john.pk])
+        self.assertEqual([item['text'] for item in lookup('users', 'JO')], ['joanna', 'John'])
+
+
+class EquipmentFilterTests(TestCase):
+
+    def test_search_uses_the_index(self):
+        pump = Equipment.objects.create(name='Coolant Pump 7', serial_number='CP-0007', company='Acme')
+        Equipment.objects.create(name='Lathe', serial_number='LT-1', company='Acme')
+
+        def search(query):
+            return list(EquipmentFilterForm({'q': query}).filter(Equipment.objects.all()))
+
+        self.assertEqual(search('pum'), [pump])
+        self.assertEqual(search('CP-00'), [pump])
+        self.assertEqual(len(search('acme')), 2)
+        self.assertEqual(search('missing'), [])
+
+    def test_badges_follow_the_critical_threshold(self):
+        user = User.objects.create_user('planner')
+        self.client.force_login(user)
+        Equipment.objects.create(name='Worn press', serial_number='P-1', health_score=40)
+        Equipment.objects.create(name='Tired press', serial_number='P-2', health_score=50)
+
+        with mock.patch.object(Equipment, 'CRITICAL_HEALTH', 45):
+            response = self.client.get(reverse('equipment:equipment_list'))
+            self.assertContains(response, 'font-bold text-red-400', count=1)
+            self.assertContains(response, 'font-bold text-yellow-400', count=1)
+            response = self.client.get(reverse('equipment:equipment_list'), {'health': 'critical'})
+        self.assertContains(response, 'Worn press')
+        self.assertNotContains(response, 'Tired press')
+
+
+class EquipmentImportTests(TestCase):
+
+    def test_partial_update_keeps_indexed_fields(self):
+        press = Equipment.objects.create(
+            name='Press', serial_number='HP-1', description='Hydraulic press', company='Acme Works',
+        )
+        csv_file = io.BytesIO(b'name,serial_number\nPress 2000,HP-1\nLathe,LT-1\n')
+        result = EquipmentImporter().run(csv_file, 'equipment.csv')
+
+        self.assertEqual((result.created, result.updated, result.errors), (1, 1, 0))
+        entry = SearchEntry.objects.get(kind='equipment', object_id=press.pk)
+        self.assertEqual(entry.title, 'Press 2000')
+        self.assertEqual(entry.body, 'Hydraulic press Acme Works')
+        lathe = Equipment.objects.get(serial_number='LT-1')
+        self.assertTrue(SearchEntry.objects.filter(kind='equipment', object_id=lathe.pk).exists())
+
+
+class HealthScoreTests(SimpleTestCase):
+
+    def score(self, status, age_years, recent_failures, urgent_open):
+        return HealthScorer().score(
+            np.array(status), np.array(age_years, dtype=float),
+            np.array(recent_failures, dtype=float), np.array(urgent_open, dtype=float),
+        )
+
+    def test_bounds(self):
+        scores = self.score(
+            ['active', 'active', 'under_maintenance', 'active'],
+            [0.0, 0.01, 50.0, 3.0],
+            [0, 1000, 1000, 2],
+            [0, 0, 1000, 1],
+        )
+        self.assertEqual(scores.dtype, np.int64)
+        self.assertEqual(scores[0], 100)
+        self.assertTrue(((scores >= 0) & (scores <= 100)).all(), scores)
+        self.assertEqual(scores[2], 0)
+
+    def test_scrapped_scores_zero(self):
+        self.assertEqual(self.score(['scrapped'], [0.0], [0], [0]).tolist(), [0])
+
+    def test_worse_history_never_scores_higher(self):
+        failures = self.score(['active'] * 4, [2.0] * 4, [0, 1, 4, 20], [0] * 4)
+        urgent = self.score(['active'] * 4, [2.0] * 4, [0] * 4, [0, 1, 3, 10])
+        ages = self.score(['active'] * 4, [0.0, 2.0, 9.0, 30.0], [0] * 4, [0] * 4)
+        for scores in (failures, urgent, ages):
+            self.assertEqual(scores.tolist(), sorted(scores.tolist(), reverse=True))
+
+    def test_young_assets_are_not_overpenalised(self):
+        # One breakdown in the first week is annualised from MIN_RATE_YEARS
+        week_old, quarter_old = self.score(['active'] * 2, [0.02, 0.25], [1, 1], [0, 0])
+        self.assertEqual(week_old, quarter_old)
@@ -1,20 +1,82 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Equipment
-from .forms import EquipmentForm
+from django.http import FileResponse, Http404
+from gearguard.fragments import FragmentCache
+from gearguard.routers import use_replica
+from gearguard.utils.pagination import KeysetPaginator, InvalidCursor
+from maintenance.models import MaintenanceRequest
+from teams.models import Team, WorkCenter
+from .models import Equipment, EquipmentCategory
+from .forms import EquipmentForm, EquipmentFilterForm, EquipmentImportForm
+from .importer import EquipmentImporter, ImportFileError, report_path
+from .metrics import EquipmentMetrics
+
+# Columns the list table renders (plus the keyset sort keys)
+LIST_FIELDS = ('id', 'name', 'company', 'serial_number', 'status', 'health_score', 'created_at', 'category__name')
+# Newest first; served by the (equipment, -request_date, -id) request index
+HISTORY_ORDERING = ('-request_date', '-id')
+HISTORY_PER_PAGE = 10
+HISTORY_FIELDS = (
+	'id', 'subject', 'maintenance_type', 'stage', 'priority', 'request_date', 'scheduled_date', 'duration',
+	'equipment_id', 'technician__username',
+)
+# Session key listing the error reports the user may download
+IMPORT_REPORTS_SESSION_KEY = 'equipment_import_reports'
 
 
 @login_required
+@use_replica
 def equipment_list(request):
-	items = Equipment.objects.all()
-	return render(request, 'equipment/list.html', {'equipment_list': items})
+	"""View to list equipment one keyset page at a time, filtered and sorted."""
+	filter_form = EquipmentFilterForm(request.GET)
+	queryset = filter_form.filter(
+		Equipment.objects.select_related('category').only(*LIST_FIELDS)
+	)
+	paginator = KeysetPaginator(queryset, filter_form.ordering(), request.GET.get('per_page'))
+	try:
+		page = paginator.page(request.GET.get('cursor'), request.GET.get('direction', 'next'))
+	except InvalidCursor:
+		page = paginator.page()
+
+	# Filters and sort (minus the cursor) are carried over into the pager links
+	query = request.GET.copy()
+	for key in ('cursor', 'direction'):
+		query.pop(key, None)
+
+	# Rows whose equipment and categories are unchanged come from the fragment cache
+	FragmentCache.stamp(page, Equipment, EquipmentCategory)
+
+	context = {
+		'equipment_list': page,
+		'page': page,
+		'filter_form': filter_form,
+		'filter_query': query.urlencode(),
+	}
+	return render(request, 'equipment/list.html', context)
 
 
 @login_required
 def equipment_detail(request, pk):
-	obj = get_object_or_404(Equipment, pk=pk)
-	return render(request, 'equipment/detail.html', {'equipment': obj})
+	"""View an equipment with its stored metrics and a page of its request history."""
+	obj = get_object_or_404(
+		Equipment.objects.select_related('category', 'maintenance_team', 'work_center', 'stats'), pk=pk
+	)
+	history = MaintenanceRequest.objects.filter(equipment=obj).select_related('technician').only(*HISTORY_FIELDS)
+	paginator = KeysetPaginator(history, HISTORY_ORDERING, HISTORY_PER_PAGE)
+	try:
+		page = paginator.page(request.GET.get('cursor'), request.GET.get('direction', 'next'))
+	except InvalidCursor:
+		page = paginator.page()
+
+	FragmentCache.stamp([obj], Equipment, EquipmentCategory, Team, WorkCenter)
+
+	context = {
+		'equipment': obj,
+		'stats': EquipmentMetrics.for_equipment(obj),
+		'history': page,
+	}
+	return render(request, 'equipment/detail.html', context)
 
 
 @login_required
@@ -52,6 +114,52 @@ def equipment_edit(request, pk):
 	else:
 		form = EquipmentForm(instance=equipment)
 	return render(request, 'equipment/equipment_form.html', {'form': form, 'title': 'Edit Equipment'})
+
+
+@login_required
+def equipment_import(request):
+	"""View to import equipment from an uploaded CSV or XLSX file."""
+	result = None
+	if request.method == 'POST':
+		form = EquipmentImportForm(request.POST, request.FILES)
+		if form.is_valid():
+			upload = form.cleaned_data['file']
+			importer = EquipmentImporter(
+				update_existing=form.cleaned_data['update_existing'],
+				dry_run=form.cleaned_data['dry_run'],
+			)
+			try:
+				result = importer.run(upload, upload.name)
+			except ImportFileError as exc:
+				messages.error(request, f'file: {exc}')
+			else:
+				if result.report:
+					reports = request.session.get(IMPORT_REPORTS_SESSION_KEY, [])
+					request.session[IMPORT_REPORTS_SESSION_KEY] = (reports + [result.report])[-20:]
+				verb = 'would be' if result.dry_run else 'were'
+				messages.success(
+					request,
+					f'{result.rows} rows read: {result.created} {verb} created, {result.updated} {verb} updated, '
+					f'{result.errors} rejected.'
+				)
+		else:
+			for field, errors in form.errors.items():
+				for error in errors:
+					messages.error(request, f'{field}: {error}')
+	else:
+		form = EquipmentImportForm()
+	return render(request, 'equipment/import.html', {'form': form, 'result': result})
+
+
+@login_required
+def equipment_import_report(request, report):
+	"""Download the error report of one of the user's imports."""
+	if str(report) not in request.session.get(IMPORT_REPORTS_SESSION_KEY, []):
+		raise Http404('No such import report.')
+	path = report_path(str(report))
+	if not path.exists():
+		raise Http404('The import report has been removed.')
+	return FileResponse(open(path, 'rb'), as_attachment=True, filename='equipment-import-errors.csv')
 	
 @login_required
 def equipment_scrap(request, pk):
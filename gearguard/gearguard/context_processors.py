@@ -0,0 +1,38 @@
+"""
+Template context shared by every page.
+"""
+from django.conf import settings
+
+from equipment.models import Equipment
+
+# (path prefix, nav section); the first match wins, so nested prefixes come first
+NAV_SECTIONS = (
+    ('/equipment/', 'equipment'),
+    ('/maintenance/', 'maintenance'),
+    ('/teams/workcenters/', 'workcenters'),
+    ('/teams/', 'teams'),
+    ('/search/', 'search'),
+)
+
+
+def navigation(request):
+    """
+    The nav section of the current page, worked out once per request
+    instead of by a path test on every nav link.
+    """
+    path = request.path
+    if path == '/':
+        section = 'dashboard'
+    else:
+        section = next((name for prefix, name in NAV_SECTIONS if path.startswith(prefix)), '')
+    return {'nav_section': section}
+
+
+def fragment_cache(request):
+    """Lifetime of the cached template fragments (``{% cache fragment_timeout ... %}``)."""
+    return {'fragment_timeout': settings.CACHE_TTLS['fragments']}
+
+
+def health_thresholds(request):
+    """Health score bands of the equipment badges, so they match the critical filter and counts."""
+    return {'critical_health': Equipment.CRITICAL_HEALTH, 'warning_health': Equipment.WARNING_HEALTH}
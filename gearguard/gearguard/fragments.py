@@ -0,0 +1,77 @@
+"""
+Version stamps for cached template fragments.
+
+Table rows and detail panels are cached with Django's ``{% cache %}`` tag,
+varied on the object's primary key and the ``fragment_version`` that
+:meth:`FragmentCache.stamp` sets on it. A version joins two kinds of
+counters kept with :class:`~gearguard.utils.cache_versions.CacheVersion`:
+
+* one per row, bumped by the save/delete signals of that row, so editing
+  one piece of equipment re-renders only its own row;
+* one per table the fragment also reads (categories, teams, work
+  centers...), bumped by any save or delete on that table.
+
+Bulk writers send no signals and call :meth:`FragmentCache.invalidate`
+themselves. Counters live in the default cache next to the fragments, so
+any backend works (local memory, file, database, memcached); stale
+fragments are never deleted, only no longer looked up, and expire after
+``CACHE_TTLS['fragments']``.
+"""
+from typing import Iterable, Optional
+
+from gearguard.utils.cache_versions import CacheVersion
+
+
+class FragmentCache:
+    """
+    Row and table versions of cached template fragments.
+    """
+
+    # Above this many rows, invalidating a whole table costs less than
+    # bumping one counter per row
+    MAX_ROW_BUMPS = 100
+
+    @staticmethod
+    def _namespace(model, pk=None) -> str:
+        namespace = f'fragments:{model._meta.label_lower}'
+        return namespace if pk is None else f'{namespace}:{pk}'
+
+    @classmethod
+    def stamp(cls, objects: Iterable, model, *depends_on) -> Iterable:
+        """
+        Set ``fragment_version`` on every object, reading all counters at once.
+
+        Args:
+            objects: Instances of ``model`` (a list, page or evaluated-on-
+                iteration queryset; it is iterated twice)
+            model: Model of the objects, whose row counters are used
+            depends_on: Other models the fragments render fields of
+
+        Returns:
+            ``objects``, for use in the view's context
+        """
+        tables = [cls._namespace(table) for table in (model, *depends_on)]
+        rows = {obj.pk: cls._namespace(model, obj.pk) for obj in objects}
+        versions = CacheVersion.get_many(tables + list(rows.values()))
+        prefix = '.'.join(str(versions[namespace]) for namespace in tables)
+        for obj in objects:
+            obj.fragment_version = f'{prefix}.{versions[rows[obj.pk]]}'
+        return objects
+
+    @classmethod
+    def invalidate(cls, model, pks: Optional[Iterable] = None) -> None:
+        """
+        Orphan cached fragments of ``model``.
+
+        Args:
+            model: Changed model
+            pks: Changed rows; None (or more than ``MAX_ROW_BUMPS`` of them)
+                invalidates the whole table, including every fragment that
+                lists it in ``depends_on``
+        """
+        pks = None if pks is None else set(pks)
+        if pks is None or len(pks) > cls.MAX_ROW_BUMPS:
+            CacheVersion.bump(cls._namespace(model))
+            return
+        for pk in pks:
+            CacheVersion.bump(cls._namespace(model, pk))
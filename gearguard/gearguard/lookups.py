@@ -0,0 +1,152 @@
+"""
+Choice lookups for foreign-key form fields.
+
+Large tables (equipment, users) are never rendered as full ``<select>``
+lists; :func:`lookup` answers type-ahead queries with prefix searches that
+an index serves. Small tables (teams, work centers, categories) are read
+once into :class:`CachedChoices` and served from the cache until a save or
+delete on the table bumps its version.
+"""
+from typing import Callable, Dict, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+from equipment.models import Equipment, EquipmentCategory
+from gearguard.utils.cache_versions import CacheVersion
+from search.index import SearchQuery
+from teams.models import Team, WorkCenter
+
+MAX_RESULTS = 50
+
+
+class CachedChoices:
+    """
+    ``(pk, label)`` lists of small tables kept in the cache.
+    """
+
+    CACHE_TIMEOUT = settings.CACHE_TTLS['choices']  # versioned keys; this only bounds stale entries
+
+    # name -> queryset factory; labels are ``str(obj)``, as the form fields render them
+    SOURCES = {
+        'teams': lambda: Team.objects.only('id', 'name').order_by('name'),
+        'work_centers': lambda: WorkCenter.objects.only('id', 'name', 'code').order_by('name'),
+        'categories': lambda: EquipmentCategory.objects.only('id', 'name').order_by('name'),
+    }
+
+    @staticmethod
+    def _namespace(model) -> str:
+        return f'choices:{model._meta.label_lower}'
+
+    @classmethod
+    def get(cls, name: str) -> List[Tuple[int, str]]:
+        """
+        Return the choices of ``name``, reading the table on a cache miss.
+
+        Raises:
+            KeyError: If ``name`` is not a known choice set
+        """
+        queryset = cls.SOURCES[name]()
+        version = CacheVersion.get(cls._namespace(queryset.model))
+        key = f'choices:{name}:{version}'
+        choices = cache.get(key)
+        if choices is None:
+            choices = [(obj.pk, str(obj)) for obj in queryset]
+            cache.set(key, choices, cls.CACHE_TIMEOUT)
+        return choices
+
+    @classmethod
+    def invalidate(cls, model) -> None:
+        """Orphan every cached choice set read from ``model``."""
+        CacheVersion.bump(cls._namespace(model))
+
+
+def _name_prefix(queryset, prefix: str):
+    """
+    Filter ``queryset`` to names starting with ``prefix``, ignoring case.
+
+    A half-open range on ``Lower('name')`` rather than LIKE, so every backend
+    seeks the expression index (``eq_name_lower_idx``). SQLite only lowers
+    ASCII letters, so other scripts still match case-sensitively there.
+    """
+    prefix = prefix.lower()
+    return queryset.alias(name_lower=Lower('name')).filter(
+        name_lower__gte=prefix, name_lower__lt=prefix + '\uffff'
+    )
+
+
+def _equipment_rows(queryset, limit: int, ordering=('name', 'id')) -> List[Dict]:
+    rows = queryset.order_by(*ordering).values_list('id', 'name', 'serial_number')[:limit]
+    return [{'id': pk, 'text': f'{name} ({serial})' if serial else name} for pk, name, serial in rows]
+
+
+def _equipment(query: str, limit: int) -> List[Dict]:
+    if not query:
+        return _equipment_rows(Equipment.objects.all(), limit)
+
+    # Word-prefix matches on name and serial from the full-text index, after
+    # exact serial-number prefix hits
+    search = SearchQuery(query, 'equipment')
+    results = search.page(1)
+    items, seen = [], set()
+    for equipment in results.exact:
+        items.append({'id': equipment.pk, 'text': f'{equipment.name} ({equipment.serial_number})'})
+        seen.add(equipment.pk)
+    for entry in results.entries:
+        if entry.object_id not in seen:
+            text = f'{entry.title} ({entry.keys})' if entry.keys else entry.title
+            items.append({'id': entry.object_id, 'text': text})
+            seen.add(entry.object_id)
+    if not items:
+        # Equipment missing from the index (bulk loaded, not yet re-indexed)
+        # is still found by a name prefix on the (lower(name), id) index
+        return _equipment_rows(_name_prefix(Equipment.objects.all(), query), limit, (Lower('name'), 'id'))
+    return items[:limit]
+
+
+def _users(query: str, limit: int) -> List[Dict]:
+    queryset = User.objects.filter(is_active=True)
+    if query:
+        # LIKE scans, but the user table is small enough not to need an index
+        queryset = queryset.filter(username__istartswith=query)
+    return [
+        {'id': pk, 'text': username}
+        for pk, username in queryset.order_by(Lower('username'), 'id').values_list('id', 'username')[:limit]
+    ]
+
+
+def _cached(name: str) -> Callable[[str, int], List[Dict]]:
+    def search(query: str, limit: int) -> List[Dict]:
+        needle = query.casefold()
+        return [
+            {'id': pk, 'text': label}
+            for pk, label in CachedChoices.get(name) if needle in label.casefold()
+        ][:limit]
+    return search
+
+
+LOOKUPS: Dict[str, Callable[[str, int], List[Dict]]] = {
+    'equipment': _equipment,
+    'users': _users,
+    **{name: _cached(name) for name in CachedChoices.SOURCES},
+}
+
+
+def lookup(name: str, query: str, limit: int = 20) -> List[Dict]:
+    """
+    Run the named lookup.
+
+    Args:
+        name: Key of :data:`LOOKUPS`
+        query: Text typed so far (may be empty)
+        limit: Maximum number of results, capped at ``MAX_RESULTS``
+
+    Returns:
+        ``[{'id': ..., 'text': ...}]`` in display order
+
+    Raises:
+        KeyError: If ``name`` is not a known lookup
+    """
+    return LOOKUPS[name](query.strip(), max(1, min(limit, MAX_RESULTS)))
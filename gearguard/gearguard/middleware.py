@@ -0,0 +1,210 @@
+"""
+Opt-in per-request instrumentation.
+
+When ``INSTRUMENTATION_ENABLED`` is set, :class:`InstrumentationMiddleware`
+records for every request the resolved view, the number and total time of
+SQL queries, repeated query shapes (the signature of an N+1 loop), template
+render time and response size. The figures are sent back in a
+``Server-Timing`` header (visible in the browser's network panel), logged on
+the ``gearguard.instrumentation`` logger and aggregated per view in
+:data:`request_stats`, which the staff-only stats endpoint exposes.
+"""
+import contextvars
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger('gearguard.instrumentation')
+
+# Metrics of the request being served by the current thread/task
+_current_metrics: contextvars.ContextVar = contextvars.ContextVar('gearguard_request_metrics', default=None)
+
+# ``IN (%s, %s, ...)`` lists of any length share one fingerprint
+_IN_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+# Literals inlined into raw SQL
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def query_fingerprint(sql: str) -> str:
+    """
+    Reduce a SQL statement to its shape so repeated executions match.
+
+    ORM queries already carry their values as parameters; inline literals
+    and variable-length ``IN`` lists are normalised as well.
+    """
+    shape = _LITERALS.sub('?', _IN_LIST.sub('(%s...)', sql))
+    return hashlib.sha1(' '.join(shape.split()).encode()).hexdigest()[:12]
+
+
+class RequestMetrics:
+    """Figures collected while serving one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.fingerprints: Counter = Counter()
+        self.samples: Dict[str, str] = {}
+        self._template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing every statement."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+            fingerprint = query_fingerprint(sql)
+            self.fingerprints[fingerprint] += 1
+            self.samples.setdefault(fingerprint, sql[:300])
+
+    @property
+    def duplicates(self) -> int:
+        """Executions beyond the first of each query shape."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def repeated(self, limit: int = 3):
+        """The most repeated query shapes as ``(count, sample SQL)``."""
+        return [
+            (count, self.samples[fingerprint])
+            for fingerprint, count in self.fingerprints.most_common(limit) if count > 1
+        ]
+
+
+_original_render = Template.render
+
+
+def _timed_render(self, context):
+    """
+    ``Template.render`` that adds the outermost render to the request's
+    template time; included and extended templates are part of it. Lazy
+    querysets evaluated by the template count towards both DB and template.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None or metrics._template_depth:
+        return _original_render(self, context)
+    metrics._template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        metrics.template_seconds += time.perf_counter() - started
+        metrics._template_depth -= 1
+
+
+class RequestStats:
+    """Thread-safe per-view aggregates since process start (or last reset)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, view: str, total_ms: float, metrics: RequestMetrics, size: Optional[int]) -> None:
+        with self._lock:
+            entry = self._views.setdefault(view, {
+                'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'db_ms': 0.0, 'template_ms': 0.0,
+                'queries': 0, 'max_queries': 0, 'duplicate_queries': 0, 'bytes': 0,
+            })
+            entry['requests'] += 1
+            entry['total_ms'] += total_ms
+            entry['max_ms'] = max(entry['max_ms'], total_ms)
+            entry['db_ms'] += metrics.db_seconds * 1000
+            entry['template_ms'] += metrics.template_seconds * 1000
+            entry['queries'] += metrics.queries
+            entry['max_queries'] = max(entry['max_queries'], metrics.queries)
+            entry['duplicate_queries'] += metrics.duplicates
+            entry['bytes'] += size or 0
+            repeated = metrics.repeated(1)
+            if repeated and repeated[0][0] >= entry.get('worst_repeat', 0):
+                entry['worst_repeat'], entry['worst_repeat_sql'] = repeated[0]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-view totals and means, slowest cumulative time first.
+        """
+        with self._lock:
+            views = {name: dict(entry) for name, entry in self._views.items()}
+        for entry in views.values():
+            count = entry['requests']
+            for key in ('total_ms', 'db_ms', 'template_ms', 'queries', 'bytes'):
+                entry[f'mean_{key}'] = round(entry[key] / count, 2)
+            for key in ('total_ms', 'max_ms', 'db_ms', 'template_ms'):
+                entry[key] = round(entry[key], 2)
+        return dict(sorted(views.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+
+request_stats = RequestStats()
+
+
+class InstrumentationMiddleware:
+    """
+    Measure each request's database, template and total time.
+
+    Listed first in ``MIDDLEWARE`` (settings does this when instrumentation
+    is enabled) so session and authentication queries are counted too.
+    Disabled, it removes itself from the stack at startup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'INSTRUMENTATION_SLOW_MS', 500)
+        self.duplicate_threshold = getattr(settings, 'INSTRUMENTATION_DUPLICATE_THRESHOLD', 5)
+        Template.render = _timed_render
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        size = None if response.streaming else len(response.content)
+
+        response['Server-Timing'] = ', '.join([
+            f'app;dur={total_ms:.1f}',
+            f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries, {metrics.duplicates} repeated"',
+            f'tpl;dur={metrics.template_seconds * 1000:.1f}',
+        ])
+        request_stats.record(view, total_ms, metrics, size)
+        self._log(request, response, view, total_ms, metrics, size)
+        return response
+
+    def _log(self, request, response, view, total_ms, metrics, size):
+        slow = total_ms >= self.slow_ms
+        chatty = metrics.duplicates >= self.duplicate_threshold
+        level = logging.WARNING if slow or chatty else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        message = (
+            f'{request.method} {request.path} view={view} status={response.status_code} '
+            f'total={total_ms:.1f}ms db={metrics.db_seconds * 1000:.1f}ms queries={metrics.queries} '
+            f'repeated={metrics.duplicates} template={metrics.template_seconds * 1000:.1f}ms bytes={size}'
+        )
+        if chatty:
+            message += ''.join(f'\n  {count}x {sql}' for count, sql in metrics.repeated())
+        logger.log(level, message)
@@ -0,0 +1,101 @@
+"""
+Read-replica routing for list, report and dashboard pages.
+
+Routing per model would send every read to the replica, including the
+reads a form makes right before it saves. Instead, views opt in with
+:func:`use_replica`; while such a view runs, :class:`ReplicaRouter` sends
+its reads to the ``replica`` alias. Writes always go to ``default``.
+
+Replicas lag behind the primary. A browser that has just posted (and is
+being redirected to a list) carries a short-lived cookie set by
+:class:`PrimaryAfterWriteMiddleware`, and its reads stay on the primary
+until the cookie expires. Cached data computed from replica reads (the
+dashboard snapshot, workload reports) may trail the primary by the
+replication lag until it is next invalidated.
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA = 'replica'
+PIN_COOKIE = 'gearguard_primary'
+SAFE_METHODS = ('GET', 'HEAD')
+
+_replica_reads: contextvars.ContextVar = contextvars.ContextVar('gearguard_replica_reads', default=False)
+
+
+class ReplicaRouter:
+    """Reads inside :func:`replica_reads` go to the replica; everything else to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and REPLICA in settings.DATABASES:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would write back to the alias an instance was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication
+        return False if db == REPLICA else None
+
+
+@contextmanager
+def replica_reads():
+    """Route the ORM reads of the enclosed block to the replica, when one is configured."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _streamed_from_replica(chunks):
+    # Streaming bodies run their queries after the view has returned
+    with replica_reads():
+        yield from chunks
+
+
+def use_replica(view):
+    """
+    Serve the reads of a read-only view from the replica.
+
+    Unsafe methods and browsers that wrote a moment ago read from the primary.
+    Apply below ``@login_required``.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES:
+            return view(request, *args, **kwargs)
+        # Resolve the session and user on the primary: a session created a
+        # moment ago may not have reached the replica yet
+        request.user.is_authenticated  # noqa: B018
+        with replica_reads():
+            response = view(request, *args, **kwargs)
+        if getattr(response, 'streaming', False):
+            response.streaming_content = _streamed_from_replica(response.streaming_content)
+        return response
+    return wrapped
+
+
+class PrimaryAfterWriteMiddleware:
+    """Keep a browser on the primary for ``DATABASE_REPLICA_PIN_SECONDS`` after it posts."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.DATABASE_REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from . import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,6 +27,9 @@ urlpatterns = [
     path('equipment/', include('equipment.urls')),
     path('maintenance/', include('maintenance.urls')),
     path('teams/', include('teams.urls')),
+    path('search/', include('search.urls')),
+    path('lookup/<str:name>/', views.lookup, name='lookup'),
+    path('instrumentation/stats/', views.instrumentation_stats, name='instrumentation_stats'),
 ]
 
 # Serve static and media in development
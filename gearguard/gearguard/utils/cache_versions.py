@@ -0,0 +1,88 @@
+"""
+Per-namespace version counters for cache invalidation.
+
+Instead of hunting down every cached entry derived from a table, callers
+fold the table's current version into their cache keys (or ETags) and a
+save/delete signal bumps the version, orphaning the stale entries at once.
+
+A bump writes a fresh value rather than incrementing: ``cache.incr`` is a
+non-atomic get and set on the file and database backends, so two
+concurrent bumps could both produce the same number, and an entry computed
+between them would be served as current under it.
+"""
+import secrets
+import time
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+
+
+class CacheVersion:
+    """
+    Version numbers stored in the configured cache; every bump yields a new one.
+    """
+
+    KEY_TEMPLATE = 'version:{namespace}'
+
+    @classmethod
+    def get(cls, namespace: str) -> int:
+        """
+        Return the current version of ``namespace``, initialising it if unset.
+
+        Args:
+            namespace: Name of the versioned data set (e.g. ``'maintenance'``)
+
+        Returns:
+            Current version number
+        """
+        key = cls.KEY_TEMPLATE.format(namespace=namespace)
+        version = cache.get(key)
+        if version is None:
+            initial = cls._initial_version()
+            cache.add(key, initial, None)
+            version = cache.get(key, initial)
+        return version
+
+    @classmethod
+    def get_many(cls, namespaces: Iterable[str]) -> Dict[str, int]:
+        """
+        Return the current versions of several namespaces with one cache read.
+
+        Args:
+            namespaces: Names of the versioned data sets
+
+        Returns:
+            Dict mapping each namespace to its version
+        """
+        keys = {cls.KEY_TEMPLATE.format(namespace=namespace): namespace for namespace in namespaces}
+        versions = cache.get_many(keys)
+        missing = {key: cls._initial_version() for key in keys if key not in versions}
+        if missing:
+            cache.set_many(missing, None)
+            versions.update(missing)
+        return {keys[key]: version for key, version in versions.items()}
+
+    @classmethod
+    def bump(cls, namespace: str) -> int:
+        """
+        Increment the version of ``namespace``, invalidating keys built on it.
+
+        Args:
+            namespace: Name of the versioned data set
+
+        Returns:
+            The new version number
+        """
+        version = cls._initial_version()
+        cache.set(cls.KEY_TEMPLATE.format(namespace=namespace), version, None)
+        return version
+
+    @staticmethod
+    def _initial_version() -> int:
+        """
+        A number no earlier version used: the clock in microseconds, so
+        versions grow and an evicted counter never comes back to a number
+        older keys embed, plus random low digits so that bumps in the same
+        microsecond from different processes still differ.
+        """
+        return time.time_ns() // 1000 * 1000 + secrets.randbelow(1000)
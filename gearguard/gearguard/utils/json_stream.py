@@ -0,0 +1,120 @@
+"""
+Incremental reader for large JSON fixtures.
+
+Seed fixtures are a single object whose values are arrays of records
+(``{"users": [...], "equipment": [...]}``). ``json.load`` would hold the
+whole document and every parsed record in memory at once; this reader walks
+the file in fixed-size chunks and decodes one array element at a time, so
+memory stays proportional to the largest single record.
+"""
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# What may still follow a number that was decoded from a partial buffer
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*\Z')
+
+
+class JSONStreamError(ValueError):
+    """Raised when a fixture is not a JSON object of arrays."""
+
+
+class JSONSectionStream:
+    """
+    Yield ``(section, record)`` pairs from a ``{"section": [records]}`` file.
+
+    Sections are produced in file order. A section whose value is not an
+    array is yielded once, as a single record.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, fp: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            section = self._decode()
+            if not isinstance(section, str):
+                raise JSONStreamError('Fixture section names must be strings')
+            self._expect(':')
+            if self._peek() == '[':
+                self._pos += 1
+                yield from ((section, record) for record in self._array())
+            else:
+                yield section, self._decode()
+            if self._next_delimiter('}'):
+                return
+
+    def _array(self) -> Iterator[Any]:
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._next_delimiter(']'):
+                return
+
+    def _next_delimiter(self, closing: str) -> bool:
+        """Consume a ``,`` or the closing bracket; True when the container ends."""
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ',':
+            raise JSONStreamError(f"Expected ',' or '{closing}', got {char!r}")
+        return False
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise JSONStreamError(f"Expected {char!r}, got {found!r}")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise JSONStreamError('Unexpected end of fixture')
+
+    def _decode(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number running up to the buffer edge may be cut short, either
+            # mid-digits or before its fraction or exponent ("-0" of "-0.5")
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and _NUMBER_TAIL.match(self._buffer, end) and self._fill()):
+                continue
+            self._pos = end
+            return value
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed input."""
+        if self._eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
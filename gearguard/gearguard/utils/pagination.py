@@ -0,0 +1,173 @@
+"""
+Keyset (cursor) pagination for large, append-heavy tables.
+
+Offset pagination gets slower the deeper a user pages because the database
+still has to walk every skipped row. Keyset pagination instead remembers the
+sort key of the last row on the page and asks for rows "after" it, which an
+index on the sort columns answers in constant time regardless of depth.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor string cannot be decoded for the paginator."""
+
+
+@dataclass
+class KeysetPage:
+    """A single page of results produced by :class:`KeysetPaginator`."""
+
+    object_list: List[Any]
+    has_next: bool = False
+    has_previous: bool = False
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    per_page: int = 0
+    ordering: Tuple[str, ...] = field(default_factory=tuple)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the sort key of the previous page.
+
+    The ordering must be unique and made of non-nullable columns, which is
+    why it normally ends with the primary key (e.g. ``('-request_date',
+    '-id')``). Every page costs exactly one query of ``per_page + 1`` rows.
+    """
+
+    DEFAULT_PER_PAGE = 25
+    MAX_PER_PAGE = 100
+
+    def __init__(self, queryset: QuerySet, ordering: Sequence[str], per_page: Optional[int] = None):
+        if not ordering:
+            raise ValueError("Keyset pagination requires at least one ordering field")
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = self.clamp_per_page(per_page)
+        self._fields = [
+            queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering
+        ]
+
+    @classmethod
+    def clamp_per_page(cls, per_page) -> int:
+        """Coerce a user supplied page size into ``1..MAX_PER_PAGE``."""
+        try:
+            per_page = int(per_page)
+        except (TypeError, ValueError):
+            return cls.DEFAULT_PER_PAGE
+        return max(1, min(per_page, cls.MAX_PER_PAGE))
+
+    def page(self, cursor: Optional[str] = None, direction: str = 'next') -> KeysetPage:
+        """
+        Return the page that follows (or precedes) ``cursor``.
+
+        Args:
+            cursor: Opaque cursor from a previous page, or None for the first page
+            direction: ``'next'`` to page forward, ``'prev'`` to page backward
+
+        Returns:
+            KeysetPage with the rows and cursors for the neighbouring pages
+
+        Raises:
+            InvalidCursor: If the cursor was tampered with or is malformed
+        """
+        backwards = direction == 'prev' and cursor is not None
+        ordering = self._reversed_ordering() if backwards else self.ordering
+
+        queryset = self.queryset.order_by(*ordering)
+        if cursor is not None:
+            values = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek_filter(ordering, values))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        return KeysetPage(
+            object_list=rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=self.encode_cursor(rows[-1]) if rows else None,
+            previous_cursor=self.encode_cursor(rows[0]) if rows else None,
+            per_page=self.per_page,
+            ordering=self.ordering,
+        )
+
+    def encode_cursor(self, obj) -> str:
+        """Serialise the sort key of ``obj`` into an opaque URL-safe cursor."""
+        if isinstance(obj, dict):
+            values = [_jsonable(obj[f.attname]) for f in self._fields]
+        else:
+            values = [f.value_to_string(obj) for f in self._fields]
+        payload = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> List[Any]:
+        """Turn a cursor back into typed sort key values."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, ValueError) as e:
+            raise InvalidCursor(f"Malformed cursor: {e}")
+
+        if not isinstance(values, list) or len(values) != len(self._fields):
+            raise InvalidCursor("Cursor does not match the paginator ordering")
+
+        try:
+            values = [f.to_python(v) for f, v in zip(self._fields, values)]
+        except (ValidationError, TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor value: {e}")
+        # The ordering columns are non-nullable, and None cannot be compared against
+        if any(v is None for v in values):
+            raise InvalidCursor("Cursor contains an empty value")
+        return values
+
+    def _reversed_ordering(self) -> Tuple[str, ...]:
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering)
+
+    def _seek_filter(self, ordering: Sequence[str], values: Sequence[Any]) -> Q:
+        """
+        Build the row-value comparison ``(a, b, c) > (x, y, z)`` as a Q tree.
+
+        Expanded as ``a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)``
+        with the comparison flipped for descending columns. The redundant
+        ``a >= x`` bound on the leading column lets every backend turn the
+        seek into an index range scan instead of evaluating the OR per row.
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for name, value in zip(ordering, values):
+            column = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal_prefix & Q(**{f'{column}__{lookup}': value})
+            equal_prefix &= Q(**{column: value})
+
+        leading = ordering[0]
+        bound = 'lte' if leading.startswith('-') else 'gte'
+        return Q(**{f'{leading.lstrip("-")}__{bound}': values[0]}) & condition
+
+
+def _jsonable(value):
+    """Render a raw column value the way ``Field.value_to_string`` would."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value if value is None or isinstance(value, (int, float, str)) else str(value)
@@ -10,7 +10,9 @@ from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
+from django.conf import settings
 from django.core.cache import cache
+from django.utils.crypto import salted_hmac
 
 
 User = get_user_model()
@@ -170,14 +172,20 @@ class PasswordValidationCache:
     Caching mechanism for password validation to improve performance.
     """
     
-    CACHE_TIMEOUT = 300  # 5 minutes
+    CACHE_TIMEOUT = settings.CACHE_TTLS['password_validation']
     
     @staticmethod
     def get_validation_cache_key(password: str, user_id: Optional[int] = None) -> str:
-        """Generate cache key for password validation."""
-        password_hash = hashlib.sha256(password.encode()).hexdigest()[:16]
-        user_part = f"_{user_id}" if user_id else ""
-        return f"pwd_validation_{password_hash}{user_part}"
+        """
+        Generate cache key for password validation.
+
+        The password is keyed with an HMAC of ``SECRET_KEY``: the cache may
+        live on disk or on a shared server, and a plain hash of a candidate
+        password there could be cracked offline.
+        """
+        password_hash = salted_hmac('gearguard.password_validation', password).hexdigest()
+        user_part = f":{user_id}" if user_id else ""
+        return f"password_validation:{password_hash}{user_part}"
     
     @classmethod
     def validate_password_cached(
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from .lookups import LOOKUPS, lookup as run_lookup
+from .middleware import request_stats
+
+
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def instrumentation_stats(request):
+    """Per-view request figures of this process; POST resets them."""
+    if not settings.INSTRUMENTATION_ENABLED:
+        raise Http404('Instrumentation is disabled')
+    if request.method == 'POST':
+        request_stats.reset()
+    return JsonResponse({'views': request_stats.snapshot()})
+
+
+@login_required
+def lookup(request, name):
+    """Type-ahead results for an autocomplete select: ``?q=`` text, ``?limit=`` rows."""
+    if name not in LOOKUPS:
+        raise Http404('Unknown lookup')
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        limit = 20
+    results = run_lookup(name, request.GET.get('q', '')[:100], limit)
+    return JsonResponse({'results': results})
@@ -0,0 +1,82 @@
+"""
+Select widgets for foreign keys that never iterate the whole table.
+
+A plain ``Select`` on a ``ModelChoiceField`` runs ``SELECT *`` over the
+related table and renders one ``<option>`` per row on every GET and every
+invalid POST. :class:`CachedSelect` renders a small table from
+:class:`~gearguard.lookups.CachedChoices`; :class:`AutocompleteSelect`
+renders only the selected row and fetches the rest from the lookup endpoint
+as the user types. Validation is untouched: the field still checks the
+submitted primary key with a single ``get()``.
+"""
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.html import format_html
+
+from .lookups import CachedChoices
+
+
+def _empty_choice(widget):
+    field = getattr(widget.choices, 'field', None)
+    empty_label = getattr(field, 'empty_label', None)
+    return [('', empty_label)] if empty_label is not None else []
+
+
+class CachedSelect(forms.Select):
+    """Select over a small table whose options come from the cache."""
+
+    def __init__(self, choice_set, attrs=None):
+        super().__init__(attrs)
+        self.choice_set = choice_set
+
+    def optgroups(self, name, value, attrs=None):
+        # ``choices`` is swapped for the cached list only while rendering
+        field_choices = self.choices
+        self.choices = _empty_choice(self) + CachedChoices.get(self.choice_set)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = field_choices
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Select whose options are loaded from ``lookup/<name>/`` as the user
+    types into the search box rendered above it.
+    """
+
+    def __init__(self, lookup, attrs=None):
+        super().__init__(attrs)
+        self.lookup = lookup
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-lookup-url'] = reverse('lookup', args=[self.lookup])
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        # Only the currently selected row is rendered
+        field_choices = self.choices
+        selected = []
+        field = getattr(field_choices, 'field', None)
+        pks = [pk for pk in value if pk]
+        if field is not None and pks:
+            try:
+                selected = [(obj.pk, field.label_from_instance(obj)) for obj in field.queryset.filter(pk__in=pks)]
+            except (ValueError, TypeError, ValidationError):
+                selected = []
+        self.choices = _empty_choice(self) + selected
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = field_choices
+
+    def render(self, name, value, attrs=None, renderer=None):
+        select = super().render(name, value, attrs, renderer)
+        search = format_html(
+            '<input type="search" data-autocomplete="{}" placeholder="Type to search..." autocomplete="off" '
+            'class="w-full bg-slate-900 border border-slate-700 text-white rounded-md p-2 mb-2 text-sm">',
+            (attrs or {}).get('id') or self.attrs.get('id') or f'id_{name}',
+        )
+        return search + select
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from .forms import PreventiveScheduleForm
+from .models import PreventiveSchedule
+
+
+@admin.register(PreventiveSchedule)
+class PreventiveScheduleAdmin(admin.ModelAdmin):
+    form = PreventiveScheduleForm
+    list_display = ('name', 'maintenance_for', 'frequency', 'interval', 'next_occurrence', 'is_active')
+    list_filter = ('is_active', 'frequency', 'maintenance_for')
+    search_fields = ('name',)
+    # Equipment and users are too many for a select
+    raw_id_fields = ('equipment', 'technician')
+    readonly_fields = ('occurrence_index', 'next_occurrence', 'created_at')
@@ -0,0 +1,199 @@
+"""
+Automatic team and technician assignment.
+
+A request without a team gets its equipment's maintenance team, or else the
+least loaded team of its work center (the request's own, or the
+equipment's). A request without a technician gets the category's
+responsible user when they belong to that team and still have capacity,
+otherwise the team member with the lowest utilisation that week.
+
+Everything the rules need besides the request itself comes from
+precomputed tables: :class:`AssignmentTables` (teams, members, work
+centers, category owners), cached until one of those tables changes, and
+the cached :class:`~maintenance.workload.WorkloadReport` of each week. Once
+both are warm, assigning a request costs no queries.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from equipment.models import EquipmentCategory
+from gearguard.utils.cache_versions import CacheVersion
+from teams.models import Team
+from .calendar import default_window
+from .models import MaintenanceRequest
+from .signals import ASSIGNMENT_NAMESPACE, requests_changed
+from .workload import Workload
+
+
+@dataclass
+class AssignmentTables:
+    """Lookup tables the assignment rules read instead of querying."""
+
+    # team id -> technician user ids
+    members: Dict[int, List[int]] = field(default_factory=dict)
+    # work center id -> team ids
+    work_center_teams: Dict[int, List[int]] = field(default_factory=dict)
+    # category id -> responsible user id
+    responsible: Dict[int, int] = field(default_factory=dict)
+
+    CACHE_TIMEOUT = settings.CACHE_TTLS['assignment']
+
+    @classmethod
+    def get(cls) -> 'AssignmentTables':
+        """Return the cached tables, building them on a miss."""
+        key = f'assignment:tables:{CacheVersion.get(ASSIGNMENT_NAMESPACE)}'
+        tables = cache.get(key)
+        if tables is None:
+            tables = cls.build()
+            cache.set(key, tables, cls.CACHE_TIMEOUT)
+        return tables
+
+    @classmethod
+    def build(cls) -> 'AssignmentTables':
+        """Build the tables with one query each."""
+        members = defaultdict(list)
+        for user_id, team_id in UserProfile.objects.filter(
+            role='technician', team__isnull=False
+        ).order_by('user_id').values_list('user_id', 'team_id'):
+            members[team_id].append(user_id)
+
+        work_center_teams = defaultdict(list)
+        for team_id, work_center_id in Team.objects.filter(
+            work_center__isnull=False
+        ).order_by('pk').values_list('pk', 'work_center_id'):
+            work_center_teams[work_center_id].append(team_id)
+
+        responsible = dict(
+            EquipmentCategory.objects.filter(responsible__isnull=False).values_list('pk', 'responsible_id')
+        )
+        return cls(dict(members), dict(work_center_teams), responsible)
+
+
+class AutoAssigner:
+    """
+    Fill in missing teams and technicians, balancing load as it goes.
+
+    Loads start from each week's workload report; every assignment adds the
+    request's hours to its technician and team, so a batch spreads work
+    instead of handing everything to whoever was least loaded at the start.
+    """
+
+    # The category owner is skipped once booked beyond this share of capacity
+    MAX_RESPONSIBLE_UTILISATION = 100.0
+
+    def __init__(self, tables: Optional[AssignmentTables] = None):
+        self.tables = tables or AssignmentTables.get()
+        # window start -> (capacity hours, technician hours, team hours)
+        self._weeks: Dict[datetime, tuple] = {}
+
+    def assign(self, request: MaintenanceRequest) -> bool:
+        """
+        Set ``team`` and ``technician`` on an unsaved or loaded request when
+        they are empty. Reads ``equipment`` if it is already loaded or
+        cached on the request; otherwise only its id-based tables.
+
+        Returns:
+            Whether anything was assigned
+        """
+        capacity, technician_hours, team_hours = self._week(request.scheduled_date)
+        equipment = request.equipment if request.equipment_id else None
+        changed = False
+
+        if request.team_id is None:
+            team_id = self._pick_team(request, equipment, team_hours)
+            if team_id is not None:
+                request.team_id = team_id
+                changed = True
+
+        if request.technician_id is None:
+            technician_id = self._pick_technician(request, equipment, capacity, technician_hours)
+            if technician_id is not None:
+                request.technician_id = technician_id
+                changed = True
+
+        if changed:
+            hours = (request.duration or Workload.DEFAULT_DURATION).total_seconds() / 3600
+            if request.technician_id is not None:
+                technician_hours[request.technician_id] += hours
+            if request.team_id is not None:
+                team_hours[request.team_id] += hours
+        return changed
+
+    def _pick_team(self, request, equipment, team_hours) -> Optional[int]:
+        if equipment is not None and equipment.maintenance_team_id is not None:
+            return equipment.maintenance_team_id
+        work_center_id = request.work_center_id or (equipment.work_center_id if equipment else None)
+        teams = self.tables.work_center_teams.get(work_center_id, [])
+
+        def hours_per_member(team_id):
+            return team_hours[team_id] / max(len(self.tables.members.get(team_id, [])), 1), team_id
+
+        return min(teams, key=hours_per_member, default=None)
+
+    def _pick_technician(self, request, equipment, capacity, technician_hours) -> Optional[int]:
+        if request.team_id is not None:
+            candidates = self.tables.members.get(request.team_id, [])
+        else:
+            candidates = list(technician_hours)
+        owner = self.tables.responsible.get(equipment.category_id) if equipment is not None else None
+        if owner is not None and (request.team_id is None or owner in candidates):
+            utilisation = 100 * technician_hours[owner] / capacity if capacity else 0.0
+            if utilisation < self.MAX_RESPONSIBLE_UTILISATION:
+                return owner
+        return min(candidates, key=lambda pk: (technician_hours[pk], pk), default=None)
+
+    def _week(self, when: Optional[datetime]):
+        start, end = default_window(timezone.localdate(when) if when else None)
+        if start not in self._weeks:
+            report = Workload.get(start, end)
+            technician_hours = defaultdict(float, {
+                load.technician_id: load.booked_hours for load in report.technicians
+            })
+            team_hours = defaultdict(float, {load.team_id: load.booked_hours for load in report.teams})
+            self._weeks[start] = (Workload.capacity_hours(start, end), technician_hours, team_hours)
+        return self._weeks[start]
+
+    @classmethod
+    def rebalance(cls, batch_size: int = 1000, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Assign every ``new`` request that has no technician, in schedule
+        order, and write the changes with ``bulk_update`` in batches.
+
+        Returns:
+            Dict with the number of requests ``scanned`` and ``assigned``
+        """
+        assigner = cls()
+        queryset = MaintenanceRequest.objects.filter(stage='new', technician__isnull=True).select_related(
+            'equipment'
+        ).only(
+            'id', 'team_id', 'technician_id', 'work_center_id', 'scheduled_date', 'duration',
+            'equipment__maintenance_team_id', 'equipment__work_center_id', 'equipment__category_id',
+        ).order_by('scheduled_date', 'id')
+
+        scanned, assigned, pending = 0, [], []
+        with transaction.atomic():
+            for request in queryset.iterator(chunk_size=batch_size):
+                scanned += 1
+                if assigner.assign(request):
+                    pending.append(request)
+                if len(pending) >= batch_size:
+                    assigned.extend(cls._flush(pending, dry_run))
+                    pending = []
+            assigned.extend(cls._flush(pending, dry_run))
+        if assigned and not dry_run:
+            requests_changed.send(sender=MaintenanceRequest, pks=assigned)
+        return {'scanned': scanned, 'assigned': len(assigned)}
+
+    @staticmethod
+    def _flush(requests: List[MaintenanceRequest], dry_run: bool) -> List[int]:
+        if requests and not dry_run:
+            MaintenanceRequest.objects.bulk_update(requests, ['team', 'technician'])
+        return [request.pk for request in requests]
@@ -0,0 +1,413 @@
+"""
+View benchmarks driven through the Django test client.
+
+Each scenario requests one URL repeatedly and records wall time, the number
+and total time of SQL queries, the response size and the peak Python memory
+allocated while serving it. Reports are plain JSON so two runs (say, before
+and after a change) can be diffed with :func:`compare_reports`.
+
+:class:`WriteBenchmark` measures concurrent write throughput instead: several
+processes POST requests against one SQLite file, as gunicorn workers do.
+"""
+import logging
+import multiprocessing
+import platform
+import sqlite3
+import statistics
+import time
+import tracemalloc
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from equipment.models import Equipment
+from gearguard.utils.database import sqlite_tuning
+from teams.models import Team, WorkCenter
+from .models import MaintenanceRequest
+
+
+@dataclass
+class Scenario:
+    """One request to benchmark; ``path``/``data`` are built from the fixtures."""
+
+    name: str
+    path: Callable[[Dict[str, Any]], str]
+    method: str = 'get'
+    data: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    expected_status: int = 200
+
+
+def _equipment_form(fixtures):
+    equipment = fixtures['equipment']
+    return {
+        'name': f'{equipment.name} (benchmark)',
+        'company': equipment.company or '',
+        'category': equipment.category_id or '',
+        'serial_number': 'BENCH-0001',
+        'description': equipment.description,
+        'employee': equipment.employee_id or '',
+        'maintenance_team': equipment.maintenance_team_id or '',
+        'work_center': equipment.work_center_id or '',
+        'assigned_date': equipment.assigned_date.isoformat() if equipment.assigned_date else '',
+        'status': equipment.status,
+    }
+
+
+def _team_form(fixtures):
+    team = fixtures['team']
+    return {
+        'name': f'{team.name} (benchmark)',
+        'company': team.company or '',
+        'description': team.description,
+        'work_center': team.work_center_id or '',
+    }
+
+
+def _request_form(fixtures):
+    request = fixtures['request']
+    scheduled = timezone.localtime() + timedelta(days=7)
+    return {
+        'subject': f'{request.subject} (benchmark)',
+        'maintenance_for': 'equipment',
+        'equipment': fixtures['equipment'].pk,
+        'work_center': '',
+        'technician': request.technician_id or '',
+        'team': request.team_id or '',
+        'scheduled_date': scheduled.strftime('%Y-%m-%dT%H:%M'),
+        'duration_input': '02:30:00',
+        'maintenance_type': 'corrective',
+        'priority': 2,
+        'notes': '',
+        'instructions': '',
+    }
+
+
+# Benchmarks run on a private cache, so clearing it before cold runs (and the
+# version bumps of benchmark writes) never touches the deployment's cache
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gearguard-benchmark',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+SCENARIOS = [
+    Scenario('dashboard', lambda f: reverse('home')),
+    Scenario('equipment_list', lambda f: reverse('equipment:equipment_list')),
+    Scenario('equipment_detail', lambda f: reverse('equipment:equipment_detail', args=[f['equipment'].pk])),
+    Scenario('equipment_create_form', lambda f: reverse('equipment:equipment_create')),
+    Scenario('equipment_create_post', lambda f: reverse('equipment:equipment_create'),
+             'post', _equipment_form, 302),
+    Scenario('equipment_edit_form', lambda f: reverse('equipment:equipment_edit', args=[f['equipment'].pk])),
+    Scenario('equipment_edit_post', lambda f: reverse('equipment:equipment_edit', args=[f['equipment'].pk]),
+             'post', _equipment_form, 302),
+    Scenario('maintenance_list', lambda f: reverse('maintenance_list')),
+    Scenario('maintenance_list_filtered', lambda f: reverse('maintenance_list') + f'?stage=new&team={f["team"].pk}'),
+    Scenario('maintenance_create_form', lambda f: reverse('maintenance_create')),
+    Scenario('maintenance_create_post', lambda f: reverse('maintenance_create'), 'post', _request_form, 302),
+    Scenario('maintenance_edit_form', lambda f: reverse('maintenance_edit', args=[f['request'].pk])),
+    Scenario('maintenance_edit_post', lambda f: reverse('maintenance_edit', args=[f['request'].pk]),
+             'post', _request_form, 302),
+    Scenario('maintenance_kanban', lambda f: reverse('maintenance_kanban')),
+    Scenario('maintenance_kanban_column', lambda f: reverse('maintenance_kanban_column', args=['repaired'])),
+    Scenario('maintenance_calendar', lambda f: reverse('maintenance_calendar')),
+    Scenario('maintenance_calendar_feed', lambda f: reverse('maintenance_calendar_feed')),
+    Scenario('maintenance_workload', lambda f: reverse('maintenance_workload')),
+    Scenario('team_list', lambda f: reverse('teams:team_list')),
+    Scenario('team_detail', lambda f: reverse('teams:team_detail', args=[f['team'].pk])),
+    Scenario('team_create_form', lambda f: reverse('teams:team_create')),
+    Scenario('team_create_post', lambda f: reverse('teams:team_create'), 'post', _team_form, 302),
+    Scenario('team_edit_form', lambda f: reverse('teams:team_edit', args=[f['team'].pk])),
+    Scenario('team_edit_post', lambda f: reverse('teams:team_edit', args=[f['team'].pk]), 'post', _team_form, 302),
+    Scenario('workcenter_list', lambda f: reverse('teams:workcenter_list')),
+    Scenario('workcenter_detail', lambda f: reverse('teams:workcenter_detail', args=[f['work_center'].pk])),
+    Scenario('search', lambda f: reverse('search:search') + '?q=pump'),
+    Scenario('profile', lambda f: reverse('accounts:profile')),
+]
+
+
+def _median_object(queryset):
+    """A row from the middle of the table, so results are not edge cases."""
+    count = queryset.count()
+    return queryset.order_by('pk')[count // 2] if count else None
+
+
+def benchmark_fixtures() -> Dict[str, Any]:
+    """
+    Pick the user and the objects the scenarios request.
+
+    Raises:
+        LookupError: If the database has no data to benchmark against
+    """
+    fixtures = {
+        'user': User.objects.filter(is_superuser=True).order_by('pk').first(),
+        'equipment': _median_object(Equipment.objects.all()),
+        'team': _median_object(Team.objects.all()),
+        'work_center': _median_object(WorkCenter.objects.all()),
+        'request': _median_object(MaintenanceRequest.objects.all()),
+    }
+    missing = [name for name, value in fixtures.items() if value is None]
+    if missing:
+        raise LookupError(f'No {", ".join(missing)} to benchmark against')
+    return fixtures
+
+
+@dataclass
+class ViewBenchmark:
+    """Run scenarios through the test client and collect their figures."""
+
+    repeat: int = 5
+    scenarios: List[Scenario] = field(default_factory=lambda: list(SCENARIOS))
+
+    def run(self, fixtures: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Benchmark every scenario.
+
+        The first request of each scenario runs on an empty cache and is
+        reported as ``cold_ms``; timings come from the ``repeat`` warm runs
+        that follow. POSTs run inside a rolled-back transaction so every
+        repeat and every later scenario sees the same data. The cache is a
+        private one (:data:`BENCHMARK_CACHES`), not the configured cache.
+
+        Returns:
+            Figures per scenario name
+        """
+        # Failing views are reported with their 500 status instead of aborting the run
+        client = Client(raise_request_exception=False)
+        client.force_login(fixtures['user'])
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['testserver'], CACHES=BENCHMARK_CACHES):
+            for scenario in self.scenarios:
+                results[scenario.name] = self._run_scenario(client, scenario, fixtures)
+        return results
+
+    def _run_scenario(self, client, scenario, fixtures):
+        path = scenario.path(fixtures)
+        data = scenario.data(fixtures) if scenario.data else None
+
+        cache.clear()
+        cold = self._request(client, scenario.method, path, data)
+        warm = [self._request(client, scenario.method, path, data) for _ in range(self.repeat)]
+
+        tracemalloc.start()
+        try:
+            self._request(client, scenario.method, path, data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = [run['seconds'] * 1000 for run in warm]
+        last = warm[-1] if warm else cold
+        return {
+            'method': scenario.method.upper(),
+            'path': path,
+            'status': last['status'],
+            'ok': last['status'] == scenario.expected_status,
+            'cold_ms': round(cold['seconds'] * 1000, 2),
+            'wall_ms': {
+                'min': round(min(timings), 2) if timings else None,
+                'median': round(statistics.median(timings), 2) if timings else None,
+                'max': round(max(timings), 2) if timings else None,
+            },
+            'queries': last['queries'],
+            'cold_queries': cold['queries'],
+            'query_ms': round(last['query_seconds'] * 1000, 2),
+            'peak_kib': round(peak / 1024, 1),
+            'response_bytes': last['bytes'],
+        }
+
+    @staticmethod
+    def _request(client, method, path, data):
+        with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(path, data) if data is not None else getattr(client, method)(path)
+            content = b''.join(response) if response.streaming else response.content
+            seconds = time.perf_counter() - started
+            if method != 'get':
+                transaction.set_rollback(True)
+        return {
+            'status': response.status_code,
+            'seconds': seconds,
+            'queries': len(queries.captured_queries),
+            'query_seconds': sum(float(query['time']) for query in queries.captured_queries),
+            'bytes': len(content),
+        }
+
+
+def report_metadata(**extra) -> Dict[str, Any]:
+    """Environment details stored alongside the results."""
+    return {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        **extra,
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Compare two reports scenario by scenario.
+
+    A scenario regresses when its median wall time grows by more than
+    ``threshold`` (a fraction) or when it issues more queries than before.
+
+    Returns:
+        One row per scenario present in both reports
+    """
+    rows = []
+    for name, now in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            continue
+        old_ms, new_ms = before['wall_ms']['median'], now['wall_ms']['median']
+        change = (new_ms - old_ms) / old_ms if old_ms else 0.0
+        rows.append({
+            'name': name,
+            'baseline_ms': old_ms,
+            'current_ms': new_ms,
+            'change': change,
+            'baseline_queries': before['queries'],
+            'current_queries': now['queries'],
+            'regressed': change > threshold or now['queries'] > before['queries'],
+        })
+    return rows
+
+
+# SQLite connection OPTIONS compared by WriteBenchmark: the library defaults
+# (rollback journal, deferred transactions) and the opt-in tuning profile
+SQLITE_PROFILES = {
+    'default': {},
+    'tuned': sqlite_tuning(),
+}
+
+
+def copy_sqlite_database(source: str, target: str, journal_mode: str = 'DELETE') -> None:
+    """Copy a (possibly live) SQLite database with the backup API, then set its journal mode."""
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst)
+        dst.execute(f'PRAGMA journal_mode={journal_mode}')
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(len(values) * fraction))], 2)
+
+
+@dataclass
+class WriteBenchmark:
+    """
+    POST ``maintenance_create`` and ``maintenance_edit`` from ``workers``
+    forked processes at once for ``seconds``.
+
+    Each worker has its own connection, session and private cache, like a
+    gunicorn worker. "database is locked" failures are counted rather than raised.
+    """
+
+    workers: int = 4
+    seconds: float = 10.0
+
+    def run(self, database: str, options: Dict[str, Any], fixtures: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the workers against ``database``, which is written to (use a copy).
+
+        Args:
+            database: Path of the SQLite file
+            options: Connection ``OPTIONS`` (see :data:`SQLITE_PROFILES`)
+            fixtures: Objects from :func:`benchmark_fixtures`
+
+        Returns:
+            Successful writes, failures, throughput and latency figures
+        """
+        original = dict(connection.settings_dict)
+        connections.close_all()
+        connection.settings_dict.update(NAME=database, OPTIONS=options)
+        try:
+            # Sessions are created up front so logins do not race the benchmark
+            sessions = []
+            for _ in range(self.workers):
+                client = Client()
+                client.force_login(fixtures['user'])
+                sessions.append(client.cookies)
+            # Forked workers must not inherit an open connection
+            connections.close_all()
+
+            context = multiprocessing.get_context('fork')
+            results = context.Queue()
+            start = context.Event()
+            processes = [
+                context.Process(target=self._worker, args=(cookies, fixtures, start, results))
+                for cookies in sessions
+            ]
+            for process in processes:
+                process.start()
+            start.set()
+            figures = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+        finally:
+            connections.close_all()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+
+        latencies = sorted(ms for worker in figures for ms in worker['latencies'])
+        return {
+            'workers': self.workers,
+            'seconds': self.seconds,
+            'writes': len(latencies),
+            'failures': sum(worker['failures'] for worker in figures),
+            'locked': sum(worker['locked'] for worker in figures),
+            'writes_per_second': round(len(latencies) / self.seconds, 1),
+            'latency_ms': {
+                'median': _percentile(latencies, 0.5),
+                'p95': _percentile(latencies, 0.95),
+                'max': _percentile(latencies, 1.0),
+            },
+        }
+
+    def _worker(self, cookies, fixtures, start, results):
+        # Lock errors surface as 500s; their tracebacks would flood the console
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        latencies, failures, locked = [], 0, 0
+        data = _request_form(fixtures)
+        posts = [
+            reverse('maintenance_create'),
+            reverse('maintenance_edit', args=[fixtures['request'].pk]),
+        ]
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver'], CACHES=BENCHMARK_CACHES):
+                client = Client()
+                client.cookies = cookies
+                start.wait()
+                deadline = time.perf_counter() + self.seconds
+                count = 0
+                while time.perf_counter() < deadline:
+                    path = posts[count % len(posts)]
+                    count += 1
+                    started = time.perf_counter()
+                    try:
+                        response = client.post(path, data)
+                    except OperationalError as e:
+                        failures += 1
+                        locked += 'locked' in str(e)
+                        continue
+                    if response.status_code == 302:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    else:
+                        failures += 1
+        finally:
+            connections.close_all()
+            results.put({'latencies': latencies, 'failures': failures, 'locked': locked})
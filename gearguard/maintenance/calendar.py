@@ -0,0 +1,153 @@
+"""
+Maintenance calendar queries.
+
+A request occupies ``[scheduled_date, scheduled_date + duration)``. Finding
+the requests that overlap a window is answered by a range scan on the
+``scheduled_date`` index: a request can only overlap if it starts before the
+window ends and no earlier than ``MaintenanceRequest.MAX_DURATION`` before
+the window starts. The exact end-of-interval test is applied to that bounded
+slice only.
+"""
+import hashlib
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import DateTimeField, ExpressionWrapper, F, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from gearguard.utils.cache_versions import CacheVersion
+from .models import MaintenanceRequest
+from .signals import VERSION_NAMESPACE
+
+# Largest window one feed request may ask for
+MAX_WINDOW = timedelta(days=62)
+
+# Only the columns the calendar renders are selected
+EVENT_FIELDS = (
+    'id', 'subject', 'scheduled_date', 'duration', 'stage', 'priority',
+    'maintenance_type', 'equipment__name', 'work_center__name', 'technician__username',
+)
+
+
+def parse_bound(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO date or datetime query parameter into an aware datetime.
+
+    Args:
+        value: ``YYYY-MM-DD`` or an ISO 8601 datetime string
+
+    Returns:
+        Aware datetime, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            parsed = datetime.combine(day, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def default_window(day: Optional[date] = None) -> Tuple[datetime, datetime]:
+    """Return the Monday-to-Monday week of ``day`` (default: today) in the active time zone."""
+    day = day or timezone.localdate()
+    monday = day - timedelta(days=day.weekday())
+    start = timezone.make_aware(datetime.combine(monday, time.min))
+    return start, start + timedelta(days=7)
+
+
+def feed_params(query) -> Tuple[datetime, datetime, Optional[int], Optional[int]]:
+    """
+    Read the window and filters of a feed request from its query string.
+
+    Falls back to the current week for a missing or inverted window and caps
+    the window at ``MAX_WINDOW`` so one request cannot scan years of rows.
+    """
+    start = parse_bound(query.get('start'))
+    end = parse_bound(query.get('end'))
+    if start is None or end is None or end <= start:
+        start, end = default_window() if start is None else (start, start + timedelta(days=7))
+    end = min(end, start + MAX_WINDOW)
+    return start, end, _int_or_none(query.get('team')), _int_or_none(query.get('technician'))
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def overlapping_requests(start: datetime, end: datetime, team_id=None, technician_id=None):
+    """
+    Build the queryset of requests whose scheduled interval overlaps a window.
+
+    Args:
+        start: Inclusive window start
+        end: Exclusive window end
+        team_id: Optional team filter
+        technician_id: Optional technician filter
+
+    Returns:
+        QuerySet of dicts restricted to ``EVENT_FIELDS``
+    """
+    queryset = MaintenanceRequest.objects.filter(
+        scheduled_date__lt=end,
+        scheduled_date__gte=start - MaintenanceRequest.MAX_DURATION,
+    )
+    if team_id:
+        queryset = queryset.filter(team_id=team_id)
+    if technician_id:
+        queryset = queryset.filter(technician_id=technician_id)
+
+    queryset = queryset.annotate(
+        scheduled_end=ExpressionWrapper(F('scheduled_date') + F('duration'), output_field=DateTimeField())
+    ).filter(
+        Q(scheduled_end__gt=start) | Q(duration__isnull=True, scheduled_date__gte=start)
+    )
+    return queryset.order_by('scheduled_date', 'id').values(*EVENT_FIELDS)
+
+
+def calendar_events(start: datetime, end: datetime, team_id=None, technician_id=None) -> List[Dict[str, Any]]:
+    """
+    Return the calendar events overlapping ``[start, end)`` as plain dicts.
+    """
+    stages = dict(MaintenanceRequest.STAGE_CHOICES)
+    events = []
+    for row in overlapping_requests(start, end, team_id, technician_id):
+        duration = row['duration']
+        events.append({
+            'id': row['id'],
+            'title': row['subject'],
+            'start': row['scheduled_date'],
+            'end': row['scheduled_date'] + duration if duration else row['scheduled_date'],
+            'stage': row['stage'],
+            'stage_label': stages.get(row['stage'], row['stage']),
+            'priority': row['priority'],
+            'maintenance_type': row['maintenance_type'],
+            'target': row['equipment__name'] or row['work_center__name'],
+            'technician': row['technician__username'],
+            'url': reverse('maintenance_edit', args=[row['id']]),
+        })
+    return events
+
+
+def feed_etag(start: datetime, end: datetime, team_id=None, technician_id=None) -> str:
+    """
+    ETag of a feed response: the window, its filters and the data version.
+
+    Any save, delete or bulk change of a request bumps the version, so an
+    unchanged ETag means the window's events cannot have changed.
+    """
+    version = CacheVersion.get(VERSION_NAMESPACE)
+    raw = f'{version}|{start.isoformat()}|{end.isoformat()}|{team_id or ""}|{technician_id or ""}'
+    return hashlib.sha1(raw.encode()).hexdigest()
@@ -0,0 +1,117 @@
+"""
+Streaming export of the maintenance request history.
+
+Rows are read with a ``values_list`` projection over the request and its
+equipment, work center, team and people, through ``.iterator()`` so the
+database driver hands them over ``chunk_size`` at a time (a server-side
+cursor on PostgreSQL). They are formatted and yielded as text chunks; no
+model instance and no complete file is ever held in memory, so the same
+generators back both the download views and the export command.
+"""
+import csv
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Sequence, Tuple
+
+from .models import MaintenanceRequest
+
+# (column name, lookup) in output order
+EXPORT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('id', 'id'),
+    ('subject', 'subject'),
+    ('maintenance_for', 'maintenance_for'),
+    ('maintenance_type', 'maintenance_type'),
+    ('stage', 'stage'),
+    ('priority', 'priority'),
+    ('request_date', 'request_date'),
+    ('scheduled_date', 'scheduled_date'),
+    ('duration_hours', 'duration'),
+    ('equipment_id', 'equipment_id'),
+    ('equipment', 'equipment__name'),
+    ('serial_number', 'equipment__serial_number'),
+    ('company', 'equipment__company'),
+    ('work_center', 'work_center__name'),
+    ('work_center_code', 'work_center__code'),
+    ('team', 'team__name'),
+    ('technician', 'technician__username'),
+    ('created_by', 'created_by__username'),
+    ('notes', 'notes'),
+)
+# Oldest first, so re-running an export with a later end date appends rows
+EXPORT_ORDERING = ('request_date', 'id')
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+}
+
+CHUNK_SIZE = 2000
+# Rows per yielded text chunk; one chunk per row would mean one write per row
+ROWS_PER_CHUNK = 500
+
+
+def export_rows(queryset=None, chunk_size: int = CHUNK_SIZE) -> Iterator[Sequence]:
+    """
+    Yield one tuple per request, in :data:`EXPORT_COLUMNS` order.
+
+    Args:
+        queryset: Filtered requests (default: all of them)
+        chunk_size: Rows fetched from the database at a time
+    """
+    if queryset is None:
+        queryset = MaintenanceRequest.objects.all()
+    rows = queryset.order_by(*EXPORT_ORDERING).values_list(*(lookup for _, lookup in EXPORT_COLUMNS))
+    return rows.iterator(chunk_size=chunk_size)
+
+
+def _value(value):
+    if isinstance(value, timedelta):
+        return round(value.total_seconds() / 3600, 2)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """File-like object whose ``write`` hands back the line it was given."""
+
+    def write(self, value):
+        return value
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_chunks(rows: Iterable[Sequence]) -> Iterator[str]:
+    """Render rows as CSV text, header first."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    yield from _chunked(writer.writerow([_value(value) for value in row]) for row in rows)
+
+
+def json_chunks(rows: Iterable[Sequence]) -> Iterator[str]:
+    """Render rows as a JSON array of objects, one object per line."""
+    names = [name for name, _ in EXPORT_COLUMNS]
+
+    def lines():
+        separator = '\n'
+        for row in rows:
+            yield separator + json.dumps(dict(zip(names, map(_value, row))))
+            separator = ',\n'
+
+    yield '['
+    yield from _chunked(lines())
+    yield '\n]\n'
+
+
+RENDERERS = {
+    'csv': csv_chunks,
+    'json': json_chunks,
+}
@@ -1,7 +1,11 @@
 from django.db import models
 from django import forms
-from .models import MaintenanceRequest
-from datetime import datetime, timedelta
+from django.contrib.auth.models import User
+from django.utils import timezone
+from gearguard.widgets import AutocompleteSelect, CachedSelect
+from teams.models import Team
+from .models import MaintenanceRequest, PreventiveSchedule
+from datetime import timedelta
 import re
 
 class MaintenanceRequestForm(forms.ModelForm):
@@ -24,10 +28,10 @@ class MaintenanceRequestForm(forms.ModelForm):
         widgets = {
             'subject': forms.TextInput(attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
             'maintenance_for': forms.Select(attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
-            'equipment': forms.Select(attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
-            'work_center': forms.Select(attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
-            'technician': forms.Select(attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
-            'team': forms.Select(attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
+            'equipment': AutocompleteSelect('equipment', attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
+            'work_center': CachedSelect('work_centers', attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
+            'technician': AutocompleteSelect('users', attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
+            'team': CachedSelect('teams', attrs={'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'}),
             'scheduled_date': forms.DateTimeInput(attrs={
                 'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2',
                 'type': 'datetime-local'
@@ -40,7 +44,7 @@ class MaintenanceRequestForm(forms.ModelForm):
     
     def clean_scheduled_date(self):
         scheduled_date = self.cleaned_data.get('scheduled_date')
-        if scheduled_date and scheduled_date < datetime.now():
+        if scheduled_date and scheduled_date < timezone.now():
             raise forms.ValidationError('Scheduled date must be in the future.')
         return scheduled_date
     
@@ -106,3 +110,102 @@ class MaintenanceRequestForm(forms.ModelForm):
         if commit:
             instance.save()
         return instance
+
+
+class PreventiveScheduleForm(forms.ModelForm):
+    """Create or edit a preventive schedule; the target must match ``maintenance_for``."""
+
+    class Meta:
+        model = PreventiveSchedule
+        fields = [
+            'name', 'maintenance_for', 'equipment', 'work_center', 'team', 'technician',
+            'frequency', 'interval', 'start_date', 'duration', 'priority', 'instructions', 'is_active',
+        ]
+        help_texts = {
+            'interval': 'Number of frequency units between occurrences (e.g. 2 with weekly = every other week).',
+            'start_date': 'First occurrence. Changing it, the frequency or the interval restarts generation from here.',
+        }
+
+    def clean_interval(self):
+        interval = self.cleaned_data.get('interval')
+        if interval is not None and interval < 1:
+            raise forms.ValidationError('Interval must be at least 1.')
+        return interval
+
+    def clean(self):
+        cleaned_data = super().clean()
+        target = cleaned_data.get('maintenance_for')
+        if target == 'equipment' and not cleaned_data.get('equipment'):
+            self.add_error('equipment', 'Select the equipment this schedule maintains.')
+        elif target == 'work_center' and not cleaned_data.get('work_center'):
+            self.add_error('work_center', 'Select the work center this schedule maintains.')
+        return cleaned_data
+
+
+class MaintenanceFilterForm(forms.Form):
+    """Server-side filters for the maintenance request list."""
+    stage = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All stages')] + MaintenanceRequest.STAGE_CHOICES,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    priority = forms.TypedChoiceField(
+        required=False,
+        coerce=int,
+        empty_value=None,
+        choices=[('', 'All priorities')] + MaintenanceRequest.PRIORITY_CHOICES,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    maintenance_type = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All types')] + MaintenanceRequest.TYPE_CHOICES,
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    team = forms.ModelChoiceField(
+        required=False,
+        queryset=Team.objects.only('id', 'name').order_by('name'),
+        empty_label='All teams',
+        widget=CachedSelect('teams', attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+    technician = forms.ModelChoiceField(
+        required=False,
+        queryset=User.objects.filter(userprofile__role='technician').only('id', 'username').order_by('username'),
+        empty_label='All technicians',
+        widget=forms.Select(attrs={'class': 'bg-slate-900 border-slate-800 text-white rounded p-2 text-sm'})
+    )
+
+    def filter(self, queryset):
+        """Apply every valid filter to ``queryset``; invalid ones are ignored."""
+        self.is_valid()
+        cleaned_data = getattr(self, 'cleaned_data', {})
+        for name in ('stage', 'priority', 'maintenance_type', 'team', 'technician'):
+            value = cleaned_data.get(name)
+            if value not in (None, ''):
+                queryset = queryset.filter(**{name: value})
+        return queryset
+
+
+class MaintenanceExportForm(MaintenanceFilterForm):
+    """List filters plus the request-date range and equipment company of an export."""
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    company = forms.CharField(required=False, max_length=200)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('start'), cleaned_data.get('end')
+        if start and end and start > end:
+            raise forms.ValidationError('The start date must not be after the end date.')
+        return cleaned_data
+
+    def filter(self, queryset):
+        """Apply the list filters, then the date range (inclusive) and company."""
+        queryset = super().filter(queryset)
+        cleaned_data = getattr(self, 'cleaned_data', {})
+        if cleaned_data.get('start'):
+            queryset = queryset.filter(request_date__gte=cleaned_data['start'])
+        if cleaned_data.get('end'):
+            queryset = queryset.filter(request_date__lte=cleaned_data['end'])
+        if cleaned_data.get('company'):
+            queryset = queryset.filter(equipment__company=cleaned_data['company'])
+        return queryset
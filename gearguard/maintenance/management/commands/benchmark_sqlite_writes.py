@@ -0,0 +1,79 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from maintenance.benchmark import (
+    SQLITE_PROFILES, WriteBenchmark, benchmark_fixtures, copy_sqlite_database, report_metadata,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent request writes from several worker processes on a copy of the '
+        'SQLite database, with and without the GEARGUARD_SQLITE_TUNING profile'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent writer processes')
+        parser.add_argument('--seconds', type=float, default=10.0, help='Duration of each run')
+        parser.add_argument(
+            '--profile', action='append', choices=sorted(SQLITE_PROFILES),
+            help='Profile to run (repeatable; default: all)',
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this path')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(f'The default database is {connection.vendor}, not SQLite')
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+        source = str(connection.settings_dict['NAME'])
+        try:
+            fixtures = benchmark_fixtures()
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        benchmark = WriteBenchmark(workers=options['workers'], seconds=options['seconds'])
+        results = {}
+        with tempfile.TemporaryDirectory(prefix='gearguard-writes-') as workdir:
+            for name in options['profile'] or sorted(SQLITE_PROFILES):
+                database = str(Path(workdir) / f'{name}.sqlite3')
+                # The tuned profile switches its copy to WAL when it connects
+                copy_sqlite_database(source, database)
+                self.stdout.write(f'Running {name} ({benchmark.workers} workers, {benchmark.seconds:g}s)...')
+                results[name] = benchmark.run(database, SQLITE_PROFILES[name], fixtures)
+
+        self._print_results(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'metadata': report_metadata(), 'results': results}, f, indent=2)
+            self.stdout.write(f'Wrote {options["output"]}')
+
+    def _print_results(self, results):
+        self.stdout.write('')
+        self.stdout.write(
+            f'{"profile":<10} {"writes":>8} {"writes/s":>9} {"median ms":>10} {"p95 ms":>8} {"failures":>9} {"locked":>7}'
+        )
+        for name, result in results.items():
+            latency = result['latency_ms']
+            self.stdout.write(
+                f'{name:<10} {result["writes"]:>8} {result["writes_per_second"]:>9} '
+                f'{latency["median"] or "-":>10} {latency["p95"] or "-":>8} '
+                f'{result["failures"]:>9} {result["locked"]:>7}'
+            )
+
+        baseline, tuned = results.get('default'), results.get('tuned')
+        if not (baseline and tuned):
+            return
+        if baseline['writes']:
+            speedup = f'{tuned["writes"] / baseline["writes"]:.1f}x the writes of default'
+        else:
+            speedup = f'{tuned["writes"]} writes, default completed none'
+        summary = f'tuned: {speedup}; {tuned["failures"]} failed writes (default: {baseline["failures"]})'
+        if tuned['writes'] > baseline['writes']:
+            self.stdout.write(self.style.SUCCESS(f'  [OK] {summary}'))
+        else:
+            self.stdout.write(self.style.WARNING(f'  [WARN] {summary}'))
@@ -0,0 +1,124 @@
+import json
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from maintenance.benchmark import SCENARIOS, ViewBenchmark, benchmark_fixtures, compare_reports, report_metadata
+from maintenance.synthetic import SyntheticDataGenerator, SyntheticScale
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every view against a generated dataset and write a JSON report'
+
+    def add_arguments(self, parser):
+        defaults = SyntheticScale(equipment=2000, users=100, teams=10, work_centers=8)
+        parser.add_argument('--equipment', type=int, default=defaults.equipment)
+        parser.add_argument('--users', type=int, default=defaults.users)
+        parser.add_argument('--teams', type=int, default=defaults.teams)
+        parser.add_argument('--work-centers', type=int, default=defaults.work_centers)
+        parser.add_argument('--years', type=float, default=defaults.years)
+        parser.add_argument('--requests-per-equipment-year', type=float, default=defaults.requests_per_equipment_year)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--repeat', type=int, default=5, help='Warm runs per view (default: 5)')
+        parser.add_argument('--only', help='Comma-separated scenario names to run')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Baseline JSON report to compare against')
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help='Median slowdown, in percent, that counts as a regression (default: 20)')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error if any view regressed')
+        parser.add_argument('--use-existing-db', action='store_true',
+                            help='Benchmark the configured database as-is instead of a generated test database')
+
+    def handle(self, *args, **options):
+        scenarios = list(SCENARIOS)
+        if options['only']:
+            wanted = {name.strip() for name in options['only'].split(',')}
+            unknown = wanted - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f'Unknown scenario(s): {", ".join(sorted(unknown))}')
+            scenarios = [scenario for scenario in scenarios if scenario.name in wanted]
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be positive')
+
+        scale = SyntheticScale(
+            work_centers=options['work_centers'],
+            teams=options['teams'],
+            users=options['users'],
+            equipment=options['equipment'],
+            years=options['years'],
+            requests_per_equipment_year=options['requests_per_equipment_year'],
+        )
+
+        if options['use_existing_db']:
+            results = self._run(scenarios, options)
+            dataset = 'existing'
+        else:
+            # A throwaway test database keeps the benchmark off real data
+            old_name = connection.settings_dict['NAME']
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.stdout.write(f'Generating {scale.equipment} equipment with seed {options["seed"]}...')
+                SyntheticDataGenerator(scale, seed=options['seed']).generate()
+                results = self._run(scenarios, options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            dataset = vars(scale)
+
+        report = {
+            'meta': report_metadata(commit=self._git_commit(), dataset=dataset, seed=options['seed'],
+                                    repeat=options['repeat']),
+            'results': results,
+        }
+        self._print_results(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'[OK] Report written to {options["output"]}'))
+
+        if options['compare']:
+            self._compare(report, options)
+
+    def _run(self, scenarios, options):
+        try:
+            fixtures = benchmark_fixtures()
+        except LookupError as e:
+            raise CommandError(str(e))
+        return ViewBenchmark(repeat=options['repeat'], scenarios=scenarios).run(fixtures)
+
+    def _print_results(self, results):
+        self.stdout.write(f'\n{"view":<28} {"status":>6} {"median ms":>10} {"cold ms":>9} {"queries":>8} {"peak KiB":>9}')
+        for name, result in results.items():
+            line = (f'{name:<28} {result["status"]:>6} {result["wall_ms"]["median"]:>10.2f} '
+                    f'{result["cold_ms"]:>9.2f} {result["queries"]:>8} {result["peak_kib"]:>9.1f}')
+            self.stdout.write(line if result['ok'] else self.style.ERROR(line))
+
+    def _compare(self, report, options):
+        try:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read baseline {options["compare"]}: {e}')
+
+        rows = compare_reports(baseline, report, options['threshold'] / 100)
+        self.stdout.write(f'\nCompared with {options["compare"]} ({baseline.get("meta", {}).get("commit") or "unknown commit"}):')
+        for row in rows:
+            line = (f'  {row["name"]:<28} {row["baseline_ms"]:>9.2f} -> {row["current_ms"]:>9.2f} ms '
+                    f'({row["change"]:+.0%}), queries {row["baseline_queries"]} -> {row["current_queries"]}')
+            self.stdout.write(self.style.ERROR(f'[ERR]{line}') if row['regressed'] else line)
+
+        regressed = [row['name'] for row in rows if row['regressed']]
+        if regressed and options['fail_on_regression']:
+            raise CommandError(f'{len(regressed)} view(s) regressed: {", ".join(regressed)}')
+        if not regressed:
+            self.stdout.write(self.style.SUCCESS('[OK] No regressions'))
+
+    @staticmethod
+    def _git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, timeout=5
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+from gearguard.routers import REPLICA, replica_reads
+from maintenance.models import MaintenanceRequest
+
+ROUND_TRIPS = 20
+
+
+class Command(BaseCommand):
+    help = 'Check the connection settings, pooling and read-replica routing of every configured database'
+
+    def handle(self, *args, **options):
+        failures = []
+        for alias in connections:
+            try:
+                self._check(alias)
+            except Exception as error:
+                failures.append(alias)
+                self.stdout.write(self.style.ERROR(f'  [ERR] {alias}: {error}'))
+
+        if REPLICA in settings.DATABASES:
+            with replica_reads():
+                routed = router.db_for_read(MaintenanceRequest)
+            written = router.db_for_write(MaintenanceRequest)
+            if (routed, written) == (REPLICA, DEFAULT_DB_ALIAS):
+                self.stdout.write(self.style.SUCCESS('  [OK] routing: replica views read from replica, writes go to default'))
+            else:
+                failures.append('routing')
+                self.stdout.write(self.style.ERROR(
+                    f'  [ERR] routing: replica views read from {routed}, writes go to {written}'
+                ))
+
+        if failures:
+            raise CommandError(f'{len(failures)} database check(s) failed: {", ".join(failures)}')
+
+    def _check(self, alias):
+        connection = connections[alias]
+        config = connection.settings_dict
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            for _ in range(ROUND_TRIPS):
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            round_trip = (time.perf_counter() - started) / ROUND_TRIPS * 1000
+            standby = None
+            if connection.vendor == 'postgresql':
+                cursor.execute('SHOW server_version')
+                version = cursor.fetchone()[0]
+                cursor.execute('SELECT pg_is_in_recovery(), now() - pg_last_xact_replay_timestamp()')
+                standby, lag = cursor.fetchone()
+            else:
+                version = connection.Database.sqlite_version
+        pool = config['OPTIONS'].get('pool')
+        if pool:
+            reuse = f'pooled (min {pool.get("min_size", "?")}, max {pool.get("max_size", "?")})'
+        elif config['CONN_MAX_AGE']:
+            checked = ' with health checks' if config['CONN_HEALTH_CHECKS'] else ''
+            reuse = f'persistent for {config["CONN_MAX_AGE"]}s{checked}'
+        else:
+            reuse = 'one connection per request'
+
+        self.stdout.write(self.style.SUCCESS(
+            f'  [OK] {alias}: {connection.vendor} {version}, {reuse}, {round_trip:.2f}ms per query'
+        ))
+        if alias == REPLICA and standby is not None:
+            if standby:
+                self.stdout.write(f'      standby, replaying {lag or "no"} behind the last primary commit')
+            else:
+                self.stdout.write(self.style.WARNING(
+                    '  [WARN] replica: not in recovery; it points at a primary (fine for local testing)'
+                ))
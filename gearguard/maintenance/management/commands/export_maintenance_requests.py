@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance.export import CHUNK_SIZE, FORMATS, RENDERERS, export_rows
+from maintenance.forms import MaintenanceExportForm
+from maintenance.models import MaintenanceRequest
+
+
+class Command(BaseCommand):
+    help = 'Stream maintenance requests with their equipment, team, technician and work center as CSV or JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv', help='Output format (default: csv)')
+        parser.add_argument('--output', '-o', help='File to write (default: standard output)')
+        parser.add_argument('--start', help='First request date to include (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last request date to include (YYYY-MM-DD)')
+        parser.add_argument('--company', help='Only requests for equipment of this company')
+        parser.add_argument('--stage', help='Only requests in this stage')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help=f'Rows fetched from the database at a time (default: {CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+        filters = {name: options[name] for name in ('start', 'end', 'company', 'stage') if options[name]}
+        form = MaintenanceExportForm(filters)
+        if not form.is_valid():
+            raise CommandError('; '.join(
+                f'{field}: {error}' for field, errors in form.errors.items() for error in errors
+            ))
+
+        rows = export_rows(form.filter(MaintenanceRequest.objects.all()), chunk_size=options['chunk_size'])
+        started = time.perf_counter()
+        count = 0
+
+        def counted():
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        chunks = RENDERERS[options['format']](counted())
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f"  [OK] {count} requests exported to {options['output']} in {time.perf_counter() - started:.2f}s"
+        ))
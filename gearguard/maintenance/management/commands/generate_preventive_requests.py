@@ -0,0 +1,129 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from maintenance.models import MaintenanceRequest, PreventiveSchedule
+from maintenance.recurrence import occurrence
+from maintenance.signals import requests_changed
+
+
+class Command(BaseCommand):
+    help = 'Materialise upcoming preventive maintenance occurrences for every active schedule'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon', type=int, default=30, help='Days ahead to generate occurrences for (default: 30)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert (default: 5000)')
+        parser.add_argument('--dry-run', action='store_true', help='Count occurrences without writing them')
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='Also create the past occurrences of new schedules whose start date has passed',
+        )
+
+    def handle(self, *args, **options):
+        horizon = options['horizon']
+        batch_size = options['batch_size']
+        if horizon < 1 or batch_size < 1:
+            raise CommandError('--horizon and --batch-size must be positive')
+
+        horizon_end = timezone.now() + timedelta(days=horizon)
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        started = time.perf_counter()
+
+        # Only schedules with something due inside the horizon are loaded;
+        # the (is_active, next_occurrence) index makes this a range scan.
+        schedules = PreventiveSchedule.objects.filter(
+            is_active=True, next_occurrence__lte=horizon_end
+        ).only(
+            'id', 'name', 'maintenance_for', 'equipment_id', 'work_center_id', 'team_id', 'technician_id',
+            'frequency', 'interval', 'start_date', 'duration', 'priority', 'instructions',
+            'occurrence_index', 'next_occurrence',
+        ).order_by('pk')
+
+        pending_requests = []
+        pending_schedules = []
+        totals = {'schedules': 0, 'occurrences': 0}
+        equipment_ids = set()
+
+        for schedule in schedules.iterator(chunk_size=batch_size):
+            index = schedule.occurrence_index
+            due = schedule.next_occurrence
+            # Schedules saved before the field validator may exceed the bound
+            # the calendar's overlap query relies on
+            duration = schedule.duration
+            if duration is not None:
+                duration = min(duration, MaintenanceRequest.MAX_DURATION)
+            if index == 0 and not options['backfill']:
+                # A schedule that starts in the past picks up from today
+                # rather than filling the board with overdue occurrences
+                while due < today:
+                    index += 1
+                    due = occurrence(schedule.start_date, schedule.frequency, schedule.interval, index)
+            while due <= horizon_end:
+                pending_requests.append(MaintenanceRequest(
+                    subject=schedule.name,
+                    maintenance_for=schedule.maintenance_for,
+                    equipment_id=schedule.equipment_id,
+                    work_center_id=schedule.work_center_id,
+                    team_id=schedule.team_id,
+                    technician_id=schedule.technician_id,
+                    scheduled_date=due,
+                    duration=duration,
+                    maintenance_type='preventive',
+                    priority=schedule.priority,
+                    stage='new',
+                    instructions=schedule.instructions,
+                    schedule_id=schedule.pk,
+                ))
+                index += 1
+                due = occurrence(schedule.start_date, schedule.frequency, schedule.interval, index)
+            if schedule.equipment_id and index != schedule.occurrence_index:
+                equipment_ids.add(schedule.equipment_id)
+
+            schedule.occurrence_index = index
+            schedule.next_occurrence = due
+            pending_schedules.append(schedule)
+            totals['schedules'] += 1
+
+            if len(pending_requests) >= batch_size or len(pending_schedules) >= batch_size:
+                totals['occurrences'] += self._flush(pending_requests, pending_schedules, batch_size, options['dry_run'])
+
+        totals['occurrences'] += self._flush(pending_requests, pending_schedules, batch_size, options['dry_run'])
+
+        if totals['occurrences'] and not options['dry_run']:
+            requests_changed.send(sender=MaintenanceRequest, pks=None, equipment_ids=equipment_ids)
+
+        elapsed = time.perf_counter() - started
+        rate = totals['occurrences'] / elapsed if elapsed else 0
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f"[OK] {verb} {totals['occurrences']} occurrence(s) for {totals['schedules']} schedule(s) "
+            f"up to {horizon_end:%Y-%m-%d} in {elapsed:.2f}s ({rate:.0f} rows/s)"
+        ))
+
+    def _flush(self, pending_requests, pending_schedules, batch_size, dry_run):
+        """
+        Insert the buffered occurrences and advance their schedules atomically.
+
+        Returns:
+            Number of requests inserted (planned, on a dry run)
+        """
+        count = len(pending_requests)
+        if not dry_run and (pending_requests or pending_schedules):
+            occurrences = MaintenanceRequest.objects.filter(schedule_id__in=[s.pk for s in pending_schedules])
+            with transaction.atomic():
+                before = occurrences.count()
+                # ignore_conflicts + the (schedule, scheduled_date) unique
+                # constraint make a re-run after a crash, or after a
+                # schedule's recurrence changed, skip existing rows.
+                MaintenanceRequest.objects.bulk_create(pending_requests, batch_size=batch_size, ignore_conflicts=True)
+                PreventiveSchedule.objects.bulk_update(
+                    pending_schedules, ['occurrence_index', 'next_occurrence'], batch_size=batch_size
+                )
+                # ignore_conflicts does not report which rows it skipped
+                count = occurrences.count() - before
+        pending_requests.clear()
+        pending_schedules.clear()
+        return count
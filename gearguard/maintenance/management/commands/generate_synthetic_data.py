@@ -0,0 +1,66 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance.synthetic import SyntheticDataGenerator, SyntheticScale
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset for load and performance testing'
+
+    def add_arguments(self, parser):
+        defaults = SyntheticScale()
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same data (default: 42)')
+        parser.add_argument('--until', type=date.fromisoformat, default=None, help='Last day of request history, YYYY-MM-DD (default: today)')
+        parser.add_argument('--companies', type=int, default=defaults.companies)
+        parser.add_argument('--work-centers', type=int, default=defaults.work_centers)
+        parser.add_argument('--teams', type=int, default=defaults.teams)
+        parser.add_argument('--users', type=int, default=defaults.users)
+        parser.add_argument('--equipment', type=int, default=defaults.equipment)
+        parser.add_argument('--years', type=float, default=defaults.years, help='Years of request history')
+        parser.add_argument('--requests-per-equipment-year', type=float, default=defaults.requests_per_equipment_year,
+                            help='Mean requests per equipment per year; individual machines are Pareto-skewed')
+        parser.add_argument('--batch-size', type=int, default=SyntheticDataGenerator.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--password', default=SyntheticDataGenerator.DEFAULT_PASSWORD, help='Password of every generated user')
+        parser.add_argument('--replace', action='store_true', help='Delete previously generated rows first')
+
+    def handle(self, *args, **options):
+        scale = SyntheticScale(
+            companies=options['companies'],
+            work_centers=options['work_centers'],
+            teams=options['teams'],
+            users=options['users'],
+            equipment=options['equipment'],
+            years=options['years'],
+            requests_per_equipment_year=options['requests_per_equipment_year'],
+        )
+        if min(scale.users, scale.teams, options['batch_size']) < 1 or scale.years <= 0:
+            raise CommandError('--users, --teams, --batch-size and --years must be positive')
+
+        if SyntheticDataGenerator.exists():
+            if not options['replace']:
+                raise CommandError('Synthetic data already exists; pass --replace to regenerate it')
+            self.stdout.write('Deleting previously generated data...')
+            SyntheticDataGenerator.clear()
+
+        generator = SyntheticDataGenerator(
+            scale,
+            seed=options['seed'],
+            until=options['until'],
+            batch_size=options['batch_size'],
+            password=options['password'],
+            progress=lambda message: self.stdout.write(f'  - {message}'),
+        )
+        started = time.perf_counter()
+        counts = generator.generate()
+        elapsed = time.perf_counter() - started
+
+        for label, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'  [OK] {label}: {count}'))
+        total = sum(counts.values())
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write('\n' + self.style.SUCCESS(
+            f'[OK] Generated {total} rows in {elapsed:.2f}s ({rate:.0f} rows/s) with seed {options["seed"]}; '
+            f'users log in with password {options["password"]!r}'
+        ))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance.assignment import AutoAssigner
+
+
+class Command(BaseCommand):
+    help = 'Assign a team and technician to every new request that has no technician, balancing load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk update (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true', help='Count assignments without writing them')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        started = time.perf_counter()
+        result = AutoAssigner.rebalance(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        verb = 'would be assigned' if options['dry_run'] else 'assigned'
+        self.stdout.write(self.style.SUCCESS(
+            f"  [OK] {result['assigned']} of {result['scanned']} unassigned new requests {verb} "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
@@ -1,19 +1,30 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 import json
 import os
+import time
 from equipment.models import Equipment, EquipmentCategory
 from teams.models import Team, WorkCenter
 from maintenance.models import MaintenanceRequest
+from maintenance.seeding import BulkSeeder
 from datetime import datetime
 
 class Command(BaseCommand):
     help = 'Seed the database with initial data from JSON file'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Fixture to load (default: maintenance/data/seed_data.json)')
+        parser.add_argument('--bulk', action='store_true', help='Stream the fixture and insert in batches in one transaction')
+        parser.add_argument('--batch-size', type=int, default=BulkSeeder.DEFAULT_BATCH_SIZE, help='Rows per bulk insert in --bulk mode')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes in --bulk mode (default: CPU count)')
+
     def handle(self, *args, **options):
-        json_path = os.path.join(os.path.dirname(__file__), '../../data/seed_data.json')
-        
+        json_path = options['file'] or os.path.join(os.path.dirname(__file__), '../../data/seed_data.json')
+
+        if options['bulk']:
+            return self._seed_bulk(json_path, options)
+
         try:
             with open(json_path, 'r') as f:
                 data = json.load(f)
@@ -202,3 +213,30 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.ERROR(f'  [ERR] Error creating maintenance request: {str(e)}'))
 
         self.stdout.write('\n' + self.style.SUCCESS('[OK] Database seeding completed successfully!'))
+
+    def _seed_bulk(self, json_path, options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        seeder = BulkSeeder(batch_size=options['batch_size'], workers=options['workers'])
+        started = time.perf_counter()
+        try:
+            with open(json_path, 'r') as f:
+                stats = seeder.load(f)
+        except FileNotFoundError:
+            raise CommandError(f'File not found: {json_path}')
+        except ValueError as e:
+            raise CommandError(f'Invalid fixture {json_path}: {e}')
+        elapsed = time.perf_counter() - started
+
+        total = 0
+        for section in stats:
+            total += section.created + section.updated
+            self.stdout.write(self.style.SUCCESS(
+                f'  [OK] {section.section}: {section.created} created, {section.updated} updated, '
+                f'{section.skipped} skipped in {section.seconds:.2f}s ({section.rate:.0f} rows/s)'
+            ))
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write('\n' + self.style.SUCCESS(
+            f'[OK] Bulk seeding wrote {total} rows in {elapsed:.2f}s ({rate:.0f} rows/s)'
+        ))
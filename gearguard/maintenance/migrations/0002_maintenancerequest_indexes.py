@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_equipment_company'),
+        ('maintenance', '0001_initial'),
+        ('teams', '0002_team_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['-request_date', '-id'], name='mr_request_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['stage', 'scheduled_date'], name='mr_stage_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(condition=models.Q(('stage__in', ('new', 'in_progress'))), fields=['technician', 'scheduled_date'], name='mr_tech_open_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['team', 'stage', 'scheduled_date'], name='mr_team_stage_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(condition=models.Q(('scheduled_date__isnull', False)), fields=['scheduled_date'], name='mr_scheduled_date_idx'),
+        ),
+    ]
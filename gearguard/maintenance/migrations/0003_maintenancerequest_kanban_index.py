@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_equipment_company'),
+        ('maintenance', '0002_maintenancerequest_indexes'),
+        ('teams', '0002_team_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['stage', '-request_date', '-id'], name='mr_stage_request_date_idx'),
+        ),
+    ]
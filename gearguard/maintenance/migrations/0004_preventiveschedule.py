@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_equipment_company'),
+        ('maintenance', '0003_maintenancerequest_kanban_index'),
+        ('teams', '0002_team_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PreventiveSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('maintenance_for', models.CharField(choices=[('equipment', 'Equipment'), ('work_center', 'Work Center')], default='equipment', max_length=20)),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly'), ('yearly', 'Yearly')], default='monthly', max_length=20)),
+                ('interval', models.PositiveIntegerField(default=1)),
+                ('start_date', models.DateTimeField()),
+                ('duration', models.DurationField(blank=True, null=True)),
+                ('priority', models.IntegerField(choices=[(1, 'Low'), (2, 'Medium'), (3, 'High')], default=2)),
+                ('instructions', models.TextField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('occurrence_index', models.PositiveIntegerField(default=0)),
+                ('next_occurrence', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('equipment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='preventive_schedules', to='equipment.equipment')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='teams.team')),
+                ('technician', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='preventive_schedules', to=settings.AUTH_USER_MODEL)),
+                ('work_center', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='preventive_schedules', to='teams.workcenter')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='maintenance.preventiveschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='maintenancerequest',
+            constraint=models.UniqueConstraint(fields=('schedule', 'scheduled_date'), name='mr_unique_schedule_occurrence'),
+        ),
+        migrations.AddIndex(
+            model_name='preventiveschedule',
+            index=models.Index(fields=['is_active', 'next_occurrence'], name='ps_active_next_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0004_equipment_stats'),
+        ('maintenance', '0004_preventiveschedule'),
+        ('teams', '0002_team_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['equipment', '-request_date', '-id'], name='mr_equipment_history_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:27
+
+import datetime
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0005_maintenancerequest_equipment_history_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='maintenancerequest',
+            name='duration',
+            field=models.DurationField(blank=True, null=True, validators=[django.core.validators.MaxValueValidator(datetime.timedelta(days=41, seconds=57599))]),
+        ),
+        migrations.AlterField(
+            model_name='preventiveschedule',
+            name='duration',
+            field=models.DurationField(blank=True, null=True, validators=[django.core.validators.MaxValueValidator(datetime.timedelta(days=41, seconds=57599))]),
+        ),
+    ]
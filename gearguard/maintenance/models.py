@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.core.validators import MaxValueValidator
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -25,6 +28,14 @@ class MaintenanceRequest(models.Model):
         ('scrapped', 'Scrapped'),
     ]
 
+    # Stages that still need work; the dashboard, kanban and workload views
+    # all filter on exactly this tuple so the partial indexes below apply.
+    OPEN_STAGES = ('new', 'in_progress')
+
+    # Longest duration a request or schedule may have (999:59:59). Range
+    # queries use it to bound how early an overlapping request can start.
+    MAX_DURATION = timedelta(hours=999, minutes=59, seconds=59)
+
     subject = models.CharField(max_length=200)
     maintenance_for = models.CharField(max_length=20, choices=MAINTENANCE_FOR_CHOICES, default='equipment')
     
@@ -40,7 +51,7 @@ class MaintenanceRequest(models.Model):
     # Scheduling
     request_date = models.DateField(auto_now_add=True)
     scheduled_date = models.DateTimeField(null=True, blank=True)
-    duration = models.DurationField(null=True, blank=True)
+    duration = models.DurationField(null=True, blank=True, validators=[MaxValueValidator(MAX_DURATION)])
     
     # Categorization
     maintenance_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='corrective')
@@ -50,5 +61,128 @@ class MaintenanceRequest(models.Model):
     notes = models.TextField(blank=True)
     instructions = models.TextField(blank=True)
 
+    # Set on occurrences materialised from a preventive schedule
+    schedule = models.ForeignKey(
+        'PreventiveSchedule', related_name='occurrences', on_delete=models.SET_NULL, null=True, blank=True
+    )
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order of the request list
+            models.Index(fields=['-request_date', '-id'], name='mr_request_date_id_idx'),
+            # Open-request counts, overdue checks and per-stage boards
+            models.Index(fields=['stage', 'scheduled_date'], name='mr_stage_sched_idx'),
+            # Kanban columns, keyset-paginated newest first within a stage
+            models.Index(fields=['stage', '-request_date', '-id'], name='mr_stage_request_date_idx'),
+            # Technician workload over open requests. SQLite cannot match a
+            # partial index against bound parameters and falls back to the
+            # plain technician_id FK index; PostgreSQL uses this one.
+            models.Index(
+                fields=['technician', 'scheduled_date'],
+                name='mr_tech_open_sched_idx',
+                condition=models.Q(stage__in=('new', 'in_progress')),
+            ),
+            # Maintenance history of one piece of equipment, newest first
+            models.Index(fields=['equipment', '-request_date', '-id'], name='mr_equipment_history_idx'),
+            # Team boards filtered by stage and sorted by schedule
+            models.Index(fields=['team', 'stage', 'scheduled_date'], name='mr_team_stage_sched_idx'),
+            # Calendar range scans
+            models.Index(
+                fields=['scheduled_date'],
+                name='mr_scheduled_date_idx',
+                condition=models.Q(scheduled_date__isnull=False),
+            ),
+        ]
+        constraints = [
+            # Makes occurrence generation idempotent: re-running the job
+            # cannot materialise the same occurrence twice.
+            models.UniqueConstraint(fields=['schedule', 'scheduled_date'], name='mr_unique_schedule_occurrence'),
+        ]
+
     def __str__(self):
         return self.subject
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Equipment the row was loaded with, so a save that moves the request
+        # elsewhere can refresh the previous equipment's stats as well
+        if 'equipment_id' in field_names:
+            instance._loaded_equipment_id = values[field_names.index('equipment_id')]
+        return instance
+
+
+class PreventiveSchedule(models.Model):
+    """Recurring preventive maintenance for a piece of equipment or a work center."""
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    ]
+
+    name = models.CharField(max_length=200)
+    maintenance_for = models.CharField(
+        max_length=20, choices=MaintenanceRequest.MAINTENANCE_FOR_CHOICES, default='equipment'
+    )
+    equipment = models.ForeignKey(
+        'equipment.Equipment', related_name='preventive_schedules', null=True, blank=True, on_delete=models.CASCADE
+    )
+    work_center = models.ForeignKey(
+        'teams.WorkCenter', related_name='preventive_schedules', null=True, blank=True, on_delete=models.CASCADE
+    )
+    team = models.ForeignKey('teams.Team', null=True, blank=True, on_delete=models.SET_NULL)
+    technician = models.ForeignKey(User, related_name='preventive_schedules', on_delete=models.SET_NULL, null=True, blank=True)
+
+    # Recurrence: every ``interval`` x ``frequency`` starting at ``start_date``
+    frequency = models.CharField(max_length=20, choices=FREQUENCY_CHOICES, default='monthly')
+    interval = models.PositiveIntegerField(default=1)
+    start_date = models.DateTimeField()
+    # Copied into every occurrence, so it shares the requests' upper bound
+    duration = models.DurationField(
+        null=True, blank=True, validators=[MaxValueValidator(MaintenanceRequest.MAX_DURATION)]
+    )
+    priority = models.IntegerField(choices=MaintenanceRequest.PRIORITY_CHOICES, default=2)
+    instructions = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+
+    # Generation cursor: occurrences before ``occurrence_index`` exist, and
+    # ``next_occurrence`` is the date of the next one to materialise.
+    occurrence_index = models.PositiveIntegerField(default=0)
+    next_occurrence = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', 'next_occurrence'], name='ps_active_next_idx'),
+        ]
+
+    # Fields occurrences are computed from; changing one restarts generation
+    RECURRENCE_FIELDS = ('start_date', 'frequency', 'interval')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(name in field_names for name in cls.RECURRENCE_FIELDS):
+            instance._loaded_recurrence = instance._recurrence()
+        return instance
+
+    def _recurrence(self):
+        return tuple(getattr(self, name) for name in self.RECURRENCE_FIELDS)
+
+    def save(self, *args, **kwargs):
+        recurrence = self._recurrence()
+        new = self.next_occurrence is None and not self.occurrence_index
+        if new or recurrence != getattr(self, '_loaded_recurrence', recurrence):
+            # Occurrences already created stay; the generator skips dates it
+            # has materialised through the (schedule, scheduled_date) constraint
+            self.occurrence_index = 0
+            self.next_occurrence = self.start_date
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'occurrence_index', 'next_occurrence'}
+        super().save(*args, **kwargs)
+        self._loaded_recurrence = recurrence
+
+    def __str__(self):
+        return self.name
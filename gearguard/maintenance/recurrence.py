@@ -0,0 +1,47 @@
+"""
+Date arithmetic for preventive maintenance schedules.
+
+Occurrences are always computed from the schedule's ``start_date`` and an
+index rather than by repeatedly stepping from the previous occurrence, so
+monthly schedules that start on the 31st come back to the 31st after a
+short month instead of drifting to the 28th.
+"""
+import calendar
+from datetime import datetime, timedelta
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift ``value`` by whole months, clamping to the end of short months."""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def occurrence(start: datetime, frequency: str, interval: int, index: int) -> datetime:
+    """
+    Return the ``index``-th occurrence (0-based) of a recurrence.
+
+    Args:
+        start: First occurrence
+        frequency: One of ``daily``, ``weekly``, ``monthly``, ``yearly``
+        interval: Number of frequency units between occurrences
+        index: Which occurrence to compute
+
+    Returns:
+        The occurrence datetime
+
+    Raises:
+        ValueError: If the frequency is unknown
+    """
+    steps = index * max(interval, 1)
+    if frequency == 'daily':
+        return start + timedelta(days=steps)
+    if frequency == 'weekly':
+        return start + timedelta(weeks=steps)
+    if frequency == 'monthly':
+        return add_months(start, steps)
+    if frequency == 'yearly':
+        return add_months(start, steps * 12)
+    raise ValueError(f"Unknown frequency: {frequency}")
@@ -0,0 +1,419 @@
+"""
+Bulk fixture loader behind ``seed_database --bulk``.
+
+The fixture is streamed one record at a time and written in batches with
+``bulk_create`` inside a single transaction. Foreign keys given as natural
+keys (usernames, names, codes, serial numbers) are resolved through
+in-memory ``key -> id`` maps that are preloaded from the database and
+extended as batches are inserted, so no row costs a lookup query of its own.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_duration
+
+from accounts.models import UserProfile
+from dashboard.metrics import DashboardMetrics
+from equipment.models import Equipment, EquipmentCategory
+from gearguard.utils.json_stream import JSONSectionStream
+from search.index import BULK_INDEXED_KINDS, SearchIndex
+from teams.models import Team, WorkCenter
+from .models import MaintenanceRequest
+from .signals import requests_changed
+
+# Fixture sections that are loaded, with the sections their references need
+SECTION_DEPENDENCIES = {
+    'users': (),
+    'work_centers': (),
+    'equipment_categories': ('users',),
+    'teams': ('work_centers',),
+    'equipment': ('users', 'equipment_categories', 'teams', 'work_centers'),
+    'maintenance_requests': ('users', 'equipment', 'teams', 'work_centers'),
+}
+
+# How a fixture names its references: model field -> (JSON key, lookup map).
+# maintenance/data/seed_data.json refers to rows by name ...
+FIXTURE_REFERENCES = {
+    'equipment_categories': {'responsible': ('responsible', 'user')},
+    'teams': {'work_center': ('work_center', 'work_center_name')},
+    'equipment': {
+        'category': ('category', 'category'),
+        'employee': ('employee', 'user'),
+        'maintenance_team': ('maintenance_team', 'team'),
+        'work_center': ('work_center', 'work_center_name'),
+    },
+    'maintenance_requests': {
+        'created_by': ('created_by', 'user'),
+        'technician': ('technician', 'user'),
+        'equipment': ('equipment', 'equipment_name'),
+        'work_center': ('work_center', 'work_center_name'),
+        'team': ('team', 'team'),
+    },
+}
+
+# ... while the project-level seed_data.json uses codes and serial numbers.
+SCRIPT_REFERENCES = {
+    'equipment_categories': {'responsible': ('responsible_username', 'user')},
+    'teams': {'work_center': ('work_center_code', 'work_center_code')},
+    'equipment': {
+        'category': ('category_name', 'category'),
+        'employee': ('employee_username', 'user'),
+        'maintenance_team': ('maintenance_team_name', 'team'),
+        'work_center': ('work_center_code', 'work_center_code'),
+    },
+    'maintenance_requests': {
+        'created_by': ('created_by_username', 'user'),
+        'technician': ('technician_username', 'user'),
+        'equipment': ('equipment_serial', 'equipment_serial'),
+        'team': ('team_name', 'team'),
+    },
+}
+
+# Lookup map name -> (model, natural key field) it is built from
+LOOKUP_SOURCES = {
+    'user': (User, 'username'),
+    'work_center_name': (WorkCenter, 'name'),
+    'work_center_code': (WorkCenter, 'code'),
+    'category': (EquipmentCategory, 'name'),
+    'team': (Team, 'name'),
+    'equipment_name': (Equipment, 'name'),
+    'equipment_serial': (Equipment, 'serial_number'),
+}
+
+# Maps consulted to skip rows that already exist, whatever the format
+EXISTENCE_LOOKUPS = ('user', 'work_center_name', 'work_center_code', 'category', 'team', 'equipment_serial')
+
+
+@dataclass
+class SectionStats:
+    """Outcome of loading one fixture section."""
+
+    section: str
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Rows written per second."""
+        written = self.created + self.updated
+        return written / self.seconds if self.seconds else 0.0
+
+
+def _init_hash_worker() -> None:
+    # Workers started with spawn/forkserver do not inherit configured apps
+    django.setup()
+
+
+class BulkSeeder:
+    """
+    Load a seed fixture with batched inserts and in-memory key resolution.
+
+    Rows are matched on the keys the row-by-row seeder passes to
+    ``get_or_create`` (``username``, ``name``, ``serial_number``, ``(subject,
+    created_by)``) and existing ones are left untouched, except work centers,
+    which are upserted on their unique ``code`` so rates follow the fixture.
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    def __init__(self, references: Dict[str, Dict[str, Tuple[str, str]]] = FIXTURE_REFERENCES,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: Optional[int] = None):
+        self.references = references
+        self.batch_size = batch_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.lookups: Dict[str, Dict[Any, int]] = {}
+        self._stats: Dict[str, SectionStats] = {}
+        self._equipment_ids: Set[int] = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def load(self, fp: TextIO) -> List[SectionStats]:
+        """
+        Stream ``fp`` into the database in one transaction.
+
+        Sections load in file order. A section that arrives before one it
+        references is held back until the end of the file, so out-of-order
+        fixtures still resolve at the cost of keeping that section in memory.
+
+        Args:
+            fp: Open text file containing the fixture
+
+        Returns:
+            Per-section statistics in load order
+        """
+        self._stats = {}
+        self._equipment_ids = set()
+        deferred: Dict[str, list] = {}
+        seen = set()
+
+        try:
+            with transaction.atomic():
+                self._preload_lookups()
+                for section, records in self._batches(JSONSectionStream(fp)):
+                    if all(dep in seen for dep in SECTION_DEPENDENCIES[section]):
+                        self._load_batch(section, records)
+                    else:
+                        deferred.setdefault(section, []).extend(records)
+                    seen.add(section)
+                for section in SECTION_DEPENDENCIES:
+                    records = deferred.pop(section, [])
+                    for start in range(0, len(records), self.batch_size):
+                        self._load_batch(section, records[start:start + self.batch_size])
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+        # Bulk writes bypass post_save; refresh what the signals would have
+        for kind in BULK_INDEXED_KINDS:
+            SearchIndex.rebuild(kind, only_missing=True)
+        requests_changed.send(sender=MaintenanceRequest, pks=None, equipment_ids=self._equipment_ids)
+        DashboardMetrics.invalidate()
+        return list(self._stats.values())
+
+    def _batches(self, stream: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, list]]:
+        """Group streamed records into per-section batches of ``batch_size``."""
+        section, batch = None, []
+        for name, record in stream:
+            if name not in SECTION_DEPENDENCIES:
+                continue
+            if batch and (name != section or len(batch) >= self.batch_size):
+                yield section, batch
+                batch = []
+            section = name
+            batch.append(record)
+        if batch:
+            yield section, batch
+
+    def _load_batch(self, section: str, records: List[dict]) -> None:
+        stats = self._stats.setdefault(section, SectionStats(section))
+        started = time.perf_counter()
+        getattr(self, f'_load_{section}')(records, stats)
+        stats.seconds += time.perf_counter() - started
+
+    def _preload_lookups(self) -> None:
+        """Build every ``natural key -> id`` map the fixture format needs."""
+        needed = set(EXISTENCE_LOOKUPS)
+        for fields in self.references.values():
+            needed.update(lookup for _, lookup in fields.values())
+        self.lookups = {}
+        for name in needed:
+            model, field = LOOKUP_SOURCES[name]
+            rows = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+            self.lookups[name] = dict(rows.values_list(field, 'pk').iterator(chunk_size=10000))
+
+    def _remember(self, lookup: str, objects: List[Any]) -> None:
+        """Add freshly inserted rows to a lookup map."""
+        if lookup not in self.lookups:
+            return
+        model, field = LOOKUP_SOURCES[lookup]
+        keys = [getattr(obj, field) for obj in objects if getattr(obj, field)]
+        if all(obj.pk is not None for obj in objects):
+            self.lookups[lookup].update((getattr(obj, field), obj.pk) for obj in objects if getattr(obj, field))
+        elif keys:
+            # Backends that cannot return ids from a bulk insert
+            self.lookups[lookup].update(model.objects.filter(**{f'{field}__in': keys}).values_list(field, 'pk'))
+
+    def _references(self, section: str, record: dict) -> Dict[str, Optional[int]]:
+        """Resolve a record's natural-key references to ``<field>_id`` values."""
+        resolved = {}
+        for field, (key, lookup) in self.references.get(section, {}).items():
+            value = record.get(key)
+            resolved[f'{field}_id'] = self.lookups[lookup].get(value) if value else None
+        return resolved
+
+    def _hash_passwords(self, passwords: List[Optional[str]]) -> List[str]:
+        """
+        Hash passwords in a process pool; the hasher is CPU-bound by design.
+        Missing passwords become unusable ones without touching the pool.
+        """
+        todo = [password for password in passwords if password]
+        if self.workers > 1 and len(todo) > self.workers:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_hash_worker)
+            chunksize = max(1, len(todo) // (self.workers * 4))
+            hashed = iter(self._pool.map(make_password, todo, chunksize=chunksize))
+        else:
+            hashed = iter([make_password(password) for password in todo])
+        return [next(hashed) if password else make_password(None) for password in passwords]
+
+    def _load_users(self, records: List[dict], stats: SectionStats) -> None:
+        known = self.lookups['user']
+        new, batch_keys = [], set()
+        for record in records:
+            username = record['username']
+            if username in known or username in batch_keys:
+                stats.skipped += 1
+                continue
+            batch_keys.add(username)
+            new.append(record)
+        if not new:
+            return
+
+        passwords = self._hash_passwords([record.get('password') for record in new])
+        users = [
+            User(
+                username=record['username'],
+                email=record.get('email', ''),
+                password=password,
+                first_name=record.get('first_name', ''),
+                last_name=record.get('last_name', ''),
+                is_staff=record.get('is_staff', False),
+                is_superuser=record.get('is_superuser', False),
+            )
+            for record, password in zip(new, passwords)
+        ]
+        User.objects.bulk_create(users, batch_size=self.batch_size, ignore_conflicts=True)
+        # ignore_conflicts never returns ids, so read them back for the batch
+        ids = dict(User.objects.filter(username__in=batch_keys).values_list('username', 'pk'))
+        known.update(ids)
+        # Stand in for accounts.models.create_user_profile, which bulk_create skips
+        UserProfile.objects.bulk_create(
+            [UserProfile(user_id=ids[user.username], email=user.email) for user in users if user.username in ids],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        stats.created += len(users)
+
+    def _load_work_centers(self, records: List[dict], stats: SectionStats) -> None:
+        by_code, by_name = self.lookups['work_center_code'], self.lookups['work_center_name']
+        upserts, inserts, batch_keys = [], [], set()
+        for record in records:
+            code = record.get('code') or None
+            key = code or record['name']
+            if key in batch_keys or (code is None and record['name'] in by_name):
+                stats.skipped += 1
+                continue
+            batch_keys.add(key)
+            work_center = WorkCenter(
+                name=record['name'],
+                code=code,
+                tag=record.get('tag', ''),
+                cost_per_hour=record.get('cost_per_hour', 0),
+                capacity_efficiency=record.get('capacity_efficiency', 100),
+                oee_target=record.get('oee_target', 90),
+            )
+            if code is None:
+                inserts.append(work_center)
+            else:
+                upserts.append(work_center)
+                if code in by_code:
+                    stats.updated += 1
+                else:
+                    stats.created += 1
+
+        if upserts:
+            WorkCenter.objects.bulk_create(
+                upserts,
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=['code'],
+                update_fields=['name', 'tag', 'cost_per_hour', 'capacity_efficiency', 'oee_target'],
+            )
+            rows = WorkCenter.objects.filter(code__in=[wc.code for wc in upserts]).values_list('code', 'name', 'pk')
+            for code, name, pk in rows:
+                by_code[code] = pk
+                by_name[name] = pk
+        if inserts:
+            WorkCenter.objects.bulk_create(inserts, batch_size=self.batch_size)
+            self._remember('work_center_name', inserts)
+            stats.created += len(inserts)
+
+    def _load_equipment_categories(self, records: List[dict], stats: SectionStats) -> None:
+        categories = self._new_by_name(records, 'category', stats, lambda record: EquipmentCategory(
+            name=record['name'],
+            **self._references('equipment_categories', record),
+        ))
+        EquipmentCategory.objects.bulk_create(categories, batch_size=self.batch_size)
+        self._remember('category', categories)
+        stats.created += len(categories)
+
+    def _load_teams(self, records: List[dict], stats: SectionStats) -> None:
+        teams = self._new_by_name(records, 'team', stats, lambda record: Team(
+            name=record['name'],
+            description=record.get('description', ''),
+            company=record.get('company'),
+            **self._references('teams', record),
+        ))
+        Team.objects.bulk_create(teams, batch_size=self.batch_size)
+        self._remember('team', teams)
+        stats.created += len(teams)
+
+    def _new_by_name(self, records: List[dict], lookup: str, stats: SectionStats, build) -> list:
+        """Build objects for the records whose ``name`` is not yet known."""
+        known, batch_keys, objects = self.lookups[lookup], set(), []
+        for record in records:
+            if record['name'] in known or record['name'] in batch_keys:
+                stats.skipped += 1
+                continue
+            batch_keys.add(record['name'])
+            objects.append(build(record))
+        return objects
+
+    def _load_equipment(self, records: List[dict], stats: SectionStats) -> None:
+        known, batch_keys, equipment = self.lookups['equipment_serial'], set(), []
+        for record in records:
+            serial = record.get('serial_number', '')
+            if serial and (serial in known or serial in batch_keys):
+                stats.skipped += 1
+                continue
+            batch_keys.add(serial)
+            equipment.append(Equipment(
+                name=record['name'],
+                serial_number=serial,
+                company=record.get('company', ''),
+                description=record.get('description', ''),
+                assigned_date=parse_date(record['assigned_date']) if record.get('assigned_date') else None,
+                status=record.get('status', 'active'),
+                **self._references('equipment', record),
+            ))
+        Equipment.objects.bulk_create(equipment, batch_size=self.batch_size)
+        self._remember('equipment_serial', equipment)
+        self._remember('equipment_name', equipment)
+        stats.created += len(equipment)
+
+    def _load_maintenance_requests(self, records: List[dict], stats: SectionStats) -> None:
+        rows = [(record, self._references('maintenance_requests', record)) for record in records]
+        # One query per batch finds the (subject, created_by) pairs already stored
+        existing = set(MaintenanceRequest.objects.filter(
+            subject__in={record['subject'] for record in records}
+        ).values_list('subject', 'created_by_id'))
+
+        requests = []
+        for record, references in rows:
+            key = (record['subject'], references.get('created_by_id'))
+            if key in existing:
+                stats.skipped += 1
+                continue
+            existing.add(key)
+            requests.append(MaintenanceRequest(
+                subject=record['subject'],
+                maintenance_for=record.get('maintenance_for', 'equipment'),
+                scheduled_date=self._parse_datetime(record.get('scheduled_date')),
+                duration=parse_duration(record['duration']) if record.get('duration') else None,
+                maintenance_type=record.get('maintenance_type', 'corrective'),
+                priority=record.get('priority', 2),
+                stage=record.get('stage', 'new'),
+                notes=record.get('notes', ''),
+                instructions=record.get('instructions', ''),
+                **references,
+            ))
+        MaintenanceRequest.objects.bulk_create(requests, batch_size=self.batch_size)
+        self._equipment_ids.update(request.equipment_id for request in requests if request.equipment_id)
+        stats.created += len(requests)
+
+    @staticmethod
+    def _parse_datetime(value: Optional[str]):
+        parsed = parse_datetime(value) if value else None
+        if parsed is not None and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
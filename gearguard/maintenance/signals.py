@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from accounts.models import UserProfile
+from equipment.models import EquipmentCategory
+from gearguard.utils.cache_versions import CacheVersion
+from teams.models import Team
+from .models import MaintenanceRequest
+
+
+# Sent after MaintenanceRequest rows are changed through queryset.update() or
+# bulk_create()/bulk_update(), which bypass post_save. Receivers get ``pks``:
+# the affected primary keys, or None when the set is unknown or very large.
+# Senders passing None also pass ``equipment_ids``, the equipment whose
+# requests changed, so its stats are refreshed without a full rebuild.
+requests_changed = Signal()
+
+# Cache namespace versioned on every request write (calendar ETags etc.)
+VERSION_NAMESPACE = 'maintenance'
+
+# Cache namespace of the auto-assignment lookup tables
+ASSIGNMENT_NAMESPACE = 'assignment'
+
+
+@receiver([post_save, post_delete, requests_changed], sender=MaintenanceRequest)
+def bump_maintenance_version(sender, **kwargs):
+    """Invalidate every cache entry keyed on the maintenance data version."""
+    CacheVersion.bump(VERSION_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Team)
+@receiver([post_save, post_delete], sender=UserProfile)
+@receiver([post_save, post_delete], sender=EquipmentCategory)
+def bump_assignment_version(sender, **kwargs):
+    """Rebuild the auto-assignment tables after team, member or category changes."""
+    CacheVersion.bump(ASSIGNMENT_NAMESPACE)
@@ -0,0 +1,304 @@
+"""
+Deterministic synthetic dataset for load and performance testing.
+
+Everything is drawn from one seeded ``random.Random`` and written with
+batched ``bulk_create``, so the same seed and end date always produce the
+same rows. Volumes are skewed the way production data is: a few categories
+and teams own most of the equipment, a minority of machines account for
+most breakdowns, and a few technicians take most of the work.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from dashboard.metrics import DashboardMetrics
+from equipment.models import Equipment, EquipmentCategory
+from search.index import BULK_INDEXED_KINDS, SearchIndex
+from teams.models import Team, WorkCenter
+from .models import MaintenanceRequest
+from .signals import requests_changed
+
+# Natural-key prefixes that mark generated rows
+USERNAME_PREFIX = 'syn_'
+CODE_PREFIX = 'SYN-'
+TEAM_DESCRIPTION = 'Generated maintenance team'
+
+CATEGORY_NAMES = [
+    'CNC Machines', 'Conveyors', 'Compressors', 'Pumps', 'HVAC Units', 'Forklifts', 'Generators',
+    'Industrial Robots', 'Boilers', 'Hydraulic Presses', 'Welding Stations', 'Packaging Lines',
+    'Computers', 'Printers', 'Cooling Towers', 'Lathes',
+]
+TEAM_SPECIALTIES = ['Mechanical', 'Electrical', 'Hydraulics', 'Facilities', 'IT', 'Robotics', 'HVAC', 'Utilities']
+SUBJECTS = [
+    'Oil change', 'Belt replacement', 'Calibration', 'Bearing noise', 'Leak inspection', 'Filter replacement',
+    'Overheating', 'Unexpected shutdown', 'Sensor fault', 'Firmware update', 'Vibration check', 'Safety inspection',
+]
+
+
+@dataclass
+class SyntheticScale:
+    """Row counts and shape of a synthetic dataset."""
+
+    companies: int = 5
+    work_centers: int = 20
+    teams: int = 30
+    users: int = 300
+    equipment: int = 10000
+    years: float = 3.0
+    requests_per_equipment_year: float = 4.0
+
+
+class SyntheticDataGenerator:
+    """
+    Write a synthetic dataset in batches inside one transaction.
+
+    Generated users, work centers, teams and equipment are recognisable
+    (``syn_`` / ``SYN-`` prefixes, a fixed team description) so a later run
+    can find and :meth:`clear` them.
+    """
+
+    DEFAULT_BATCH_SIZE = 5000
+    DEFAULT_PASSWORD = 'Synthetic@12345'
+
+    def __init__(self, scale: SyntheticScale, seed: int = 42, until: Optional[date] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, password: str = DEFAULT_PASSWORD,
+                 progress: Optional[Callable[[str], None]] = None):
+        self.scale = scale
+        self.seed = seed
+        self.until = until or timezone.localdate()
+        self.batch_size = batch_size
+        self.password = password
+        self.progress = progress or (lambda message: None)
+        self.counts: Dict[str, int] = {}
+        self.rng = random.Random(seed)
+
+    @staticmethod
+    def exists() -> bool:
+        """Whether a previous run left generated rows behind."""
+        return User.objects.filter(username__startswith=USERNAME_PREFIX).exists()
+
+    @staticmethod
+    def clear() -> None:
+        """Delete every generated row, children first so SET_NULL never fires."""
+        with transaction.atomic():
+            requests = MaintenanceRequest.objects.filter(created_by__username__startswith=USERNAME_PREFIX)
+            # Stats of deleted equipment go with it; refresh the rest
+            equipment_ids = list(requests.filter(equipment__isnull=False).exclude(
+                equipment__serial_number__startswith=CODE_PREFIX,
+            ).values_list('equipment_id', flat=True).distinct())
+            requests.delete()
+            Equipment.objects.filter(serial_number__startswith=CODE_PREFIX).delete()
+            Team.objects.filter(description=TEAM_DESCRIPTION).delete()
+            WorkCenter.objects.filter(code__startswith=CODE_PREFIX).delete()
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        requests_changed.send(sender=MaintenanceRequest, pks=None, equipment_ids=equipment_ids)
+        DashboardMetrics.invalidate()
+
+    def generate(self) -> Dict[str, int]:
+        """
+        Generate the whole dataset.
+
+        Returns:
+            Number of rows written per model
+        """
+        self.rng = random.Random(self.seed)
+        self.counts = {}
+        with transaction.atomic():
+            companies = [f'Synthetic Company {n + 1}' for n in range(self.scale.companies)]
+            work_centers = self._work_centers()
+            teams = self._teams(companies, work_centers)
+            categories = self._categories()
+            technicians_by_team, staff = self._users(teams)
+            self._equipment_and_requests(companies, categories, teams, technicians_by_team, staff)
+        # bulk_create bypasses post_save, which indexes equipment and teams
+        for kind in BULK_INDEXED_KINDS:
+            SearchIndex.rebuild(kind, only_missing=True)
+        equipment_ids = Equipment.objects.filter(serial_number__startswith=CODE_PREFIX).values_list('pk', flat=True)
+        requests_changed.send(sender=MaintenanceRequest, pks=None, equipment_ids=list(equipment_ids))
+        DashboardMetrics.invalidate()
+        return self.counts
+
+    def _insert(self, model, objects: List) -> List:
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        label = model.__name__
+        self.counts[label] = self.counts.get(label, 0) + len(objects)
+        return objects
+
+    def _insert_backdated(self, model, objects: List, field: str) -> List:
+        """
+        Insert ``objects`` keeping the values they carry in an ``auto_now_add`` field.
+
+        ``bulk_create`` stamps those fields with the current time, which
+        would flatten exactly the orderings the list views sort on, so the
+        intended values are written back afterwards with ``bulk_update``, one
+        CASE statement per batch. Needs the inserted primary keys, which
+        PostgreSQL and SQLite return.
+        """
+        values = [getattr(obj, field) for obj in objects]
+        self._insert(model, objects)
+        for obj, value in zip(objects, values):
+            setattr(obj, field, value)
+        model.objects.bulk_update(objects, [field], batch_size=self.batch_size)
+        return objects
+
+    def _skewed_weights(self, count: int, exponent: float = 1.1) -> List[float]:
+        """Zipf-like weights: the first item is the most popular."""
+        return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+    def _work_centers(self) -> List[WorkCenter]:
+        rng = self.rng
+        return self._insert(WorkCenter, [
+            WorkCenter(
+                name=f'Work Center {n + 1:03d}',
+                code=f'{CODE_PREFIX}WC-{n + 1:04d}',
+                tag=rng.choice(['production', 'assembly', 'packaging', 'utilities', 'quality']),
+                cost_per_hour=round(rng.uniform(40, 250), 2),
+                capacity_efficiency=round(rng.uniform(70, 100), 2),
+                oee_target=round(rng.uniform(80, 95), 2),
+            )
+            for n in range(self.scale.work_centers)
+        ])
+
+    def _teams(self, companies: Sequence[str], work_centers: Sequence[WorkCenter]) -> List[Team]:
+        return self._insert(Team, [
+            Team(
+                name=f'{TEAM_SPECIALTIES[n % len(TEAM_SPECIALTIES)]} Team {n + 1:03d}',
+                description=TEAM_DESCRIPTION,
+                company=companies[n % len(companies)] if companies else None,
+                work_center=work_centers[n % len(work_centers)] if work_centers else None,
+            )
+            for n in range(self.scale.teams)
+        ])
+
+    def _categories(self) -> List[EquipmentCategory]:
+        """Reuse categories that already exist by name; create the rest."""
+        existing = {category.name: category for category in EquipmentCategory.objects.filter(name__in=CATEGORY_NAMES)}
+        missing = [EquipmentCategory(name=name) for name in CATEGORY_NAMES if name not in existing]
+        self._insert(EquipmentCategory, missing)
+        existing.update((category.name, category) for category in missing)
+        return [existing[name] for name in CATEGORY_NAMES]
+
+    def _users(self, teams: Sequence[Team]):
+        """
+        Create admins, managers and technicians with one shared password
+        hash; hashing once instead of per user keeps this step instant.
+        """
+        rng = self.rng
+        password = make_password(self.password)
+        users, roles = [], []
+        for n in range(self.scale.users):
+            role = 'admin' if n == 0 else 'manager' if n % 20 == 1 else 'technician'
+            users.append(User(
+                username=f'{USERNAME_PREFIX}{role}_{n + 1:05d}',
+                email=f'{role}{n + 1}@synthetic.gearguard.test',
+                password=password,
+                first_name=role.title(),
+                last_name=f'{n + 1:05d}',
+                is_staff=role == 'admin',
+                is_superuser=role == 'admin',
+            ))
+            roles.append(role)
+        self._insert(User, users)
+        if users and users[0].pk is None:
+            ids = dict(User.objects.filter(username__startswith=USERNAME_PREFIX).values_list('username', 'pk'))
+            for user in users:
+                user.pk = ids[user.username]
+
+        profiles, technicians_by_team = [], {team.pk: [] for team in teams}
+        for user, role in zip(users, roles):
+            team = rng.choice(teams) if teams and role == 'technician' else None
+            if team is not None:
+                technicians_by_team[team.pk].append(user)
+            profiles.append(UserProfile(
+                user=user,
+                full_name=f'{user.first_name} {user.last_name}',
+                email=user.email,
+                role=role,
+                team=team,
+                work_center_id=team.work_center_id if team else None,
+            ))
+        self._insert(UserProfile, profiles)
+        return technicians_by_team, users
+
+    def _equipment_and_requests(self, companies, categories, teams, technicians_by_team, staff) -> None:
+        """Insert equipment batch by batch, each followed by its request history."""
+        rng = self.rng
+        scale = self.scale
+        end = datetime.combine(self.until, dt_time(18, 0))
+        history = timedelta(days=365 * scale.years)
+        category_weights = self._skewed_weights(len(categories))
+        team_weights = self._skewed_weights(len(teams), 0.8)
+        mean_requests = scale.requests_per_equipment_year * scale.years
+
+        for start in range(0, scale.equipment, self.batch_size):
+            equipment = []
+            for n in range(start, min(start + self.batch_size, scale.equipment)):
+                category = rng.choices(categories, category_weights)[0]
+                team = rng.choices(teams, team_weights)[0] if teams else None
+                created = end - timedelta(seconds=rng.uniform(history.total_seconds(), history.total_seconds() * 1.5))
+                equipment.append(Equipment(
+                    name=f'{category.name} {n + 1:06d}',
+                    category=category,
+                    serial_number=f'{CODE_PREFIX}{n + 1:08d}',
+                    description=f'Generated {category.name.lower()} unit',
+                    company=companies[n % len(companies)] if companies else None,
+                    employee=rng.choice(staff) if staff and rng.random() < 0.6 else None,
+                    maintenance_team=team,
+                    work_center_id=team.work_center_id if team else None,
+                    assigned_date=created.date(),
+                    created_at=timezone.make_aware(created),
+                    status=rng.choices(['active', 'under_maintenance', 'scrapped'], [85, 10, 5])[0],
+                ))
+            self._insert_backdated(Equipment, equipment, 'created_at')
+
+            requests = []
+            for item in equipment:
+                # Pareto-distributed failure rates: most machines are quiet,
+                # a long tail breaks down constantly.
+                count = min(int(mean_requests * (rng.paretovariate(2.5) - 1) * 1.5), int(mean_requests * 20))
+                requests.extend(self._requests_for(item, count, end, history, technicians_by_team, staff))
+                if len(requests) >= self.batch_size:
+                    self._insert_backdated(MaintenanceRequest, requests, 'request_date')
+                    requests = []
+            if requests:
+                self._insert_backdated(MaintenanceRequest, requests, 'request_date')
+            self.progress(f'{min(start + self.batch_size, scale.equipment)}/{scale.equipment} equipment')
+
+    def _requests_for(self, item: Equipment, count: int, end: datetime, history: timedelta,
+                      technicians_by_team, staff) -> List[MaintenanceRequest]:
+        rng = self.rng
+        technicians = technicians_by_team.get(item.maintenance_team_id) or []
+        technician_weights = self._skewed_weights(len(technicians)) if technicians else None
+        requests = []
+        for _ in range(count):
+            age = timedelta(seconds=rng.triangular(0, history.total_seconds(), 0))
+            requested = end - age
+            scheduled = requested + timedelta(days=rng.randint(0, 14), hours=rng.randint(-4, 4))
+            if age < timedelta(days=30):
+                stage = rng.choices(['new', 'in_progress', 'repaired'], [50, 30, 20])[0]
+            else:
+                stage = rng.choices(['repaired', 'scrapped', 'new'], [93, 4, 3])[0]
+            for_work_center = rng.random() < 0.1
+            requests.append(MaintenanceRequest(
+                subject=f'{rng.choice(SUBJECTS)} - {item.name}',
+                maintenance_for='work_center' if for_work_center else 'equipment',
+                equipment=None if for_work_center else item,
+                work_center_id=item.work_center_id if for_work_center else None,
+                created_by=rng.choice(staff) if staff else None,
+                technician=rng.choices(technicians, technician_weights)[0] if technicians else None,
+                team_id=item.maintenance_team_id,
+                request_date=requested.date(),
+                scheduled_date=timezone.make_aware(scheduled),
+                duration=timedelta(minutes=15 * max(1, round(rng.lognormvariate(1.4, 0.7)))),
+                maintenance_type=rng.choices(['corrective', 'preventive'], [70, 30])[0],
+                priority=rng.choices([1, 2, 3], [50, 35, 15])[0],
+                stage=stage,
+            ))
+        return requests
@@ -1,3 +1,493 @@
-from django.test import TestCase
+import base64
+import io
+import json
+from datetime import datetime, timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.metrics import DashboardMetrics
+from equipment.forms import EquipmentFilterForm
+from equipment.metrics import EquipmentMetrics
+from equipment.models import Equipment, EquipmentStats
+from equipment.views import LIST_FIELDS as EQUIPMENT_LIST_FIELDS, HISTORY_ORDERING
+from gearguard.utils.json_stream import JSONSectionStream
+from gearguard.utils.pagination import InvalidCursor, KeysetPaginator
+from search.index import SearchQuery
+from search.models import SearchEntry
+from teams.models import Team, WorkCenter
+from teams.reporting import WorkCenterReport
+from .benchmark import SCENARIOS, ViewBenchmark, benchmark_fixtures
+from .calendar import calendar_events, default_window
+from .export import export_rows
+from .forms import MaintenanceExportForm, PreventiveScheduleForm
+from .models import MaintenanceRequest, PreventiveSchedule
+from .recurrence import occurrence
+from .synthetic import SyntheticDataGenerator, SyntheticScale
+from .views import LIST_ORDERING
+from .workload import sweep
+
+
+def _cursor(values):
+    """Encode ``values`` the way KeysetPaginator.encode_cursor does, valid or not."""
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+class KeysetPaginatorTests(TestCase):
+    ordering = ('-request_date', '-id')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planner', password='Planner@123456')
+        cls.requests = [
+            MaintenanceRequest.objects.create(subject=f'Request {n}', created_by=cls.user) for n in range(7)
+        ]
+
+    def paginator(self, per_page=3):
+        return KeysetPaginator(MaintenanceRequest.objects.all(), self.ordering, per_page)
+
+    def test_pages_forward_and_back_without_gaps(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        newest_first = [r.pk for r in reversed(self.requests)]
+        self.assertEqual([r.pk for r in first] + [r.pk for r in second] + [r.pk for r in third], newest_first)
+        self.assertTrue(first.has_next)
+        self.assertFalse(first.has_previous)
+        self.assertFalse(third.has_next)
+
+        back = paginator.page(third.previous_cursor, 'prev')
+        self.assertEqual([r.pk for r in back], [r.pk for r in second])
+        self.assertTrue(back.has_previous)
+
+    def test_cursor_round_trip(self):
+        paginator = self.paginator()
+        obj = self.requests[3]
+        self.assertEqual(paginator.decode_cursor(paginator.encode_cursor(obj)), [obj.request_date, obj.pk])
+
+    def test_invalid_cursors(self):
+        paginator = self.paginator()
+        cursors = {
+            'not base64': '%%%',
+            'not json': base64.urlsafe_b64encode(b'{oops').decode(),
+            'not a list': _cursor({'id': 1}),
+            'too short': _cursor(['2024-01-01']),
+            'too long': _cursor(['2024-01-01', 1, 2]),
+            'wrong types': _cursor([5, 1]),
+            'unparseable date': _cursor(['yesterday', 1]),
+            'null value': _cursor(['2024-01-01', None]),
+            'empty value': _cursor(['', 1]),
+        }
+        for shape, cursor in cursors.items():
+            with self.subTest(shape):
+                with self.assertRaises(InvalidCursor):
+                    paginator.page(cursor)
+
+    def test_views_survive_crafted_cursors(self):
+        self.client.force_login(self.user)
+        for cursor in (_cursor([5, 1]), _cursor(['2024-01-01', None])):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('maintenance_list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(reverse('equipment:equipment_list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(reverse('maintenance_kanban_column', args=['new']), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+
+
+class MaintenanceMoveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planner', password='Planner@123456')
+        cls.request = MaintenanceRequest.objects.create(subject='Leaking valve', created_by=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('maintenance_move', args=[self.request.pk])
+
+    def move(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type='application/json')
+
+    def test_moves_card(self):
+        response = self.move({'from_stage': 'new', 'to_stage': 'in_progress'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'id': self.request.pk, 'stage': 'in_progress'})
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.stage, 'in_progress')
+
+    def test_stale_stage_is_a_conflict(self):
+        MaintenanceRequest.objects.filter(pk=self.request.pk).update(stage='repaired')
+        response = self.move({'from_stage': 'new', 'to_stage': 'in_progress'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['stage'], 'repaired')
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.stage, 'repaired')
+
+    def test_missing_request(self):
+        url = reverse('maintenance_move', args=[self.request.pk + 1000])
+        response = self.client.post(url, json.dumps({'from_stage': 'new', 'to_stage': 'repaired'}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_payloads(self):
+        payloads = [[], 'x', 3, None, {'from_stage': []}, {'from_stage': 'new', 'to_stage': {}},
+                    {'from_stage': 'new', 'to_stage': 'done'}]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(self.move(payload).status_code, 400)
+        response = self.client.post(self.url, '{oops', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SyntheticDataTests(TestCase):
+
+    def test_generated_rows_are_searchable(self):
+        scale = SyntheticScale(companies=2, work_centers=2, teams=3, users=10, equipment=40, years=0.5)
+        SyntheticDataGenerator(scale, seed=7, batch_size=15).generate()
+
+        for kind, model in (('equipment', Equipment), ('team', Team), ('request', MaintenanceRequest)):
+            with self.subTest(kind):
+                self.assertEqual(SearchEntry.objects.filter(kind=kind).count(), model.objects.count())
+        item = Equipment.objects.order_by('pk').last()
+        results = SearchQuery(item.name, kind='equipment').page()
+        self.assertIn(item.pk, [entry.object_id for entry in results.entries])
+
+
+def _list_page():
+    list(MaintenanceRequest.objects.select_related('equipment', 'work_center').order_by(*LIST_ORDERING)[:26])
+
+
+def _dashboard_metrics():
+    DashboardMetrics.compute()
+
+
+def _kanban_column():
+    list(MaintenanceRequest.objects.filter(stage='repaired').order_by(*LIST_ORDERING)[:21])
+
+
+def _team_board():
+    list(MaintenanceRequest.objects.filter(team_id=1, stage='new').order_by('scheduled_date')[:26])
+
+
+def _technician_workload():
+    list(MaintenanceRequest.objects.filter(
+        technician_id=1, stage__in=MaintenanceRequest.OPEN_STAGES
+    ).order_by('scheduled_date'))
+
+
+def _calendar_window():
+    start, end = default_window()
+    calendar_events(start, end)
+
+
+def _equipment_list():
+    queryset = Equipment.objects.select_related('category').only(*EQUIPMENT_LIST_FIELDS)
+    list(queryset.order_by(*EquipmentFilterForm.SORT_ORDERINGS[EquipmentFilterForm.DEFAULT_SORT])[:26])
+
+
+def _equipment_list_by_status():
+    queryset = Equipment.objects.select_related('category').only(*EQUIPMENT_LIST_FIELDS)
+    list(queryset.filter(status='active').order_by(*EquipmentFilterForm.SORT_ORDERINGS['name'])[:26])
+
+
+def _critical_equipment():
+    list(Equipment.objects.only(*EQUIPMENT_LIST_FIELDS).filter(
+        health_score__lt=Equipment.CRITICAL_HEALTH
+    ).order_by(*EquipmentFilterForm.SORT_ORDERINGS['health'])[:26])
+
+
+def _equipment_history():
+    list(MaintenanceRequest.objects.filter(equipment_id=1).order_by(*HISTORY_ORDERING)[:11])
+
+
+def _equipment_stats():
+    EquipmentMetrics.compute([1])
+
+
+def _work_center_rollup():
+    start = default_window()[0].date().replace(day=1)
+    WorkCenterReport.compute(start, start.replace(year=start.year + 1))
+
+
+def _export_date_range():
+    form = MaintenanceExportForm({'start': '2024-01-01', 'end': '2024-01-31'})
+    form.is_valid()
+    next(export_rows(form.filter(MaintenanceRequest.objects.all()), chunk_size=100), None)
+
+
+# (label, query runner, acceptable index names per vendor). SQLite cannot use
+# a partial index whose predicate is compared against bound parameters, so the
+# technician check accepts the plain FK index there.
+PLAN_CHECKS = [
+    ('maintenance list', _list_page, {'*': ['mr_request_date_id_idx']}),
+    ('dashboard metrics', _dashboard_metrics, {'*': ['mr_stage_sched_idx', 'mr_stage_request_date_idx']}),
+    ('kanban column', _kanban_column, {'*': ['mr_stage_request_date_idx']}),
+    ('team board', _team_board, {'*': ['mr_team_stage_sched_idx']}),
+    ('technician workload', _technician_workload, {
+        'postgresql': ['mr_tech_open_sched_idx'],
+        'sqlite': ['mr_tech_open_sched_idx', 'technician_id'],
+    }),
+    ('calendar window', _calendar_window, {'*': ['mr_scheduled_date_idx']}),
+    ('equipment list', _equipment_list, {'*': ['eq_name_id_idx']}),
+    ('equipment list by status', _equipment_list_by_status, {'*': ['eq_status_name_idx']}),
+    ('critical equipment', _critical_equipment, {'*': ['eq_health_id_idx']}),
+    ('equipment history', _equipment_history, {'*': ['mr_equipment_history_idx']}),
+    ('equipment stats', _equipment_stats, {'*': ['mr_equipment_history_idx', 'equipment_id']}),
+    ('export date range', _export_date_range, {'*': ['mr_request_date_id_idx']}),
+    ('work center rollup', _work_center_rollup, {'*': ['mr_scheduled_date_idx']}),
+]
+
+
+class QueryPlanTests(TestCase):
+    """The hot list, board and dashboard queries are planned on their indexes."""
+
+    def explain(self, runner):
+        """Run ``runner``, capture its SQL and return the database's plan for it."""
+        captured = []
+
+        def capture(execute, sql, params, many, context):
+            captured.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Empty test tables would otherwise always be sequentially
+                # scanned; this asks whether an index *can* serve the query.
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            with connection.execute_wrapper(capture):
+                runner()
+
+            prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+            lines = []
+            with connection.cursor() as cursor:
+                for sql, params in captured:
+                    cursor.execute(prefix + sql, params)
+                    lines.extend(str(row[-1]) for row in cursor.fetchall())
+        return '\n'.join(lines)
+
+    def test_hot_queries_use_their_indexes(self):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'postgresql'):
+            self.skipTest(f'Query plan checks support SQLite and PostgreSQL, not {vendor}')
+        for label, runner, expected in PLAN_CHECKS:
+            with self.subTest(label):
+                plan = self.explain(runner)
+                wanted = expected.get(vendor, expected.get('*', []))
+                self.assertTrue(
+                    any(name in plan for name in wanted),
+                    f'{label}: expected one of {", ".join(wanted)} in\n{plan}',
+                )
+
+
+class RecurrenceTests(SimpleTestCase):
+    start = datetime(2024, 1, 31, 8, 30)
+
+    def test_fixed_steps(self):
+        self.assertEqual(occurrence(self.start, 'daily', 3, 2), datetime(2024, 2, 6, 8, 30))
+        self.assertEqual(occurrence(self.start, 'weekly', 2, 1), datetime(2024, 2, 14, 8, 30))
+        self.assertEqual(occurrence(self.start, 'daily', 0, 4), datetime(2024, 2, 4, 8, 30))
+
+    def test_months_clamp_without_drifting(self):
+        months = [occurrence(self.start, 'monthly', 1, index) for index in range(4)]
+        self.assertEqual([m.date().isoformat() for m in months],
+                         ['2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30'])
+        self.assertEqual(occurrence(self.start, 'monthly', 13, 1), datetime(2025, 2, 28, 8, 30))
+
+    def test_years_from_leap_day(self):
+        leap_day = datetime(2024, 2, 29)
+        self.assertEqual(occurrence(leap_day, 'yearly', 1, 1), datetime(2025, 2, 28))
+        self.assertEqual(occurrence(leap_day, 'yearly', 1, 4), datetime(2028, 2, 29))
+
+    def test_unknown_frequency(self):
+        with self.assertRaises(ValueError):
+            occurrence(self.start, 'hourly', 1, 1)
+
+
+class SweepTests(SimpleTestCase):
+
+    def test_empty(self):
+        self.assertEqual(sweep([]), (0.0, 0))
+
+    def test_disjoint_intervals(self):
+        self.assertEqual(sweep([(0, 2), (3, 4)]), (3.0, 1))
+
+    def test_touching_intervals_do_not_overlap(self):
+        self.assertEqual(sweep([(0, 2), (2, 5)]), (5.0, 1))
+
+    def test_overlaps_count_once(self):
+        # (0, 10) contains both others; at 3.5 all three are open
+        self.assertEqual(sweep([(0, 10), (2, 4), (3, 12), (20, 21)]), (13.0, 3))
+
+    def test_peak_after_earlier_bookings_end(self):
+        self.assertEqual(sweep([(0, 1), (0, 1), (5, 8), (6, 9), (7, 10)]), (6.0, 3))
+
+
+class JSONSectionStreamTests(SimpleTestCase):
+    document = {
+        'users': [{'username': 'ana', 'bio': 'x' * 40}, {'username': 'bo\u00ebl', 'tags': ['a', 'b']}],
+        'settings': {'mode': 'bulk'},
+        'empty': [],
+        'numbers': [1234567, -0.5, 1e10, True, None],
+    }
+    expected = [
+        ('users', {'username': 'ana', 'bio': 'x' * 40}),
+        ('users', {'username': 'bo\u00ebl', 'tags': ['a', 'b']}),
+        ('settings', {'mode': 'bulk'}),
+        ('numbers', 1234567), ('numbers', -0.5), ('numbers', 1e10), ('numbers', True), ('numbers', None),
+    ]
+
+    def read(self, text, chunk_size):
+        return list(JSONSectionStream(io.StringIO(text), chunk_size=chunk_size))
+
+    def test_every_chunk_boundary(self):
+        # Chunks of one character upwards split every token somewhere,
+        # including numbers that end exactly at a chunk edge
+        for text in (json.dumps(self.document), json.dumps(self.document, indent=2)):
+            for chunk_size in range(1, 24):
+                with self.subTest(chunk_size=chunk_size, indented='\n' in text):
+                    self.assertEqual(self.read(text, chunk_size), self.expected)
+
+    def test_trailing_number_at_end_of_file(self):
+        self.assertEqual(self.read('{"n": [12345]}', 5), [('n', 12345)])
+
+    def test_empty_object(self):
+        self.assertEqual(self.read(' { } ', 1), [])
+
+    def test_malformed(self):
+        for text in ('[]', '{"users": [1, 2}', '{"users": [1', '{1: []}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.read(text, 3)
+
+
+class PreventiveScheduleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.pump = Equipment.objects.create(name='Pump', serial_number='P-1')
+
+    def schedule(self, start, **kwargs):
+        return PreventiveSchedule.objects.create(
+            name='Daily pump check', equipment=self.pump, start_date=start, **{'frequency': 'daily', **kwargs}
+        )
+
+    def generate(self, *args):
+        out = io.StringIO()
+        call_command('generate_preventive_requests', '--horizon', '10', *args, stdout=out)
+        return out.getvalue()
+
+    def test_past_start_begins_today(self):
+        schedule = self.schedule(timezone.now() - timedelta(days=730))
+        output = self.generate()
+
+        dates = MaintenanceRequest.objects.filter(schedule=schedule).values_list('scheduled_date', flat=True)
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.assertEqual(len(dates), 11)
+        self.assertTrue(all(date >= today for date in dates))
+        self.assertIn('Created 11 occurrence(s)', output)
+
+    def test_backfill_creates_past_occurrences(self):
+        schedule = self.schedule(timezone.now() - timedelta(days=20))
+        self.generate('--backfill')
+        self.assertEqual(MaintenanceRequest.objects.filter(schedule=schedule).count(), 31)
+
+    def test_counts_only_inserted_rows(self):
+        schedule = self.schedule(timezone.now() + timedelta(hours=1))
+        self.assertIn('Created 10 occurrence(s)', self.generate())
+        # Replay the same occurrences, as after a crash before the cursor moved
+        PreventiveSchedule.objects.filter(pk=schedule.pk).update(
+            occurrence_index=0, next_occurrence=schedule.start_date,
+        )
+        self.assertIn('Created 0 occurrence(s)', self.generate())
+        self.assertEqual(MaintenanceRequest.objects.filter(schedule=schedule).count(), 10)
+
+    def test_refreshes_only_scheduled_equipment_stats(self):
+        idle = Equipment.objects.create(name='Idle lathe', serial_number='L-1')
+        self.schedule(timezone.now() + timedelta(hours=1))
+        self.generate()
+        self.assertEqual(EquipmentStats.objects.get(equipment=self.pump).request_count, 10)
+        # A full rebuild would have written a row of zeros for it
+        self.assertFalse(EquipmentStats.objects.filter(equipment=idle).exists())
+
+    def test_changing_the_recurrence_restarts_generation(self):
+        start = timezone.now() + timedelta(days=1)
+        schedule = self.schedule(start)
+        self.generate()
+        schedule.refresh_from_db()
+        self.assertGreater(schedule.occurrence_index, 0)
+
+        schedule.start_date = start + timedelta(days=30)
+        schedule.save()
+        schedule.refresh_from_db()
+        self.assertEqual((schedule.occurrence_index, schedule.next_occurrence), (0, start + timedelta(days=30)))
+
+        schedule.name = 'Renamed'
+        schedule.next_occurrence = start + timedelta(days=31)
+        schedule.save()
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.next_occurrence, start + timedelta(days=31))
+
+    def test_form_requires_the_target(self):
+        data = {
+            'name': 'Weekly check', 'maintenance_for': 'work_center', 'equipment': self.pump.pk,
+            'frequency': 'weekly', 'interval': 0, 'start_date': '2030-01-01 08:00', 'priority': 2,
+            'is_active': True,
+        }
+        form = PreventiveScheduleForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'work_center', 'interval'})
+
+        form = PreventiveScheduleForm({**data, 'maintenance_for': 'equipment', 'interval': 2})
+        self.assertTrue(form.is_valid(), form.errors)
+        schedule = form.save()
+        self.assertEqual(schedule.next_occurrence, schedule.start_date)
+
+    def test_durations_stay_within_the_calendar_bound(self):
+        data = {
+            'name': 'Overhaul', 'maintenance_for': 'equipment', 'equipment': self.pump.pk,
+            'frequency': 'yearly', 'interval': 1, 'start_date': '2030-01-01 08:00',
+            'duration': '60 00:00:00', 'priority': 2, 'is_active': True,
+        }
+        form = PreventiveScheduleForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'duration'})
+
+        # A schedule saved without validation is clamped when it generates
+        start = timezone.now() + timedelta(hours=1)
+        self.schedule(start, frequency='yearly', duration=timedelta(days=60))
+        self.generate()
+        request = MaintenanceRequest.objects.get()
+        self.assertEqual(request.duration, MaintenanceRequest.MAX_DURATION)
+        window_start = start + timedelta(days=40)
+        events = calendar_events(window_start, window_start + timedelta(days=1))
+        self.assertEqual([event['id'] for event in events], [request.pk])
+
+
+class ViewBenchmarkTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'Admin@123456')
+        team = Team.objects.create(name='Mechanics')
+        Equipment.objects.create(name='Lathe', serial_number='L-1', maintenance_team=team)
+        WorkCenter.objects.create(name='Assembly', code='ASM')
+        MaintenanceRequest.objects.create(subject='Oil change', created_by=user, team=team)
+
+    def test_runs_on_a_private_cache(self):
+        cache.set('deployment', 'kept', None)
+        scenarios = [s for s in SCENARIOS if s.name in ('dashboard', 'maintenance_create_post')]
+        results = ViewBenchmark(repeat=1, scenarios=scenarios).run(benchmark_fixtures())
+
+        self.assertTrue(all(result['ok'] for result in results.values()), results)
+        self.assertEqual(cache.get('deployment'), 'kept')
+        self.assertEqual(MaintenanceRequest.objects.count(), 1)
@@ -4,5 +4,13 @@ from . import views
 urlpatterns = [
     path('', views.maintenance_list, name='maintenance_list'),
     path('new/', views.maintenance_create, name='maintenance_create'),
+    path('export/<str:fmt>/', views.maintenance_export, name='maintenance_export'),
     path('<int:pk>/edit/', views.maintenance_edit, name='maintenance_edit'),
+    path('<int:pk>/move/', views.maintenance_move, name='maintenance_move'),
+    path('calendar/', views.maintenance_calendar, name='maintenance_calendar'),
+    path('calendar/feed/', views.maintenance_calendar_feed, name='maintenance_calendar_feed'),
+    path('workload/', views.maintenance_workload, name='maintenance_workload'),
+    path('workload/suggest/', views.maintenance_suggest_technician, name='maintenance_suggest_technician'),
+    path('kanban/', views.maintenance_kanban, name='maintenance_kanban'),
+    path('kanban/<str:stage>/', views.maintenance_kanban_column, name='maintenance_kanban_column'),
 ]
@@ -1,14 +1,84 @@
+import json
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.conf import settings
+from django.db.models import Count
+from django.core.cache import cache
+from django.http import HttpResponseBadRequest, JsonResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_POST, condition
+from dashboard.metrics import DashboardMetrics
+from gearguard.routers import use_replica
+from gearguard.utils.pagination import KeysetPaginator, InvalidCursor
 from .models import MaintenanceRequest
-from .forms import MaintenanceRequestForm
+from .forms import MaintenanceRequestForm, MaintenanceFilterForm, MaintenanceExportForm
+from .signals import requests_changed
+from .calendar import calendar_events, default_window, feed_etag, feed_params, parse_bound
+from .workload import Workload
+from .assignment import AutoAssigner
+from .export import FORMATS, RENDERERS, export_rows
+
+LIST_ORDERING = ('-request_date', '-id')
+STAGES = dict(MaintenanceRequest.STAGE_CHOICES)
+CALENDAR_CACHE_TIMEOUT = settings.CACHE_TTLS['calendar']  # entries are keyed on the data version anyway
+KANBAN_CARD_FIELDS = (
+    'id', 'subject', 'priority', 'request_date', 'scheduled_date', 'maintenance_for',
+    'equipment__name', 'work_center__name', 'technician__username',
+)
+
 
 @login_required
+@use_replica
 def maintenance_list(request):
-    """View to list all maintenance requests."""
-    items = MaintenanceRequest.objects.all().order_by('-request_date')
-    return render(request, 'maintenance/list_fixed.html', {'requests': items})
+    """View to list maintenance requests one keyset page at a time."""
+    filter_form = MaintenanceFilterForm(request.GET)
+    queryset = filter_form.filter(
+        MaintenanceRequest.objects.select_related('equipment', 'work_center')
+    )
+    paginator = KeysetPaginator(queryset, LIST_ORDERING, request.GET.get('per_page'))
+    try:
+        page = paginator.page(request.GET.get('cursor'), request.GET.get('direction', 'next'))
+    except InvalidCursor:
+        page = paginator.page()
+
+    # Filters (minus the cursor) are carried over into the pager links
+    query = request.GET.copy()
+    for key in ('cursor', 'direction'):
+        query.pop(key, None)
+
+    context = {
+        'requests': page,
+        'page': page,
+        'filter_form': filter_form,
+        'filter_query': query.urlencode(),
+        'metrics': DashboardMetrics.get(),
+    }
+    return render(request, 'maintenance/list_fixed.html', context)
+
+
+@login_required
+@use_replica
+def maintenance_export(request, fmt):
+    """
+    Stream the requests matching the list filters plus ``?start=&end=``
+    (request date, inclusive) and ``?company=`` as CSV or JSON.
+    """
+    if fmt not in FORMATS:
+        raise Http404('Unknown export format.')
+    form = MaintenanceExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(
+            '; '.join(f'{field}: {error}' for field, errors in form.errors.items() for error in errors)
+        )
+    rows = export_rows(form.filter(MaintenanceRequest.objects.all()))
+    response = StreamingHttpResponse(RENDERERS[fmt](rows), content_type=FORMATS[fmt])
+    filename = f'maintenance-requests-{timezone.localdate():%Y%m%d}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
 @login_required
 def maintenance_create(request):
@@ -18,6 +88,7 @@ def maintenance_create(request):
         if form.is_valid():
             maintenance_request = form.save(commit=False)
             maintenance_request.created_by = request.user
+            AutoAssigner().assign(maintenance_request)
             maintenance_request.save()
             messages.success(request, 'Maintenance request created successfully.')
             return redirect('maintenance_list')
@@ -27,7 +98,12 @@ def maintenance_create(request):
                     messages.error(request, f'{field}: {error}')
     else:
         form = MaintenanceRequestForm()
-    return render(request, 'maintenance/form.html', {'form': form, 'title': 'New Maintenance Request'})
+    context = {
+        'form': form,
+        'title': 'New Maintenance Request',
+        'suggestion': Workload.get(*default_window()).least_loaded(),
+    }
+    return render(request, 'maintenance/form.html', context)
 
 @login_required
 def maintenance_edit(request, pk):
@@ -46,3 +122,162 @@ def maintenance_edit(request, pk):
     else:
         form = MaintenanceRequestForm(instance=obj)
     return render(request, 'maintenance/form.html', {'form': form, 'title': 'Edit Request'})
+
+
+@login_required
+def maintenance_kanban(request):
+    """Render the stage board shell; columns load their cards lazily."""
+    counts = dict(
+        MaintenanceRequest.objects.values_list('stage').annotate(total=Count('id')).order_by()
+    )
+    columns = [
+        {'stage': stage, 'label': label, 'count': counts.get(stage, 0)}
+        for stage, label in MaintenanceRequest.STAGE_CHOICES
+    ]
+    return render(request, 'maintenance/kanban.html', {'columns': columns})
+
+
+@login_required
+def maintenance_kanban_column(request, stage):
+    """Return one keyset page of cards for a kanban column as JSON."""
+    if stage not in STAGES:
+        raise Http404('Unknown stage')
+
+    queryset = MaintenanceRequest.objects.filter(stage=stage).values(*KANBAN_CARD_FIELDS)
+    paginator = KeysetPaginator(queryset, LIST_ORDERING, request.GET.get('per_page', 20))
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+
+    priorities = dict(MaintenanceRequest.PRIORITY_CHOICES)
+    cards = [
+        {
+            'id': row['id'],
+            'subject': row['subject'],
+            'priority': row['priority'],
+            'priority_label': priorities.get(row['priority'], ''),
+            'target': row['equipment__name'] if row['maintenance_for'] == 'equipment' else row['work_center__name'],
+            'technician': row['technician__username'],
+            'request_date': row['request_date'],
+            'scheduled_date': row['scheduled_date'],
+            'edit_url': reverse('maintenance_edit', args=[row['id']]),
+            'move_url': reverse('maintenance_move', args=[row['id']]),
+        }
+        for row in page
+    ]
+    return JsonResponse({
+        'stage': stage,
+        'cards': cards,
+        'next_cursor': page.next_cursor if page.has_next else None,
+    })
+
+
+@login_required
+@require_POST
+def maintenance_move(request, pk):
+    """
+    Move a request to another stage with a single conditional UPDATE.
+
+    The client sends the stage it last saw; if someone else moved the card
+    in the meantime no row matches and the current stage is returned with a
+    409 so the board can reconcile instead of silently overwriting.
+    """
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': 'Expected a JSON object.'}, status=400)
+    from_stage = payload.get('from_stage')
+    to_stage = payload.get('to_stage')
+    if not isinstance(from_stage, str) or not isinstance(to_stage, str):
+        return JsonResponse({'error': 'Unknown stage.'}, status=400)
+    if from_stage not in STAGES or to_stage not in STAGES:
+        return JsonResponse({'error': 'Unknown stage.'}, status=400)
+    if from_stage == to_stage:
+        return JsonResponse({'id': pk, 'stage': to_stage})
+
+    updated = MaintenanceRequest.objects.filter(pk=pk, stage=from_stage).update(stage=to_stage)
+    if not updated:
+        current = MaintenanceRequest.objects.filter(pk=pk).values_list('stage', flat=True).first()
+        if current is None:
+            return JsonResponse({'error': 'Request not found.'}, status=404)
+        return JsonResponse(
+            {'error': 'Request was moved by someone else.', 'id': pk, 'stage': current},
+            status=409,
+        )
+
+    requests_changed.send(sender=MaintenanceRequest, pks=[pk])
+    return JsonResponse({'id': pk, 'stage': to_stage})
+
+
+@login_required
+def maintenance_calendar(request):
+    """Render the maintenance calendar; events come from the JSON feed."""
+    return render(request, 'maintenance/calendar.html')
+
+
+def _calendar_feed_etag(request):
+    return feed_etag(*feed_params(request.GET))
+
+
+@login_required
+@condition(etag_func=_calendar_feed_etag)
+def maintenance_calendar_feed(request):
+    """
+    Return the requests scheduled within ``?start=&end=`` as JSON.
+
+    Unchanged windows are answered with 304 by the ETag check before this
+    body runs; other clients asking for the same window share the cached
+    payload instead of re-running the range query.
+    """
+    start, end, team_id, technician_id = feed_params(request.GET)
+    cache_key = f'calendar:feed:{feed_etag(start, end, team_id, technician_id)}'
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = {
+            'start': start,
+            'end': end,
+            'events': calendar_events(start, end, team_id, technician_id),
+        }
+        cache.set(cache_key, payload, CALENDAR_CACHE_TIMEOUT)
+
+    response = JsonResponse(payload)
+    # Let browsers keep the body but always revalidate it with If-None-Match
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+@use_replica
+def maintenance_workload(request):
+    """Booked hours and utilisation per technician and team over a window (default: this week)."""
+    start, end, _, _ = feed_params(request.GET)
+    span = end - start
+    return render(request, 'maintenance/workload.html', {
+        'report': Workload.get(start, end),
+        'previous_window': f'start={(start - span).isoformat()}&end={start.isoformat()}',
+        'next_window': f'start={end.isoformat()}&end={(end + span).isoformat()}',
+    })
+
+
+@login_required
+def maintenance_suggest_technician(request):
+    """
+    Suggest the least loaded technician for ``?date=`` (default: now),
+    optionally within ``?team=``, based on that date's week.
+    """
+    when = parse_bound(request.GET.get('date')) or timezone.now()
+    team_id = request.GET.get('team')
+    report = Workload.get(*default_window(timezone.localdate(when)))
+    suggestion = report.least_loaded(int(team_id) if team_id and team_id.isdigit() else None)
+    if suggestion is None:
+        return JsonResponse({'technician': None})
+    return JsonResponse({
+        'technician': suggestion.technician_id,
+        'username': suggestion.username,
+        'utilisation': suggestion.utilisation,
+        'booked_hours': suggestion.booked_hours,
+    })
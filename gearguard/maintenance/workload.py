@@ -0,0 +1,231 @@
+"""
+Technician and team utilisation.
+
+Booked time is derived from the scheduled intervals of the requests that
+overlap a window (``[scheduled_date, scheduled_date + duration)``, clipped to
+the window). A technician double-booked on two overlapping requests is busy
+once, not twice, so each technician's intervals are merged with a single
+sweep over them in start order; the same sweep records the peak number of
+simultaneous bookings. Reports are cached per window under the maintenance
+data version, so any request write invalidates them.
+"""
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from gearguard.utils.cache_versions import CacheVersion
+from teams.models import Team
+from .calendar import overlapping_requests
+from .signals import VERSION_NAMESPACE
+
+
+def sweep(intervals: Iterable[Tuple[float, float]]) -> Tuple[float, int]:
+    """
+    Merge intervals and measure their overlap in one pass.
+
+    Args:
+        intervals: ``(start, end)`` pairs sorted by start
+
+    Returns:
+        ``(covered, peak)``: total length covered by the union of the
+        intervals and the largest number of them open at the same time
+    """
+    covered = 0.0
+    peak = 0
+    run_start = run_end = None
+    open_ends: List[float] = []
+    for start, end in intervals:
+        while open_ends and open_ends[0] <= start:
+            heapq.heappop(open_ends)
+        heapq.heappush(open_ends, end)
+        peak = max(peak, len(open_ends))
+
+        if run_end is None or start > run_end:
+            if run_end is not None:
+                covered += run_end - run_start
+            run_start, run_end = start, end
+        else:
+            run_end = max(run_end, end)
+    if run_end is not None:
+        covered += run_end - run_start
+    return covered, peak
+
+
+@dataclass
+class TechnicianLoad:
+    """Booked time of one technician over a window."""
+
+    technician_id: int
+    username: str
+    team_id: Optional[int]
+    capacity_hours: float
+    booked_hours: float = 0.0
+    requests: int = 0
+    peak_overlap: int = 0
+
+    @property
+    def utilisation(self) -> float:
+        """Booked share of working capacity, in percent (may exceed 100)."""
+        return round(100 * self.booked_hours / self.capacity_hours, 1) if self.capacity_hours else 0.0
+
+
+@dataclass
+class TeamLoad:
+    """Booked time of a team's requests against its members' capacity."""
+
+    team_id: int
+    name: str
+    capacity_hours: float = 0.0
+    booked_hours: float = 0.0
+    requests: int = 0
+    members: int = 0
+
+    @property
+    def utilisation(self) -> float:
+        return round(100 * self.booked_hours / self.capacity_hours, 1) if self.capacity_hours else 0.0
+
+
+@dataclass
+class WorkloadReport:
+    """Utilisation of every technician and team over ``[start, end)``."""
+
+    start: datetime
+    end: datetime
+    technicians: List[TechnicianLoad] = field(default_factory=list)
+    teams: List[TeamLoad] = field(default_factory=list)
+    unassigned_requests: int = 0
+
+    @property
+    def utilisation(self) -> float:
+        """Fleet-wide utilisation of technicians, in percent."""
+        capacity = sum(load.capacity_hours for load in self.technicians)
+        booked = sum(load.booked_hours for load in self.technicians)
+        return round(100 * booked / capacity, 1) if capacity else 0.0
+
+    def least_loaded(self, team_id: Optional[int] = None) -> Optional[TechnicianLoad]:
+        """
+        The technician with the lowest utilisation, optionally among the
+        members of one team; ties go to the fewest requests, then username.
+        """
+        candidates = [
+            load for load in self.technicians
+            if load.capacity_hours and (team_id is None or load.team_id == team_id)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda load: (load.utilisation, load.requests, load.username))
+
+
+class Workload:
+    """
+    Compute and cache :class:`WorkloadReport` objects per window.
+    """
+
+    CACHE_TIMEOUT = settings.CACHE_TTLS['workload']  # keys embed the data version; this bounds role changes
+    WORKDAY_HOURS = 8
+    # Requests without a duration still take a technician's time
+    DEFAULT_DURATION = timedelta(hours=1)
+
+    @classmethod
+    def get(cls, start: datetime, end: datetime) -> WorkloadReport:
+        """
+        Return the report of ``[start, end)``, computing it on a cache miss.
+        """
+        version = CacheVersion.get(VERSION_NAMESPACE)
+        key = f'workload:{version}:{int(start.timestamp())}:{int(end.timestamp())}'
+        report = cache.get(key)
+        if report is None:
+            report = cls.compute(start, end)
+            cache.set(key, report, cls.CACHE_TIMEOUT)
+        return report
+
+    @classmethod
+    def capacity_hours(cls, start: datetime, end: datetime) -> float:
+        """Working hours of one technician in the window (weekdays only)."""
+        first = timezone.localtime(start).date()
+        last = timezone.localtime(end - timedelta(microseconds=1)).date()
+        weekdays = sum((first + timedelta(days=offset)).weekday() < 5 for offset in range((last - first).days + 1))
+        return float(weekdays * cls.WORKDAY_HOURS)
+
+    @classmethod
+    def compute(cls, start: datetime, end: datetime) -> WorkloadReport:
+        """
+        Build the report with one query for the requests in the window and
+        one each for technicians and teams.
+        """
+        capacity = cls.capacity_hours(start, end)
+        window_start, window_end = start.timestamp(), end.timestamp()
+
+        # Intervals clipped to the window, grouped per technician and per
+        # (team, technician) so team time is the sum of its people's time
+        by_technician: Dict[int, List[Tuple[float, float]]] = defaultdict(list)
+        by_team: Dict[int, Dict[Optional[int], List[Tuple[float, float]]]] = defaultdict(lambda: defaultdict(list))
+        team_requests: Dict[int, int] = defaultdict(int)
+        unassigned = 0
+        rows = overlapping_requests(start, end).exclude(stage='scrapped').values_list(
+            'technician_id', 'team_id', 'scheduled_date', 'duration'
+        )
+        for technician_id, team_id, scheduled, duration in rows:
+            begin = scheduled.timestamp()
+            finish = begin + (duration or cls.DEFAULT_DURATION).total_seconds()
+            interval = (max(begin, window_start), min(finish, window_end))
+            if technician_id is None:
+                unassigned += 1
+            else:
+                by_technician[technician_id].append(interval)
+            if team_id is not None:
+                by_team[team_id][technician_id].append(interval)
+                team_requests[team_id] += 1
+
+        technicians = {
+            user_id: TechnicianLoad(user_id, username, team_id, capacity)
+            for user_id, username, team_id in UserProfile.objects.filter(role='technician').values_list(
+                'user_id', 'user__username', 'team_id'
+            )
+        }
+        # Users booked on requests without a technician profile still count
+        missing = set(by_technician) - set(technicians)
+        for user_id, username in User.objects.filter(pk__in=missing).values_list('pk', 'username'):
+            technicians[user_id] = TechnicianLoad(user_id, username, None, capacity)
+
+        for technician_id, intervals in by_technician.items():
+            load = technicians.get(technician_id)
+            if load is None:
+                continue
+            intervals.sort()
+            covered, peak = sweep(intervals)
+            load.booked_hours = round(covered / 3600, 2)
+            load.requests = len(intervals)
+            load.peak_overlap = peak
+
+        members: Dict[Optional[int], int] = defaultdict(int)
+        for load in technicians.values():
+            members[load.team_id] += 1
+        teams = []
+        for team_id, name in Team.objects.order_by('name').values_list('pk', 'name'):
+            booked = 0.0
+            for intervals in by_team.get(team_id, {}).values():
+                intervals.sort()
+                booked += sweep(intervals)[0]
+            teams.append(TeamLoad(
+                team_id, name,
+                capacity_hours=capacity * members[team_id],
+                booked_hours=round(booked / 3600, 2),
+                requests=team_requests[team_id],
+                members=members[team_id],
+            ))
+
+        return WorkloadReport(
+            start, end,
+            technicians=sorted(technicians.values(), key=lambda load: (-load.utilisation, load.username)),
+            teams=teams,
+            unassigned_requests=unassigned,
+        )
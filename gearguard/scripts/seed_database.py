@@ -2,20 +2,26 @@
 Django script to seed the database with sample data from seed_data.json.
 Usage: python manage.py shell < scripts/seed_database.py
 OR: from scripts.seed_database import seed_database; seed_database()
+Large fixtures: seed_database(bulk=True) streams the file and inserts in batches.
 """
 
 import json
+import time
 from datetime import datetime
 from django.contrib.auth.models import User
 from equipment.models import Equipment, EquipmentCategory
 from teams.models import Team, WorkCenter
 from maintenance.models import MaintenanceRequest
+from maintenance.seeding import BulkSeeder, SCRIPT_REFERENCES
 
-def seed_database():
+def seed_database(path='seed_data.json', bulk=False, batch_size=BulkSeeder.DEFAULT_BATCH_SIZE, workers=None):
     """Load seed data from JSON file and populate database."""
     
+    if bulk:
+        return seed_database_bulk(path, batch_size, workers)
+
     # Load JSON data
-    with open('seed_data.json', 'r') as f:
+    with open(path, 'r') as f:
         data = json.load(f)
     
     print("[Seeding] Starting database seeding...")
@@ -148,6 +154,23 @@ def seed_database():
     
     print("[Complete] Database seeding completed successfully!")
 
+def seed_database_bulk(path='seed_data.json', batch_size=BulkSeeder.DEFAULT_BATCH_SIZE, workers=None):
+    """Stream seed data into the database with batched inserts in one transaction."""
+    print("[Seeding] Starting bulk database seeding...")
+    started = time.perf_counter()
+    seeder = BulkSeeder(references=SCRIPT_REFERENCES, batch_size=batch_size, workers=workers)
+    with open(path, 'r') as f:
+        stats = seeder.load(f)
+    elapsed = time.perf_counter() - started
+
+    total = 0
+    for section in stats:
+        total += section.created + section.updated
+        print(f"  - {section.section}: {section.created} created, {section.updated} updated, "
+              f"{section.skipped} skipped ({section.rate:.0f} rows/s)")
+    print(f"[Complete] Wrote {total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)")
+    return stats
+
 # Run the seed function
 if __name__ == '__main__':
     seed_database()
@@ -0,0 +1,236 @@
+"""
+Full-text search over equipment, maintenance requests and teams.
+
+Every searchable object has one :class:`SearchEntry` row. The database
+keeps its own full-text index over those rows (see migration 0002), so
+queries run against an inverted index instead of ``icontains`` scans:
+
+* SQLite: an external-content FTS5 table, ranked with ``bm25()``
+* PostgreSQL: a stored ``tsvector`` column with a GIN index, ranked with
+  ``ts_rank()``
+
+Other backends fall back to ``LIKE`` matching on the entries.
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+from django.db import connection
+from django.db.models import Q
+
+from equipment.models import Equipment
+from maintenance.models import MaintenanceRequest
+from teams.models import Team
+from .models import SearchEntry
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Column weights: a hit in the title outranks one in identifiers, which
+# outranks one in the body text.
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0)  # title, body, keys
+
+# kind -> (model, fields loaded to build its document)
+SOURCES = {
+    'equipment': (Equipment, ('id', 'name', 'serial_number', 'description', 'company')),
+    'request': (MaintenanceRequest, ('id', 'subject', 'notes', 'instructions')),
+    'team': (Team, ('id', 'name', 'description', 'company')),
+}
+KIND_BY_MODEL = {model: kind for kind, (model, _) in SOURCES.items()}
+
+# Kinds bulk loaders index themselves; requests follow ``requests_changed``
+BULK_INDEXED_KINDS = ('equipment', 'team')
+
+
+def build_entry(kind: str, obj) -> SearchEntry:
+    """Build the (unsaved) search entry of a source object."""
+    if kind == 'equipment':
+        title, keys = obj.name, obj.serial_number or ''
+        body = ' '.join(filter(None, [obj.description, obj.company]))
+    elif kind == 'request':
+        title, keys = obj.subject, ''
+        body = ' '.join(filter(None, [obj.notes, obj.instructions]))
+    else:
+        title, keys = obj.name, ''
+        body = ' '.join(filter(None, [obj.description, obj.company]))
+    return SearchEntry(kind=kind, object_id=obj.pk, title=title[:200], body=body, keys=keys[:200])
+
+
+class SearchIndex:
+    """
+    Write side of the index: upserts and deletes of entries.
+    """
+
+    BATCH_SIZE = 2000
+
+    @classmethod
+    def save_entries(cls, entries: Sequence[SearchEntry]) -> None:
+        """Insert or refresh entries in one statement per batch."""
+        SearchEntry.objects.bulk_create(
+            entries,
+            batch_size=cls.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['title', 'body', 'keys', 'updated_at'],
+        )
+
+    @classmethod
+    def index_object(cls, obj) -> None:
+        """Index (or re-index) one saved object."""
+        cls.save_entries([build_entry(KIND_BY_MODEL[type(obj)], obj)])
+
+    @classmethod
+    def remove_object(cls, kind: str, object_id: int) -> None:
+        SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+    @classmethod
+    def index_pks(cls, kind: str, pks: Iterable[int]) -> int:
+        """Re-index the given objects of one kind; entries of missing rows are dropped."""
+        model, fields = SOURCES[kind]
+        pks = list(pks)
+        found = []
+        for start in range(0, len(pks), cls.BATCH_SIZE):
+            chunk = pks[start:start + cls.BATCH_SIZE]
+            objects = list(model.objects.filter(pk__in=chunk).only(*fields))
+            cls.save_entries([build_entry(kind, obj) for obj in objects])
+            found.extend(obj.pk for obj in objects)
+        stale = set(pks) - set(found)
+        if stale:
+            SearchEntry.objects.filter(kind=kind, object_id__in=stale).delete()
+        return len(found)
+
+    @classmethod
+    def rebuild(cls, kind: str, only_missing: bool = False) -> int:
+        """
+        Index every object of ``kind`` in batches.
+
+        Args:
+            kind: Entry kind to rebuild
+            only_missing: Only index objects that have no entry yet, e.g.
+                rows written by bulk loaders that bypass post_save
+
+        Returns:
+            Number of objects indexed
+        """
+        model, fields = SOURCES[kind]
+        queryset = model.objects.only(*fields).order_by('pk')
+        if only_missing:
+            indexed = SearchEntry.objects.filter(kind=kind).values('object_id')
+            queryset = queryset.exclude(pk__in=indexed)
+        else:
+            SearchEntry.objects.filter(kind=kind).exclude(object_id__in=model.objects.values('pk')).delete()
+
+        count, batch = 0, []
+        for obj in queryset.iterator(chunk_size=cls.BATCH_SIZE):
+            batch.append(build_entry(kind, obj))
+            if len(batch) >= cls.BATCH_SIZE:
+                cls.save_entries(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            cls.save_entries(batch)
+            count += len(batch)
+        return count
+
+
+@dataclass
+class SearchResults:
+    """One page of ranked results."""
+
+    entries: List[SearchEntry]
+    page: int
+    has_next: bool
+    exact: List[Equipment]
+
+
+class SearchQuery:
+    """
+    Read side of the index: ranked, paginated matching.
+    """
+
+    PER_PAGE = 20
+    MAX_PAGE = 50  # ranked results deeper than this are not useful
+
+    def __init__(self, text: str, kind: Optional[str] = None):
+        self.text = text
+        self.kind = kind if kind in SOURCES else None
+        self.tokens = [token.lower() for token in _TOKEN.findall(text)][:10]
+
+    def page(self, number: int = 1) -> SearchResults:
+        """
+        Return page ``number`` (1-based) of the results.
+
+        Equipment whose serial number equals or starts with the whole query
+        is returned separately in ``exact``, found by a range scan on the
+        serial number index.
+        """
+        number = max(1, min(number, self.MAX_PAGE))
+        if not self.tokens:
+            return SearchResults([], number, False, [])
+
+        offset = (number - 1) * self.PER_PAGE
+        ids = self._ranked_ids(self.PER_PAGE + 1, offset)
+        has_next = len(ids) > self.PER_PAGE and number < self.MAX_PAGE
+        ids = ids[:self.PER_PAGE]
+        entries = SearchEntry.objects.in_bulk(ids)
+        exact = self.serial_matches() if number == 1 and self.kind in (None, 'equipment') else []
+        return SearchResults([entries[pk] for pk in ids if pk in entries], number, has_next, exact)
+
+    def object_ids(self, limit: int = PER_PAGE * MAX_PAGE) -> List[int]:
+        """Ids of the best ``limit`` matching objects of ``kind``, for filtering its model."""
+        if not self.tokens:
+            return []
+        entry_ids = self._ranked_ids(limit, 0)
+        return list(SearchEntry.objects.filter(pk__in=entry_ids).values_list('object_id', flat=True))
+
+    def serial_matches(self, limit: int = 5) -> List[Equipment]:
+        """Equipment whose serial number starts with the query (case-sensitive)."""
+        prefix = self.text.strip()
+        if not prefix:
+            return []
+        # A half-open range rather than LIKE, so every backend seeks the index
+        return list(
+            Equipment.objects.filter(serial_number__gte=prefix, serial_number__lt=prefix + '\uffff')
+            .only('id', 'name', 'serial_number').order_by('serial_number', 'id')[:limit]
+        )
+
+    def _ranked_ids(self, limit: int, offset: int) -> List[int]:
+        if connection.vendor == 'sqlite':
+            return self._sqlite_ids(limit, offset)
+        if connection.vendor == 'postgresql':
+            return self._postgresql_ids(limit, offset)
+        return self._fallback_ids(limit, offset)
+
+    def _sqlite_ids(self, limit, offset):
+        # Every token must match; each one as a quoted prefix term so FTS5
+        # query syntax in user input is never interpreted.
+        match = ' '.join(f'"{token}"*' for token in self.tokens)
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        sql = (
+            f'SELECT e.id FROM search_fts JOIN search_searchentry e ON e.id = search_fts.rowid '
+            f'WHERE search_fts MATCH %s {"AND e.kind = %s " if self.kind else ""}'
+            f'ORDER BY bm25(search_fts, {weights}), e.id LIMIT %s OFFSET %s'
+        )
+        params = [match] + ([self.kind] if self.kind else []) + [limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _postgresql_ids(self, limit, offset):
+        query = ' & '.join(f'{token}:*' for token in self.tokens)
+        sql = (
+            "SELECT id FROM search_searchentry, to_tsquery('simple', %s) AS query "
+            f'WHERE document @@ query {"AND kind = %s " if self.kind else ""}'
+            'ORDER BY ts_rank(document, query) DESC, id LIMIT %s OFFSET %s'
+        )
+        params = [query] + ([self.kind] if self.kind else []) + [limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _fallback_ids(self, limit, offset):
+        queryset = SearchEntry.objects.all()
+        if self.kind:
+            queryset = queryset.filter(kind=self.kind)
+        for token in self.tokens:
+            queryset = queryset.filter(Q(title__icontains=token) | Q(keys__icontains=token) | Q(body__icontains=token))
+        return list(queryset.order_by('title', 'id').values_list('id', flat=True)[offset:offset + limit])
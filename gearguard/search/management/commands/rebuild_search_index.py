@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.index import SOURCES, SearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from equipment, maintenance requests and teams'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=sorted(SOURCES), action='append',
+                            help='Only rebuild this kind of entry (repeatable; default: all)')
+        parser.add_argument('--only-missing', action='store_true',
+                            help='Only index objects that have no entry yet')
+
+    def handle(self, *args, **options):
+        for kind in options['kind'] or list(SOURCES):
+            started = time.perf_counter()
+            with transaction.atomic():
+                count = SearchIndex.rebuild(kind, only_missing=options['only_missing'])
+            self.stdout.write(self.style.SUCCESS(
+                f'  [OK] {kind}: {count} indexed in {time.perf_counter() - started:.2f}s'
+            ))
@@ -0,0 +1,84 @@
+"""
+Vendor-specific full-text index over search_searchentry, then a backfill
+of entries for every existing equipment, request and team.
+
+SQLite: an external-content FTS5 table that triggers keep in step with the
+entries table. PostgreSQL: a stored, generated tsvector column with a GIN
+index. Other vendors get no index and search falls back to LIKE.
+"""
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE search_fts USING fts5("
+    "title, body, keys, content='search_searchentry', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER search_entry_ai AFTER INSERT ON search_searchentry BEGIN "
+    "INSERT INTO search_fts(rowid, title, body, keys) VALUES (new.id, new.title, new.body, new.keys); END",
+    "CREATE TRIGGER search_entry_ad AFTER DELETE ON search_searchentry BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body, keys) "
+    "VALUES ('delete', old.id, old.title, old.body, old.keys); END",
+    "CREATE TRIGGER search_entry_au AFTER UPDATE ON search_searchentry BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body, keys) "
+    "VALUES ('delete', old.id, old.title, old.body, old.keys); "
+    "INSERT INTO search_fts(rowid, title, body, keys) VALUES (new.id, new.title, new.body, new.keys); END",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS search_entry_au",
+    "DROP TRIGGER IF EXISTS search_entry_ad",
+    "DROP TRIGGER IF EXISTS search_entry_ai",
+    "DROP TABLE IF EXISTS search_fts",
+]
+
+# The 'simple' configuration does not stem, matching FTS5's unicode61
+# tokenizer so both backends answer the same queries.
+POSTGRESQL_FORWARD = [
+    "ALTER TABLE search_searchentry ADD COLUMN document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(keys, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(body, '')), 'C')) STORED",
+    "CREATE INDEX search_entry_document_idx ON search_searchentry USING GIN (document)",
+]
+POSTGRESQL_REVERSE = [
+    "DROP INDEX IF EXISTS search_entry_document_idx",
+    "ALTER TABLE search_searchentry DROP COLUMN IF EXISTS document",
+]
+
+BACKFILL = [
+    "INSERT INTO search_searchentry (kind, object_id, title, body, keys, updated_at) "
+    "SELECT 'equipment', id, name, TRIM(COALESCE(description, '') || ' ' || COALESCE(company, '')), "
+    "COALESCE(serial_number, ''), CURRENT_TIMESTAMP FROM equipment_equipment",
+    "INSERT INTO search_searchentry (kind, object_id, title, body, keys, updated_at) "
+    "SELECT 'request', id, subject, TRIM(COALESCE(notes, '') || ' ' || COALESCE(instructions, '')), "
+    "'', CURRENT_TIMESTAMP FROM maintenance_maintenancerequest",
+    "INSERT INTO search_searchentry (kind, object_id, title, body, keys, updated_at) "
+    "SELECT 'team', id, name, TRIM(COALESCE(description, '') || ' ' || COALESCE(company, '')), "
+    "'', CURRENT_TIMESTAMP FROM teams_team",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}.get(vendor, [])
+    for sql in statements + BACKFILL:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    schema_editor.execute("DELETE FROM search_searchentry")
+    for sql in {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRESQL_REVERSE}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('equipment', '0003_equipment_list_indexes'),
+        ('maintenance', '0004_preventiveschedule'),
+        ('teams', '0002_team_company'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
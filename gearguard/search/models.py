@@ -0,0 +1,39 @@
+from django.db import models
+from django.urls import reverse
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable object. The full-text index over these rows is created
+    per database vendor by migration 0002 (an FTS5 table kept in sync by
+    triggers on SQLite, a generated tsvector column with a GIN index on
+    PostgreSQL), so the ORM only ever writes plain rows.
+    """
+    KIND_CHOICES = [
+        ('equipment', 'Equipment'),
+        ('request', 'Maintenance Request'),
+        ('team', 'Team'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    # Identifiers such as serial numbers, indexed as their own column
+    keys = models.CharField(max_length=200, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_unique_object'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        if self.kind == 'equipment':
+            return reverse('equipment:equipment_detail', args=[self.object_id])
+        if self.kind == 'request':
+            return reverse('maintenance_edit', args=[self.object_id])
+        return reverse('teams:team_detail', args=[self.object_id])
@@ -0,0 +1,44 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from equipment.models import Equipment
+from maintenance.models import MaintenanceRequest
+from maintenance.signals import requests_changed
+from teams.models import Team
+from .index import KIND_BY_MODEL, SearchIndex
+
+# Fields whose changes alter an entry; saves touching none of them are skipped
+INDEXED_FIELDS = {
+    Equipment: {'name', 'serial_number', 'description', 'company'},
+    MaintenanceRequest: {'subject', 'notes', 'instructions'},
+    Team: {'name', 'description', 'company'},
+}
+
+
+@receiver(post_save, sender=Equipment)
+@receiver(post_save, sender=MaintenanceRequest)
+@receiver(post_save, sender=Team)
+def index_saved_object(sender, instance, update_fields=None, **kwargs):
+    """Keep the object's search entry current on every relevant save."""
+    if update_fields is not None and not INDEXED_FIELDS[sender] & set(update_fields):
+        return
+    SearchIndex.index_object(instance)
+
+
+@receiver(post_delete, sender=Equipment)
+@receiver(post_delete, sender=MaintenanceRequest)
+@receiver(post_delete, sender=Team)
+def remove_deleted_object(sender, instance, **kwargs):
+    SearchIndex.remove_object(KIND_BY_MODEL[sender], instance.pk)
+
+
+@receiver(requests_changed, sender=MaintenanceRequest)
+def index_changed_requests(sender, pks=None, **kwargs):
+    """
+    Re-index requests changed in bulk. When the set is unknown (bulk
+    loaders), index the requests that have no entry yet.
+    """
+    if pks is None:
+        SearchIndex.rebuild('request', only_missing=True)
+    else:
+        SearchIndex.index_pks('request', pks)
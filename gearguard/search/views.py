@@ -0,0 +1,25 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from .index import SearchQuery
+from .models import SearchEntry
+
+
+@login_required
+def search(request):
+    """Ranked full-text search across equipment, requests and teams."""
+    text = request.GET.get('q', '').strip()[:200]
+    kind = request.GET.get('kind', '')
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        page = 1
+
+    query = SearchQuery(text, kind)
+    results = query.page(page) if text else None
+    return render(request, 'search/results.html', {
+        'q': text,
+        'kind': query.kind or '',
+        'kinds': SearchEntry.KIND_CHOICES,
+        'results': results,
+    })
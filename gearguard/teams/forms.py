@@ -1,4 +1,5 @@
 from django import forms
+from gearguard.widgets import CachedSelect
 from .models import Team
 
 class TeamForm(forms.ModelForm):
@@ -19,7 +20,7 @@ class TeamForm(forms.ModelForm):
                 'rows': 3,
                 'placeholder': 'Team description'
             }),
-            'work_center': forms.Select(attrs={
+            'work_center': CachedSelect('work_centers', attrs={
                 'class': 'w-full bg-slate-900 border-slate-800 text-white rounded p-2'
             }),
         }
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from teams.reporting import WorkCenterReport, add_months
+
+
+class Command(BaseCommand):
+    help = 'Roll up work center maintenance cost, downtime and OEE per month (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=WorkCenterReport.DEFAULT_MONTHS,
+                            help=f'Recent months to rebuild, counting the current one '
+                                 f'(default: {WorkCenterReport.DEFAULT_MONTHS})')
+        parser.add_argument('--all', action='store_true', help='Rebuild every month of the request history')
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError('--months must be positive')
+
+        started = time.perf_counter()
+        if options['all']:
+            count = WorkCenterReport.refresh_all()
+            scope = 'the whole history'
+        else:
+            first = add_months(timezone.localdate(), 1 - options['months'])
+            count = WorkCenterReport.refresh(start=first)
+            scope = f'the months since {first:%Y-%m}'
+        self.stdout.write(self.style.SUCCESS(
+            f'  [OK] {count} work center months rolled up over {scope} in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:35
+
+import datetime
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_team_company'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkCenterRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField()),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('repair_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('maintenance_time', models.DurationField(default=datetime.timedelta)),
+                ('downtime', models.DurationField(default=datetime.timedelta)),
+                ('cost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('work_center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='teams.workcenter')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('work_center', 'period'), name='wc_rollup_unique_period')],
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.db import models
 
 
@@ -21,3 +23,35 @@ class Team(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class WorkCenterRollup(models.Model):
+    """
+    Maintenance figures of one work center over one calendar month.
+
+    Rows are rebuilt from the request history with grouped aggregate
+    queries by :class:`teams.reporting.WorkCenterReport` (see the
+    ``rollup_work_centers`` command), so monthly and yearly reports read
+    these rows instead of scanning the requests.
+    """
+    work_center = models.ForeignKey(WorkCenter, related_name='rollups', on_delete=models.CASCADE)
+    # First day of the month
+    period = models.DateField()
+    request_count = models.PositiveIntegerField(default=0)
+    repair_count = models.PositiveIntegerField(default=0)
+    # Corrective requests, i.e. breakdowns
+    failure_count = models.PositiveIntegerField(default=0)
+    # Duration of repaired requests, and of the repaired breakdowns among them
+    maintenance_time = models.DurationField(default=timedelta)
+    downtime = models.DurationField(default=timedelta)
+    # maintenance_time at the cost per hour in effect when the month was rolled up
+    cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['work_center', 'period'], name='wc_rollup_unique_period'),
+        ]
+
+    def __str__(self):
+        return f'{self.work_center_id} {self.period:%Y-%m}'
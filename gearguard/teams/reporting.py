@@ -0,0 +1,233 @@
+"""
+Work center cost, downtime and OEE reporting.
+
+A request belongs to its own work center, or else to its equipment's. Its
+month is the month it is scheduled in. :meth:`WorkCenterReport.refresh`
+aggregates the requests of a range of months with one grouped query and
+stores one :class:`~teams.models.WorkCenterRollup` row per work center and
+month; monthly and yearly reports are then sums over those rows.
+
+Figures:
+
+* maintenance time: duration of repaired requests; cost is that time at
+  the work center's ``cost_per_hour``
+* downtime: duration of repaired breakdowns (corrective requests)
+* OEE: availability x performance, where availability is the planned time
+  (working hours of the period) not lost to downtime and performance is
+  the work center's ``capacity_efficiency``. Quality is not recorded, so it
+  counts as 100%.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, DateField, Max, Min, Q, Sum
+from django.db.models.functions import Coalesce, ExtractYear, TruncMonth
+from django.utils import timezone
+
+from gearguard.fragments import FragmentCache
+from maintenance.models import MaintenanceRequest
+from maintenance.workload import Workload
+from .models import WorkCenter, WorkCenterRollup
+
+CENT = Decimal('0.01')
+# Additive figures of a rollup row, summed into longer periods
+FIGURES = ('request_count', 'repair_count', 'failure_count', 'maintenance_time', 'downtime', 'cost')
+
+
+def _midnight(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after the month of ``day``."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass
+class WorkCenterPeriod:
+    """Figures of one work center over ``[start, end)``."""
+
+    start: date
+    end: date
+    request_count: int = 0
+    repair_count: int = 0
+    failure_count: int = 0
+    maintenance_time: timedelta = timedelta()
+    downtime: timedelta = timedelta()
+    cost: Decimal = Decimal('0.00')
+    planned_hours: float = 0.0
+    # Performance and target, in percent
+    efficiency: float = 100.0
+    oee_target: float = 0.0
+
+    @property
+    def maintenance_hours(self) -> float:
+        return round(self.maintenance_time.total_seconds() / 3600, 1)
+
+    @property
+    def downtime_hours(self) -> float:
+        return round(self.downtime.total_seconds() / 3600, 1)
+
+    @property
+    def availability(self) -> float:
+        """Share of planned time not lost to downtime, in percent."""
+        if not self.planned_hours:
+            return 100.0
+        lost = min(self.downtime.total_seconds() / 3600, self.planned_hours)
+        return round(100 * (self.planned_hours - lost) / self.planned_hours, 1)
+
+    @property
+    def oee(self) -> float:
+        return round(self.availability * self.efficiency / 100, 1)
+
+    @property
+    def meets_target(self) -> bool:
+        return self.oee >= self.oee_target
+
+
+class WorkCenterReport:
+    """
+    Build the rollup table and read reports from it.
+    """
+
+    # Months refreshed by default: the current one and the one before, which
+    # still changes while late requests are closed
+    DEFAULT_MONTHS = 2
+
+    @staticmethod
+    def history_bounds() -> Optional[Tuple[date, date]]:
+        """``[first month, month after the last)`` with scheduled requests, or None."""
+        bounds = MaintenanceRequest.objects.aggregate(first=Min('scheduled_date'), last=Max('scheduled_date'))
+        if bounds['first'] is None:
+            return None
+        return (
+            month_start(timezone.localdate(bounds['first'])),
+            add_months(timezone.localdate(bounds['last']), 1),
+        )
+
+    @classmethod
+    def refresh(cls, start: Optional[date] = None, end: Optional[date] = None) -> int:
+        """
+        Rebuild the rollup rows of the months in ``[start, end)``.
+
+        Args:
+            start: First month (default: ``DEFAULT_MONTHS`` months back,
+                counting the current one)
+            end: Month after the last one (default: next month)
+
+        Returns:
+            Number of rows written
+        """
+        today = timezone.localdate()
+        start = month_start(start) if start else add_months(today, 1 - cls.DEFAULT_MONTHS)
+        end = month_start(end) if end else add_months(today, 1)
+        rows = cls.compute(start, end)
+        with transaction.atomic():
+            # Months that lost all their requests must not keep a stale row
+            WorkCenterRollup.objects.filter(period__gte=start, period__lt=end).delete()
+            WorkCenterRollup.objects.bulk_create(rows, batch_size=1000)
+        FragmentCache.invalidate(WorkCenterRollup)
+        return len(rows)
+
+    @classmethod
+    def refresh_all(cls) -> int:
+        """Rebuild the rollup over the whole request history."""
+        bounds = cls.history_bounds()
+        if bounds is None:
+            return 0
+        return cls.refresh(*bounds)
+
+    @staticmethod
+    def compute(start: date, end: date) -> List[WorkCenterRollup]:
+        """
+        Aggregate the requests scheduled in ``[start, end)`` per work center
+        and month, in one query.
+
+        Returns:
+            Unsaved rollup rows; costs use the current ``cost_per_hour``
+        """
+        repaired = Q(stage='repaired')
+        corrective = Q(maintenance_type='corrective')
+        rows = MaintenanceRequest.objects.filter(
+            scheduled_date__gte=_midnight(start),
+            scheduled_date__lt=_midnight(end),
+        ).annotate(
+            center=Coalesce('work_center', 'equipment__work_center'),
+            period=TruncMonth('scheduled_date', output_field=DateField()),
+        ).filter(center__isnull=False).order_by().values('center', 'period').annotate(
+            request_count=Count('id'),
+            repair_count=Count('id', filter=repaired),
+            failure_count=Count('id', filter=corrective),
+            maintenance_time=Sum('duration', filter=repaired),
+            downtime=Sum('duration', filter=repaired & corrective),
+        )
+
+        rates = dict(WorkCenter.objects.values_list('pk', 'cost_per_hour'))
+        rollups = []
+        for row in rows:
+            maintenance_time = row['maintenance_time'] or timedelta()
+            hours = Decimal(maintenance_time.total_seconds()) / 3600
+            rollups.append(WorkCenterRollup(
+                work_center_id=row['center'],
+                period=row['period'],
+                request_count=row['request_count'],
+                repair_count=row['repair_count'],
+                failure_count=row['failure_count'],
+                maintenance_time=maintenance_time,
+                downtime=row['downtime'] or timedelta(),
+                cost=(hours * rates.get(row['center'], 0)).quantize(CENT),
+            ))
+        return rollups
+
+    @classmethod
+    def monthly(cls, work_center: WorkCenter, year: int) -> List[WorkCenterPeriod]:
+        """Every month of ``year`` up to the current one, months without requests included."""
+        stored: Dict[date, WorkCenterRollup] = {
+            row.period: row for row in work_center.rollups.filter(period__year=year)
+        }
+        last = min(date(year + 1, 1, 1), add_months(timezone.localdate(), 1))
+        periods = []
+        month = date(year, 1, 1)
+        while month < last:
+            row = stored.get(month)
+            figures = {name: getattr(row, name) for name in FIGURES} if row else {}
+            periods.append(cls._period(work_center, month, add_months(month, 1), figures))
+            month = add_months(month, 1)
+        return periods
+
+    @classmethod
+    def yearly(cls, work_center: WorkCenter) -> List[WorkCenterPeriod]:
+        """One period per year with rolled-up months, oldest first."""
+        rows = work_center.rollups.annotate(year=ExtractYear('period')).order_by().values('year').annotate(
+            **{name: Sum(name) for name in FIGURES}
+        ).order_by('year')
+        next_month = add_months(timezone.localdate(), 1)
+        return [
+            cls._period(work_center, date(row['year'], 1, 1), min(date(row['year'] + 1, 1, 1), next_month), row)
+            for row in rows
+        ]
+
+    @staticmethod
+    def _period(work_center: WorkCenter, start: date, end: date, figures: dict) -> WorkCenterPeriod:
+        return WorkCenterPeriod(
+            start=start,
+            end=end,
+            request_count=figures.get('request_count') or 0,
+            repair_count=figures.get('repair_count') or 0,
+            failure_count=figures.get('failure_count') or 0,
+            maintenance_time=figures.get('maintenance_time') or timedelta(),
+            downtime=figures.get('downtime') or timedelta(),
+            cost=Decimal(figures.get('cost') or 0).quantize(CENT),
+            # Working hours of the period, as the workload engine counts them
+            planned_hours=Workload.capacity_hours(_midnight(start), _midnight(end)) if end > start else 0.0,
+            efficiency=float(work_center.capacity_efficiency),
+            oee_target=float(work_center.oee_target),
+        )
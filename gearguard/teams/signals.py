@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from gearguard.fragments import FragmentCache
+from gearguard.lookups import CachedChoices
+from .models import Team, WorkCenter
+
+
+@receiver([post_save, post_delete], sender=Team)
+@receiver([post_save, post_delete], sender=WorkCenter)
+def invalidate_choices(sender, **kwargs):
+    """Drop the cached select options and fragments of the changed table."""
+    CachedChoices.invalidate(sender)
+    FragmentCache.invalidate(sender)
@@ -1,20 +1,99 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Team, WorkCenter
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from accounts.models import UserProfile
+from equipment.models import Equipment, EquipmentCategory
+from gearguard.fragments import FragmentCache
+from gearguard.routers import use_replica
+from maintenance.calendar import default_window
+from maintenance.models import MaintenanceRequest
+from maintenance.workload import Workload
+from .models import Team, WorkCenter, WorkCenterRollup
 from .forms import TeamForm
+from .reporting import WorkCenterReport
+
+# Rows of each related list rendered on the team detail page
+TEAM_EQUIPMENT_LIMIT = 25
+TEAM_OPEN_REQUESTS_LIMIT = 25
+
+
+def _count_per_team(queryset, team_field):
+    """Correlated ``COUNT(*)`` of ``queryset`` rows pointing at the outer team."""
+    counts = queryset.filter(**{team_field: OuterRef('pk')}).order_by().values(team_field).annotate(
+        n=Count('pk')
+    ).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _with_counts(queryset):
+    """
+    Annotate teams with their member, equipment and open-request counts.
+
+    Each count is a subquery served by the team's foreign-key index, so the
+    list stays one query and the counts never multiply each other the way
+    joined ``Count()`` aggregates would.
+    """
+    return queryset.annotate(
+        member_count=_count_per_team(UserProfile.objects.all(), 'team'),
+        equipment_count=_count_per_team(Equipment.objects.all(), 'maintenance_team'),
+        open_request_count=_count_per_team(
+            MaintenanceRequest.objects.filter(stage__in=MaintenanceRequest.OPEN_STAGES), 'team'
+        ),
+    )
 
 
 @login_required
+@use_replica
 def team_list(request):
-    teams = Team.objects.all()
+    """View to list teams with their work center and member, equipment and open-request counts."""
+    teams = _with_counts(Team.objects.select_related('work_center')).order_by('name')
+    # Cards also vary on their counts, which change with other tables
+    FragmentCache.stamp(teams, Team, WorkCenter)
     return render(request, 'teams/list.html', {'teams': teams})
 
 
 @login_required
 def team_detail(request, pk):
-    team = get_object_or_404(Team, pk=pk)
-    return render(request, 'teams/detail.html', {'team': team})
+    """View a team with its members, equipment, open requests and work center in a fixed number of queries."""
+    queryset = _with_counts(Team.objects.select_related('work_center')).prefetch_related(
+        Prefetch(
+            'userprofile_set',
+            queryset=UserProfile.objects.select_related('user').order_by('user__username'),
+            to_attr='members',
+        ),
+        Prefetch(
+            'equipment_set',
+            queryset=Equipment.objects.select_related('category').only(
+                'id', 'name', 'serial_number', 'status', 'health_score', 'maintenance_team_id', 'category__name',
+            ).order_by('name', 'id')[:TEAM_EQUIPMENT_LIMIT],
+            to_attr='equipment_list',
+        ),
+        Prefetch(
+            'maintenancerequest_set',
+            queryset=MaintenanceRequest.objects.filter(
+                stage__in=MaintenanceRequest.OPEN_STAGES
+            ).select_related('equipment', 'technician').only(
+                'id', 'subject', 'stage', 'priority', 'scheduled_date', 'team_id',
+                'equipment__name', 'technician__username',
+            ).order_by('scheduled_date', 'id')[:TEAM_OPEN_REQUESTS_LIMIT],
+            to_attr='open_requests',
+        ),
+    )
+    team = get_object_or_404(queryset, pk=pk)
+    FragmentCache.stamp(team.members, UserProfile)
+    FragmentCache.stamp(team.equipment_list, Equipment, EquipmentCategory)
+    # This week's load, from the cached workload report
+    report = Workload.get(*default_window())
+    load = next((team_load for team_load in report.teams if team_load.team_id == team.pk), None)
+    return render(request, 'teams/detail.html', {
+        'team': team,
+        'workcenters': [team.work_center] if team.work_center else [],
+        'load': load,
+    })
 
 
 @login_required
@@ -54,13 +133,30 @@ def team_edit(request, pk):
     return render(request, 'teams/team_form.html', {'form': form, 'title': 'Edit Team'})
 
 @login_required
+@use_replica
 def workcenter_list(request):
     """View to list all work centers."""
-    items = WorkCenter.objects.all()
+    items = FragmentCache.stamp(WorkCenter.objects.all(), WorkCenter)
     return render(request, 'teams/workcenter_list.html', {'workcenters': items})
 
 @login_required
+@use_replica
 def workcenter_detail(request, pk):
-    """View to see details of a specific work center."""
+    """View a work center with its yearly and monthly cost, downtime and OEE (from the rollup table)."""
     obj = get_object_or_404(WorkCenter, pk=pk)
-    return render(request, 'teams/workcenter_detail.html', {'workcenter': obj})
+    years = WorkCenterReport.yearly(obj)
+    current_year = timezone.localdate().year
+    try:
+        year = int(request.GET.get('year', current_year))
+    except ValueError:
+        year = current_year
+    selected = next((period for period in years if period.start.year == year), None)
+    FragmentCache.stamp([obj], WorkCenter, WorkCenterRollup)
+    return render(request, 'teams/workcenter_detail.html', {
+        'workcenter': obj,
+        'years': years,
+        'year': year,
+        'summary': selected,
+        # Computed only when the cached report fragment is missing
+        'months': SimpleLazyObject(lambda: WorkCenterReport.monthly(obj, year)),
+    })